@@ -11,10 +11,13 @@ load_dotenv()
 
 import os
 import json
+import hashlib
 import requests
 import threading
+import time
+import zlib
 from datetime import datetime, timedelta, timezone
-from flask import Flask, render_template, jsonify, request, send_from_directory, redirect, url_for, flash
+from flask import Flask, render_template, jsonify, request, send_from_directory, redirect, url_for, flash, make_response
 from functools import wraps
 
 # Eastern timezone (EST = UTC-5, Railway server runs in UTC)
@@ -51,8 +54,25 @@ from models import save_user_checklist, get_user_checklist, get_all_user_checkli
 from models import save_article, unsave_article, get_saved_articles, is_article_saved
 from models import AdminUser
 from database import is_connected as db_is_connected, get_articles_collection, get_database
+from database import get_article_tombstones_collection, get_counters_collection, get_images_fs
 from database import get_users_collection, get_user_scores_collection, get_saved_articles_collection
+from article_index import ArticleIndex, LRUCache, generate_short_id, listing_key, paginate
+from article_snapshot import ArticleSnapshot
+from results_journal import ResultsJournal
+from outbox import Outbox
+from idempotency import CONTENT_KEY_TTL, IdempotencyStore, content_key
+from content_ids import ContentIds
+from content_state import ContentStates, ContentNotFound, InvalidTransition
+from image_store import ImageStore, is_data_uri
+from related_articles import RelatedArticles, extract_terms
+from duplicate_index import DuplicateIndex, corpus_documents, document_key, duplicate_features, has_features
+from search_index import SearchIndex, term_counts
+from suggest_index import SuggestIndex
+from noc_index import NocIndex
+from taxonomy import BROWSE_CATEGORIES, classify_article, subcategory_name
 from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 
 @login_manager.user_loader
 def load_user(user_id):
@@ -78,10 +98,70 @@ POST_API_URL = os.environ.get('POST_API_URL', 'https://web-production-35219.up.r
 _memory_cache = {
     'articles': [],
     'results': [],
+    'index': None,  # ArticleIndex built from 'results'
+    'index_source': None,
     'last_fetch': None,
-    'cache_ttl': timedelta(minutes=2)  # Re-fetch from API every 2 minutes (reduced for faster updates)
+    # Soft TTL: re-fetch in the background after 2 minutes; hard TTL: block on MongoDB after that long
+    'cache_ttl': timedelta(seconds=int(os.environ.get('ARTICLE_CACHE_SOFT_TTL', 120))),
+    'hard_ttl': timedelta(seconds=int(os.environ.get('ARTICLE_CACHE_HARD_TTL', 3600))),
+    # Incremental refresh state: only documents modified after the watermark are re-fetched
+    'watermark': None,
+    'last_full_fetch': None,
+    'full_refresh_interval': timedelta(minutes=30),  # Full reload picks up writes made outside this app
+    # Shared snapshot this worker last loaded or published (see ArticleSnapshot)
+    'snapshot_stamp': None,
+    'snapshot_generation': 0,
+    # guides.json mtime the search index was last built from
+    'search_guides_stamp': None,
+    # Article index version / file mtimes the suggest index was last built from
+    'suggest_stamps': {},
+    # NocIndex over noc.json and the file mtime it was built from
+    'noc_index': None,
+    'noc_stamp': None,
+    # Collection-wide counts from MongoDB (see article_facet_counts)
+    'facet_counts': None,
+    'facet_counts_key': None,
+    'facet_ttl': timedelta(seconds=int(os.environ.get('ARTICLE_COUNTS_TTL', 60))),
+    # Local results file documents while MongoDB is unavailable (see load_local_results)
+    'local_results': None,
+    'local_results_stamp': None,
+    # slug -> (version, related-article terms, search term counts) of the indexed articles
+    'article_terms': {},
+    # Duplicate index load state (see refresh_duplicate_index)
+    'duplicate_watermark': None,
+    'duplicate_local_stamp': None,
 }
 _cache_lock = threading.Lock()
+_refresh_lock = threading.Lock()  # Single-flight: at most one article refresh per worker
+
+# Re-read this much before the watermark so writes committed out of order are not missed
+WATERMARK_OVERLAP = timedelta(seconds=5)
+
+# Listings only hold article "cards"; these heavy fields are fetched per article on demand
+ARTICLE_BODY_FIELDS = [
+    'full_article', 'charts', 'stat_cards', 'comparison_tables', 'captions',
+    'caption_instagram', 'caption_facebook', 'caption_linkedin', 'caption_twitter',
+]
+EXCERPT_SOURCE_CHARS = 1000  # Body prefix kept on the card for listing excerpts
+# Derived card fields that are not part of the stored document
+ARTICLE_CARD_ONLY_FIELDS = ['doc_id', 'version', 'excerpt', 'short_id', 'province', 'tags']
+# Derived fields only the in-process indexes read; kept off the cards (see article_index_terms)
+ARTICLE_INDEX_DERIVED_FIELDS = ['terms', 'search_terms', 'duplicate']
+_article_body_cache = LRUCache(int(os.environ.get('ARTICLE_BODY_CACHE_SIZE', 200)))
+
+# Rendered HTML of public pages, keyed by path + the query args the view reads (see cached_page)
+_page_cache = LRUCache(int(os.environ.get('PAGE_CACHE_SIZE', 500)))
+
+# Similar-article neighbours, kept in sync with the article index (see related_articles)
+_related_articles = RelatedArticles()
+# Key numbers and MinHash buckets of every article for /api/articles/check
+_duplicate_index = DuplicateIndex()
+
+# Public full-text search over articles and guides (see search_index)
+_search_index = SearchIndex()
+
+# Typeahead over titles, provincial programs and NOC codes (see sync_suggestions)
+_suggest_index = SuggestIndex()
 
 # Data storage
 DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
@@ -89,12 +169,43 @@ IMAGES_DIR = os.path.join(os.path.dirname(__file__), 'static', 'images')
 os.makedirs(DATA_DIR, exist_ok=True)
 os.makedirs(IMAGES_DIR, exist_ok=True)
 
+# Base64 article images are decoded into hashed files here (and GridFS) and served from /images/
+_image_store = ImageStore(IMAGES_DIR, get_images_fs)
+# Public origin for URLs handed to other services (Post API, /api/approved consumers)
+PUBLIC_SITE_URL = os.environ.get('PUBLIC_SITE_URL', 'https://www.philata.com').rstrip('/')
+
 RESULTS_FILE = os.path.join(DATA_DIR, 'results.json')
 APPROVED_FILE = os.path.join(DATA_DIR, 'approved.json')
 GUIDES_FILE = os.path.join(DATA_DIR, 'guides.json')
 ARTICLES_FILE = os.path.join(DATA_DIR, 'articles.json')
 LOGS_FILE = os.path.join(DATA_DIR, 'n8n_logs.json')
 AI_DECISIONS_FILE = os.path.join(DATA_DIR, 'ai_decisions.json')
+DRAWS_FILE = os.path.join(DATA_DIR, 'draws.json')
+NOC_FILE = os.path.join(DATA_DIR, 'noc.json')
+
+# Article cache snapshot shared by all workers on this box
+_article_snapshot = ArticleSnapshot(
+    os.environ.get('ARTICLE_SNAPSHOT_FILE', os.path.join(DATA_DIR, 'article_snapshot.json'))
+)
+
+# Local results: results.json snapshot + append-only journal, compacted every N writes.
+# Like the old results.json, it keeps the newest RESULTS_MAX_DOCS results (MongoDB holds the rest)
+_results_journal = ResultsJournal(RESULTS_FILE, int(os.environ.get('RESULTS_JOURNAL_COMPACT_OPS', 256)),
+                                  max_docs=int(os.environ.get('RESULTS_MAX_DOCS', 500)))
+
+# Post API calls are queued here and delivered in the background
+_post_api_outbox = Outbox(os.path.join(DATA_DIR, 'outbox.json'), POST_API_URL)
+_post_api_outbox.start()  # Also delivers messages left over from before a restart
+
+# Responses of recent ingest requests, replayed when n8n retries one
+_idempotency = IdempotencyStore(os.path.join(DATA_DIR, 'idempotency.json'),
+                                int(os.environ.get('IDEMPOTENCY_TTL', 24 * 3600)))
+
+# Ids for new content, from a MongoDB counter
+_content_ids = ContentIds(get_counters_collection)
+
+# Review status of generated content (pending -> approved -> posted)
+_content_states = ContentStates(get_articles_collection, _results_journal)
 
 # Admin settings
 ADMIN_PASSWORD = os.environ.get('ADMIN_PASSWORD', 'philata2025')
@@ -110,12 +221,16 @@ CLOUDINARY_CLOUD_NAME = os.environ.get('CLOUDINARY_CLOUD_NAME', 'dg7yw1j18')
 _rate_limit_store = {}
 _rate_limit_lock = threading.Lock()
 
-def rate_limit(max_requests=30, window_seconds=60):
+def rate_limit(max_requests=30, window_seconds=60, cost=None, scope=None):
     """
     Simple rate limiting decorator.
     Args:
         max_requests: Maximum requests allowed in the time window
         window_seconds: Time window in seconds
+        cost: Optional function returning how many units the current request uses
+              (e.g. items in a bulk request); defaults to 1 per request
+        scope: Share the limit with other endpoints using the same scope
+               (defaults to the view function's name)
     """
     def decorator(f):
         @wraps(f)
@@ -124,7 +239,8 @@ def rate_limit(max_requests=30, window_seconds=60):
             if client_ip:
                 client_ip = client_ip.split(',')[0].strip()  # Get first IP if multiple
 
-            key = f"{f.__name__}:{client_ip}"
+            key = f"{scope or f.__name__}:{client_ip}"
+            units = cost() if cost else 1
             now = datetime.now()
 
             with _rate_limit_lock:
@@ -139,18 +255,80 @@ def rate_limit(max_requests=30, window_seconds=60):
                     entry['window_start'] = now
 
                 # Check rate limit
-                if entry['count'] >= max_requests:
+                if entry['count'] + units > max_requests:
                     return jsonify({
                         'error': 'Rate limit exceeded',
                         'retry_after': window_seconds - int((now - entry['window_start']).total_seconds())
                     }), 429
 
-                entry['count'] += 1
+                entry['count'] += units
 
             return f(*args, **kwargs)
         return decorated_function
     return decorator
 
+def idempotent(scope, key_fields=None):
+    """
+    Idempotent write decorator: a request repeating an earlier Idempotency-Key header
+    gets the stored response of the first one instead of running again.
+    Args:
+        scope: Endpoint name the keys belong to
+        key_fields: JSON fields whose values stand in for the key when the header is missing
+                    (e.g. title, source_url and body, so a retried article is recognized by content).
+                    Such keys only last CONTENT_KEY_TTL, so a later re-ingest is not swallowed.
+    Only successful responses are stored; a failed request can be retried for real.
+    Deleting the articles a request created forgets its response (see cache_remove).
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            key = request.headers.get('Idempotency-Key', '').strip()[:200]
+            ttl = None
+            if not key and key_fields:
+                data = request.get_json(silent=True)
+                if isinstance(data, dict) and any(data.get(field) for field in key_fields):
+                    key = content_key(*(data.get(field) for field in key_fields))
+                    ttl = CONTENT_KEY_TTL
+            if not key:
+                return f(*args, **kwargs)
+
+            key = f"{scope}:{key}"
+            try:
+                entry = _idempotency.begin(key)
+            except OSError as e:
+                print(f"Idempotency store unavailable: {e}")
+                return f(*args, **kwargs)
+
+            if entry is not None:
+                if entry.get('status') == 'done':
+                    response = make_response(jsonify(entry['response']), entry['status_code'])
+                    response.headers['Idempotent-Replayed'] = 'true'
+                    return response
+                return jsonify({'error': 'A request with this idempotency key is still in progress'}), 409
+
+            try:
+                response = make_response(f(*args, **kwargs))
+            except Exception:
+                _idempotency.release(key)
+                raise
+            if response.status_code < 400 and response.is_json:
+                body = response.get_json()
+                _idempotency.finish(key, body, response.status_code, ttl=ttl, slugs=response_slugs(body))
+            else:
+                _idempotency.release(key)
+            return response
+        return decorated_function
+    return decorator
+
+
+def response_slugs(body):
+    """Slugs of the articles an ingest response reports as created"""
+    if not isinstance(body, dict):
+        return []
+    results = body.get('results') if isinstance(body.get('results'), list) else [body]
+    return [r['slug'] for r in results if isinstance(r, dict) and r.get('slug')]
+
+
 def validate_article_data(data):
     """
     Validate article data from POST requests.
@@ -184,11 +362,27 @@ def validate_article_data(data):
     return True, None
 
 
+def store_article_image(image_url):
+    """Replace a base64 data: URI with the absolute URL of its file in the image store"""
+    if not is_data_uri(image_url):
+        return image_url
+    try:
+        filename = _image_store.store_data_uri(image_url)
+    except OSError as e:
+        print(f"Could not store article image: {e}")
+        return image_url
+    return f"{PUBLIC_SITE_URL}/images/{filename}" if filename else image_url
+
+
 def convert_image_url(image_url):
     """Convert Docker/localhost URLs to Post API URLs"""
     if not image_url:
         return ''
 
+    # Image store path saved before image URLs were absolute
+    if image_url.startswith('/images/'):
+        return f"{PUBLIC_SITE_URL}{image_url}"
+
     # Already a proper URL (Cloudinary, Unsplash, or Post API)
     if 'cloudinary.com' in image_url or 'unsplash.com' in image_url or 'web-production' in image_url:
         return image_url
@@ -299,7 +493,8 @@ def get_unique_unsplash_image(article_id, category='default', title=''):
     """Get a unique Unsplash image for each article from the photo pool"""
     # Use combination of id and title for better distribution
     unique_key = f"{article_id}_{title}"
-    index = abs(hash(unique_key)) % len(UNSPLASH_PHOTO_IDS)
+    # crc32, not hash(): the choice must be the same in every worker and across restarts
+    index = zlib.crc32(unique_key.encode('utf-8')) % len(UNSPLASH_PHOTO_IDS)
     photo_id = UNSPLASH_PHOTO_IDS[index]
 
     # Unsplash direct image URL format
@@ -320,124 +515,754 @@ def load_guides():
     return {"categories": {}}
 
 
+def load_noc_codes():
+    """Load NOC 2021 occupation unit groups"""
+    if os.path.exists(NOC_FILE):
+        with open(NOC_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return []
+
+
 def load_articles():
     """Load articles from MongoDB (primary) with memory cache fallback"""
+    return get_article_index().articles
+
+
+def get_article_index():
+    """
+    Get the article index, rebuilding it only when the cached results change.
+    Within the soft TTL the cache is served as is; between the soft and hard TTL it is
+    still served while one background thread refreshes it; only an empty cache or one
+    past the hard TTL makes the request wait for MongoDB.
+    """
     global _memory_cache
 
-    raw_results = []
+    # Pick up a snapshot another worker published since we last looked (one stat call)
+    sync_article_snapshot()
 
     # Check memory cache first (prevents repeated DB queries)
     with _cache_lock:
-        now = datetime.now()
-        cache_valid = (_memory_cache.get('last_fetch') and
-                      now - _memory_cache['last_fetch'] < _memory_cache['cache_ttl'])
-
-        if cache_valid and _memory_cache.get('results'):
-            raw_results = _memory_cache['results']
+        raw_results = _memory_cache.get('results') or []
+        last_fetch = _memory_cache.get('last_fetch')
+        age = datetime.now() - last_fetch if last_fetch else None
+        soft_ttl = _memory_cache['cache_ttl']
+        hard_ttl = _memory_cache['hard_ttl']
+
+    if raw_results and age is not None and age < hard_ttl:
+        if age >= soft_ttl:
+            start_background_refresh()
+    else:
+        # Load from MongoDB (primary source - where agent posts articles)
+        raw_results = refresh_articles_single_flight()
 
-    # Load from MongoDB (primary source - where agent posts articles)
+    # Fallback to local file if MongoDB empty/unavailable
     if not raw_results:
         try:
-            articles_col = get_articles_collection()
-            if articles_col is not None:
-                mongo_articles = list(articles_col.find({}).sort('created_at', -1).limit(500))
-                if mongo_articles:
-                    raw_results = []
-                    for doc in mongo_articles:
-                        doc['_id'] = str(doc['_id'])
-                        raw_results.append(doc)
-                    print(f"Loaded {len(raw_results)} articles from MongoDB")
-                    # Update memory cache
-                    with _cache_lock:
-                        _memory_cache['results'] = raw_results
-                        _memory_cache['last_fetch'] = datetime.now()
+            raw_results = load_local_results()
+        except Exception as e:
+            print(f"Error loading local results: {e}")
+
+    with _cache_lock:
+        index = _memory_cache.get('index')
+        if index is not None and raw_results and _memory_cache.get('index_source') is raw_results:
+            return index
+
+    index = ArticleIndex(normalize_articles(raw_results) if raw_results else [])
+
+    # Only new or edited articles are re-scored / re-indexed
+    terms = article_index_terms(index.articles)
+    _related_articles.sync({
+        article['slug']: (terms[article['slug']][1], article.get('category', ''))
+        for article in index.articles if article.get('slug')
+    })
+    _search_index.sync('article', article_search_documents(index.articles, terms))
+
+    # Keep the index alongside the raw results it was built from
+    with _cache_lock:
+        if raw_results and (_memory_cache.get('results') is raw_results or
+                            _memory_cache.get('local_results') is raw_results):
+            _memory_cache['index'] = index
+            _memory_cache['index_source'] = raw_results
+
+    return index
+
+
+def load_local_results():
+    """
+    Local results file documents, reused until the file changes, so the article index
+    (and the page cache keyed on it) is not rebuilt on every request without MongoDB.
+    """
+    stamp = _results_journal.stamp()
+    with _cache_lock:
+        if _memory_cache.get('local_results_stamp') == stamp:
+            return _memory_cache['local_results']
+    results = _results_journal.load()
+    if results:
+        print(f"Loaded {len(results)} articles from local file")
+    with _cache_lock:
+        _memory_cache['local_results'] = results
+        _memory_cache['local_results_stamp'] = stamp
+    return results
+
+
+def refresh_articles_single_flight():
+    """Blocking refresh; concurrent callers wait for the one in flight instead of querying again"""
+    with _refresh_lock:
+        # Another thread may have refreshed while we waited
+        with _cache_lock:
+            last_fetch = _memory_cache.get('last_fetch')
+            if (_memory_cache.get('results') and last_fetch and
+                    datetime.now() - last_fetch < _memory_cache['cache_ttl']):
+                return _memory_cache['results']
+        try:
+            return refresh_shared_article_results()
         except Exception as e:
             print(f"Error loading from MongoDB: {e}")
+            return []
 
-    # Fallback to local file if MongoDB empty/unavailable
-    if not raw_results:
+
+def start_background_refresh():
+    """Refresh the article cache in a background thread unless a refresh is already running"""
+    if not _refresh_lock.acquire(blocking=False):
+        return
+
+    def run():
         try:
-            with open(RESULTS_FILE, 'r') as f:
-                local_data = json.load(f)
-                if local_data:
-                    raw_results = local_data
-                    print(f"Loaded {len(raw_results)} articles from local file")
+            refresh_shared_article_results()
         except Exception as e:
-            print(f"Error loading local results: {e}")
+            print(f"Background article refresh failed: {e}")
+        finally:
+            _refresh_lock.release()
 
-    if raw_results:
-        # Filter only items with full_article content
-        articles = []
-        for r in raw_results:
-            if r.get('full_article') and len(r.get('full_article', '')) > 200:
-                category = r.get('category', '')
-                # Use provided slug or generate from title
-                slug = r.get('slug') or create_slug(r.get('title', ''))
-                article = {
-                    'id': r.get('id', ''),
-                    'slug': slug,
-                    'title': r.get('title', ''),
-                    'track': r.get('track', 'regular'),
-                    'category': category,
-                    'created_at': r.get('timestamp', r.get('date', '')),
-                    'full_article': r.get('full_article', ''),
-                    'source': r.get('source', ''),
-                    'source_url': r.get('source_url', ''),
-                    'official_source_url': r.get('official_source_url', ''),
-                    'reading_time': max(1, len(r.get('full_article', '').split()) // 200),
-                    # Image - preserve Cloudinary URLs from n8n pipeline
-                    'image_url': r.get('image_url', ''),
-                    # Featured image - raw Gemini AI image for article hero (no overlay)
-                    'featured_image': r.get('featured_image', ''),
-                    # Enhanced fields
-                    'key_takeaways': r.get('key_takeaways', []),
-                    'stat_cards': r.get('stat_cards', []),
-                    'charts': r.get('charts', []),
-                    'verification': r.get('verification', {}),
-                    'sources': r.get('sources', {}),
-                    # Social media captions - normalize both nested and flat formats
-                    'captions': r.get('captions', {}) if r.get('captions') else {
-                        'instagram': r.get('caption_instagram', ''),
-                        'facebook': r.get('caption_facebook', ''),
-                        'linkedin': r.get('caption_linkedin', ''),
-                        'twitter': r.get('caption_twitter', ''),
-                    },
-                }
-                articles.append(article)
+    try:
+        threading.Thread(target=run, name='article-refresh', daemon=True).start()
+    except Exception:
+        _refresh_lock.release()
+        raise
 
-        # Sort articles by date
-        articles.sort(key=lambda x: x.get('created_at', ''), reverse=True)
 
-        # Assign unique images to each article based on its ID, category, and title
-        # Only if article doesn't already have a valid image_url
-        for article in articles:
-            existing_image = article.get('image_url', '')
-            # Skip if article already has a valid image (Cloudinary, Railway, or base64 Gemini)
-            has_valid_image = existing_image and (
-                'cloudinary.com' in existing_image or
-                'web-production' in existing_image or
-                existing_image.startswith('data:image')  # Base64 Gemini-generated images
-            )
-            if has_valid_image:
-                # Keep existing image, just add thumbnail
-                if existing_image.startswith('data:image'):
-                    # For base64 images, use the same image as thumbnail
-                    article['image_thumb'] = existing_image
-                else:
-                    article['image_thumb'] = existing_image.replace('/upload/', '/upload/w_400,h_300,c_fill/')
-                article['image_credit'] = 'Philata AI'
-                article['image_credit_link'] = 'https://philata.com'
-            else:
-                # Fall back to Unsplash for articles without custom images
-                unsplash = get_unique_unsplash_image(article['id'], article['category'], article['title'])
-                article['image_url'] = unsplash.get('url', '')
-                article['image_thumb'] = unsplash.get('thumb', '')
-                article['image_credit'] = unsplash.get('credit', '')
-                article['image_credit_link'] = unsplash.get('credit_link', '')
+def sync_article_snapshot():
+    """Adopt a newer shared snapshot if another worker published one. Returns True if loaded."""
+    stamp = _article_snapshot.stamp()
+    with _cache_lock:
+        if stamp is None or stamp == _memory_cache.get('snapshot_stamp'):
+            return False
 
-        return articles
+    snapshot = _article_snapshot.load()
+    if snapshot is None:
+        return False
 
-    return []
+    with _cache_lock:
+        if snapshot['generation'] < _memory_cache.get('snapshot_generation', 0):
+            return False
+        _memory_cache['results'] = snapshot.get('results', [])
+        _memory_cache['last_fetch'] = datetime.fromtimestamp(snapshot['written_at'])
+        _memory_cache['watermark'] = parse_snapshot_time(snapshot.get('watermark'))
+        _memory_cache['last_full_fetch'] = parse_snapshot_time(snapshot.get('last_full_fetch'))
+        _memory_cache['snapshot_stamp'] = stamp
+        _memory_cache['snapshot_generation'] = snapshot['generation']
+    return True
+
+
+def parse_snapshot_time(value):
+    """Snapshot timestamps are stored as ISO strings"""
+    try:
+        return datetime.fromisoformat(value) if value else None
+    except ValueError:
+        return None
+
+
+def refresh_shared_article_results(blocking=False):
+    """
+    Refresh articles from MongoDB in exactly one worker and publish the result as the
+    shared snapshot. Workers that lose the race keep their current cache (or, with an
+    empty cache, wait for the winner and load its snapshot).
+    """
+    articles_col = get_articles_collection()
+    if articles_col is None:
+        return []
+
+    with _cache_lock:
+        cached_results = _memory_cache.get('results') or []
+
+    try:
+        with _article_snapshot.refresher_lock(blocking=blocking or not cached_results) as acquired:
+            if not acquired:
+                return cached_results
+
+            # Another worker may have published while we waited for the lock
+            adopted = sync_article_snapshot()
+            if adopted and not blocking:
+                with _cache_lock:
+                    if _memory_cache.get('results'):
+                        return _memory_cache['results']
+
+            with _cache_lock:
+                previous_results = _memory_cache.get('results') or []
+            raw_results = refresh_article_results(articles_col)
+            # Nothing new (e.g. only the watermark overlap came back): keep the current snapshot
+            if article_versions(raw_results) != article_versions(previous_results):
+                publish_article_snapshot(raw_results)
+            return raw_results
+    except OSError as e:
+        # Snapshot directory unusable - fall back to a private refresh
+        print(f"Article snapshot lock unavailable: {e}")
+        return refresh_article_results(articles_col)
+
+
+def article_versions(raw_results):
+    """(_id, modified_at) of each cached document, to tell whether a refresh changed anything"""
+    return [(str(doc.get('_id', '')), str(doc.get('modified_at') or doc.get('created_at') or ''))
+            for doc in raw_results]
+
+
+def publish_article_snapshot(raw_results):
+    """Write the cached cards as a new snapshot generation (caller holds the refresher lock)"""
+    with _cache_lock:
+        watermark = _memory_cache.get('watermark')
+        last_full_fetch = _memory_cache.get('last_full_fetch')
+
+    try:
+        generation = _article_snapshot.write({
+            'results': [article_card(doc) for doc in raw_results],
+            'watermark': watermark.isoformat() if watermark else None,
+            'last_full_fetch': last_full_fetch.isoformat() if last_full_fetch else None,
+        })
+    except OSError as e:
+        print(f"Could not write article snapshot: {e}")
+        return
+
+    with _cache_lock:
+        _memory_cache['snapshot_stamp'] = _article_snapshot.stamp()
+        _memory_cache['snapshot_generation'] = generation
+
+
+# Write-through cache API: every write path updates the cached cards it changed and
+# publishes them as the next shared snapshot version, so caches stay warm after edits.
+
+def cache_upsert(*docs, insert=True):
+    """
+    After saving articles to MongoDB: merge the written fields into the cached cards (by slug).
+    insert=False only updates cards already cached (for partial documents such as an image change).
+    """
+    index_written_duplicates(docs)
+    cards = [cache_card(doc) for doc in docs if doc.get('slug')]
+    if cards:
+        change_cached_results(lambda results: merge_cached_cards(results, cards, insert))
+
+
+def cache_remove(*keys):
+    """
+    After deleting articles from MongoDB: drop their cached cards (keys are slugs or _ids)
+    and forget stored ingest responses for them, so posting the article again creates it.
+    Also drops them from the duplicate index.
+    """
+    keys = {str(key) for key in keys if key}
+    if keys:
+        forget_idempotent_responses(keys)
+        _duplicate_index.remove(keys)
+        change_cached_results(lambda results: [doc for doc in results
+                                               if doc.get('slug') not in keys and str(doc.get('_id', '')) not in keys])
+
+
+def cache_clear():
+    """After deleting every article"""
+    forget_idempotent_responses()
+    _duplicate_index.sync({})
+    change_cached_results(lambda results: [])
+
+
+def forget_idempotent_responses(slugs=None):
+    """Drop stored ingest responses for deleted articles (all of them when slugs is None)"""
+    try:
+        if slugs is None:
+            _idempotency.clear()
+        else:
+            _idempotency.release_slugs(slugs)
+    except OSError as e:
+        print(f"Idempotency store unavailable: {e}")
+
+
+def cache_bump_version():
+    """
+    After bulk writes whose effect on the cards is not known here (migrations, backfills):
+    pull just the documents modified since the watermark and publish them as a new version.
+    """
+    try:
+        with _refresh_lock:
+            refresh_shared_article_results(blocking=True)
+    except Exception as e:
+        print(f"Error refreshing article cache: {e}")
+
+
+def change_cached_results(change):
+    """
+    Apply change(results) -> results to the cached cards and publish them as the next
+    snapshot generation, without querying MongoDB. A cache that was never loaded is
+    loaded instead (the load includes the write).
+    """
+    if get_articles_collection() is None:
+        return  # Without MongoDB, pages read the local results file directly
+
+    with _cache_lock:
+        warm = _memory_cache.get('watermark') is not None
+    if not warm:
+        cache_bump_version()
+        return
+
+    try:
+        with _refresh_lock, _article_snapshot.refresher_lock(blocking=True):
+            # Build on the latest version, whichever worker published it
+            sync_article_snapshot()
+            with _cache_lock:
+                results = change(_memory_cache.get('results') or [])
+                _memory_cache['results'] = results
+            publish_article_snapshot(results)
+    except Exception as e:
+        print(f"Error updating article cache: {e}")
+
+
+def cache_card(doc):
+    """Cached card for a written document (same shape as article_card_pipeline's cards)"""
+    card = article_card({k: v for k, v in doc.items() if k not in ARTICLE_BODY_FIELDS or k == 'full_article'})
+    if '_id' in card:
+        card['_id'] = str(card['_id'])
+    derived = card.get('derived') or {}
+    if 'body_length' not in card and derived.get('version') == DERIVED_FIELDS_VERSION:
+        card['body_length'] = derived['body_length']
+        card['word_count'] = derived['word_count']
+    # The card's version changes, so the search and related indexes re-index it
+    card['modified_at'] = doc.get('modified_at') or datetime.utcnow()
+    return card
+
+
+def merge_cached_cards(cached_results, cards, insert=True):
+    """New result list with cards merged into the cached ones (by slug), newest first"""
+    results = list(cached_results)
+    positions = {doc.get('slug'): i for i, doc in enumerate(results)}
+    inserted = {}
+    for card in cards:
+        i = positions.get(card['slug'])
+        if i is not None:
+            results[i] = dict(results[i], **card)
+        elif insert:
+            inserted[card['slug']] = dict(inserted.get(card['slug'], {}), **card)
+    if inserted:
+        # Later writes first, so they stay ahead of cards created in the same second
+        results = list(reversed(inserted.values())) + results
+        results.sort(key=lambda d: str(d.get('created_at', '')), reverse=True)
+        results = results[:500]
+    return results
+
+
+def article_card(doc):
+    """Card shape of a raw document (documents from the local results file still carry their body)"""
+    derived = doc.get('derived')
+    if isinstance(derived, dict) and any(field in derived for field in ARTICLE_INDEX_DERIVED_FIELDS):
+        doc = dict(doc, derived={k: v for k, v in derived.items() if k not in ARTICLE_INDEX_DERIVED_FIELDS})
+    if 'full_article' not in doc:
+        return doc
+    body = doc.get('full_article') or ''
+    card = {k: v for k, v in doc.items() if k not in ARTICLE_BODY_FIELDS}
+    card['body_length'] = len(body)
+    card['word_count'] = len(body.split(' '))
+    card['excerpt'] = body[:EXCERPT_SOURCE_CHARS]
+    return card
+
+
+def refresh_article_results(articles_col):
+    """
+    Refresh cached article documents from MongoDB.
+    Pulls only documents modified (or deleted) since the last refresh when possible,
+    falling back to a full reload periodically or when there is no watermark yet.
+    """
+    with _cache_lock:
+        cached_results = _memory_cache.get('results') or []
+        watermark = _memory_cache.get('watermark')
+        last_full_fetch = _memory_cache.get('last_full_fetch')
+        full_refresh_interval = _memory_cache['full_refresh_interval']
+
+    fetch_started = datetime.utcnow()
+    incremental = (cached_results and watermark is not None and last_full_fetch is not None and
+                   fetch_started - last_full_fetch < full_refresh_interval)
+
+    if incremental:
+        since = watermark - WATERMARK_OVERLAP
+        changed = list(articles_col.aggregate(article_card_pipeline({'modified_at': {'$gt': since}})))
+        deleted = []
+        tombstones_col = get_article_tombstones_collection()
+        if tombstones_col is not None:
+            deleted = list(tombstones_col.find({'deleted_at': {'$gt': since}}))
+        raw_results = merge_article_changes(cached_results, changed, deleted)
+        if raw_results is not cached_results:
+            print(f"Refreshed articles from MongoDB: {len(changed)} changed, {len(deleted)} deleted")
+    else:
+        raw_results = []
+        for doc in articles_col.aggregate(article_card_pipeline({})):
+            doc['_id'] = str(doc['_id'])
+            raw_results.append(doc)
+        if raw_results:
+            print(f"Loaded {len(raw_results)} articles from MongoDB")
+
+    # Update memory cache (an empty result is authoritative too, e.g. after clearing)
+    with _cache_lock:
+        _memory_cache['results'] = raw_results
+        _memory_cache['last_fetch'] = datetime.now()
+        _memory_cache['watermark'] = fetch_started
+        if not incremental:
+            _memory_cache['last_full_fetch'] = fetch_started
+
+    return raw_results
+
+
+def article_card_pipeline(match):
+    """
+    Aggregation that returns listing "cards": everything except the heavy body fields,
+    plus the few values listings derive from the body (length, word count, excerpt).
+    """
+    body = {'$ifNull': ['$full_article', '']}
+    # Documents with stored derived fields skip the full-body length and word count
+    has_derived = {'$eq': ['$derived.version', DERIVED_FIELDS_VERSION]}
+    return [
+        {'$match': match},
+        {'$sort': {'created_at': -1}},
+        {'$limit': 500},
+        {'$addFields': {
+            'body_length': {'$cond': [has_derived, '$derived.body_length', {'$strLenCP': body}]},
+            'word_count': {'$cond': [has_derived, '$derived.word_count', {'$size': {'$split': [body, ' ']}}]},
+            'excerpt': {'$substrCP': [body, 0, EXCERPT_SOURCE_CHARS]},
+        }},
+        {'$project': {field: 0 for field in ARTICLE_BODY_FIELDS +
+                      [f'derived.{name}' for name in ARTICLE_INDEX_DERIVED_FIELDS]}},
+    ]
+
+
+def article_facet_pipeline():
+    """
+    One aggregation for collection-wide listing counts: listed articles (same
+    body length rule as normalize_articles) by browse tag, category and month.
+    """
+    published = {'$ifNull': ['$created_at', {'$ifNull': ['$timestamp', {'$ifNull': ['$date', '']}]}]}
+    return [
+        {'$match': {'derived.version': DERIVED_FIELDS_VERSION, 'derived.body_length': {'$gt': 200}}},
+        {'$facet': {
+            'total': [{'$count': 'count'}],
+            'tags': [
+                {'$unwind': '$derived.tags'},
+                {'$group': {'_id': '$derived.tags', 'count': {'$sum': 1}}},
+            ],
+            'categories': [{'$group': {'_id': '$category', 'count': {'$sum': 1}}}],
+            'months': [{'$group': {
+                '_id': {'$substrCP': [{'$toString': published}, 0, 7]},
+                'count': {'$sum': 1},
+            }}],
+        }},
+    ]
+
+
+def article_facet_counts(index):
+    """
+    Exact counts over the whole articles collection, not just the cached newest 500:
+    {'total': n, 'tags': {tag: n}, 'categories': {category: n}, 'months': {'YYYY-MM': n}}.
+    Cached per article index and for at most ARTICLE_COUNTS_TTL seconds. Returns None
+    without MongoDB or while some documents lack current derived fields (run
+    /api/articles/backfill-derived); callers then count the cached articles instead.
+    """
+    with _cache_lock:
+        key = _memory_cache.get('facet_counts_key')
+        if key and key[0] == index.version and datetime.now() - key[1] < _memory_cache['facet_ttl']:
+            return _memory_cache['facet_counts']
+
+    articles_col = get_articles_collection()
+    if articles_col is None:
+        return None
+
+    counts = None
+    try:
+        stale = articles_col.count_documents({'derived.version': {'$ne': DERIVED_FIELDS_VERSION}})
+        if stale:
+            print(f"Article counts from cache: {stale} articles need /api/articles/backfill-derived")
+        else:
+            facets = next(articles_col.aggregate(article_facet_pipeline()), {})
+            counts = {
+                'total': facets['total'][0]['count'] if facets.get('total') else 0,
+                'tags': {doc['_id']: doc['count'] for doc in facets.get('tags', [])},
+                'categories': {doc['_id'] or 'uncategorized': doc['count'] for doc in facets.get('categories', [])},
+                'months': {doc['_id']: doc['count'] for doc in facets.get('months', []) if doc['_id']},
+            }
+    except Exception as e:
+        print(f"Error counting articles in MongoDB: {e}")
+
+    with _cache_lock:
+        _memory_cache['facet_counts'] = counts
+        _memory_cache['facet_counts_key'] = (index.version, datetime.now())
+    return counts
+
+
+def article_cache_key(doc):
+    """Stable key for a raw article document (slug is unique in MongoDB)"""
+    return doc.get('slug') or str(doc.get('_id') or doc.get('id') or '')
+
+
+def merge_article_changes(cached_results, changed, deleted):
+    """
+    Apply changed documents and tombstones to the cached result list.
+    Returns the cached list itself when nothing changed so the index is reused.
+    """
+    if not changed and not deleted:
+        return cached_results
+
+    merged = {article_cache_key(doc): doc for doc in cached_results}
+
+    # Tombstones first, so an article re-created after a delete survives
+    deleted_slugs = {t.get('slug') for t in deleted if t.get('slug')}
+    deleted_ids = {t.get('article_id') for t in deleted if t.get('article_id')}
+    if deleted:
+        merged = {key: doc for key, doc in merged.items()
+                  if doc.get('slug') not in deleted_slugs and str(doc.get('_id', '')) not in deleted_ids}
+
+    for doc in changed:
+        doc['_id'] = str(doc['_id'])
+        merged[article_cache_key(doc)] = doc
+
+    results = sorted(merged.values(), key=lambda d: str(d.get('created_at', '')), reverse=True)
+    return results[:500]
+
+
+def with_modified_at(fields):
+    """Copy of a $set payload stamped with the time incremental refreshes look for"""
+    return dict(fields, modified_at=datetime.utcnow())
+
+
+def delete_articles(articles_col, query):
+    """Delete matching articles from MongoDB and leave tombstones for incremental refreshes"""
+    return len(delete_article_documents(articles_col, query))
+
+
+def delete_article_documents(articles_col, query):
+    """delete_articles() returning the deleted documents' _id and slug"""
+    docs = list(articles_col.find(query, {'_id': 1, 'slug': 1}))
+    if not docs:
+        return []
+
+    articles_col.delete_many({'_id': {'$in': [d['_id'] for d in docs]}})
+
+    tombstones_col = get_article_tombstones_collection()
+    if tombstones_col is not None:
+        now = datetime.utcnow()
+        tombstones_col.insert_many([
+            {'article_id': str(d['_id']), 'slug': d.get('slug'), 'deleted_at': now}
+            for d in docs
+        ])
+
+    return docs
+
+
+def normalize_articles(raw_results):
+    """Turn raw result documents into public article cards, newest first"""
+    # Filter only items with full_article content
+    articles = []
+    for r in raw_results:
+        # Card projections carry body_length/word_count; local file docs still have the body
+        full_article = r.get('full_article') or ''
+        body_length = r['body_length'] if 'body_length' in r else len(full_article)
+        if body_length > 200:
+            category = r.get('category', '')
+            # Use provided slug or generate from title
+            slug = r.get('slug') or create_slug(r.get('title', ''))
+            derived = r.get('derived') or {}
+            if derived.get('version') != DERIVED_FIELDS_VERSION:
+                # Not backfilled yet - derive now (the card carries the body's word count)
+                word_count = r['word_count'] if 'word_count' in r else len(full_article.split())
+                derived = article_derived_fields(r, word_count=word_count)
+            article = {
+                'id': r.get('id', ''),
+                'doc_id': str(r.get('_id', '')),
+                'version': str(r.get('modified_at') or r.get('created_at') or ''),
+                'slug': slug,
+                'title': r.get('title', ''),
+                'track': r.get('track', 'regular'),
+                'category': category,
+                # Stored documents carry created_at; older ones may only have timestamp/date
+                'created_at': str(r.get('created_at') or r.get('timestamp') or r.get('date') or ''),
+                'excerpt': make_excerpt(r.get('excerpt') or full_article[:EXCERPT_SOURCE_CHARS]),
+                'source': r.get('source', ''),
+                'source_url': r.get('source_url', ''),
+                'official_source_url': r.get('official_source_url', ''),
+                'reading_time': derived['reading_minutes'],
+                'short_id': derived['short_id'],
+                'province': derived['province'],
+                'tags': derived['tags'],
+                # Image - preserve Cloudinary URLs from n8n pipeline, Unsplash fallback otherwise
+                'image_url': derived['image_url'],
+                'image_thumb': derived['image_thumb'],
+                'image_credit': derived['image_credit'],
+                'image_credit_link': derived['image_credit_link'],
+                # Featured image - raw Gemini AI image for article hero (no overlay)
+                'featured_image': r.get('featured_image', ''),
+                # Enhanced fields
+                'key_takeaways': r.get('key_takeaways', []),
+                'verification': r.get('verification', {}),
+                'sources': r.get('sources', {}),
+            }
+            articles.append(article)
+
+    # Sort articles by date (slug breaks ties, so keyset pagination neither skips nor repeats)
+    articles.sort(key=listing_key, reverse=True)
+
+    return articles
+
+
+# Bump when article_derived_fields changes so /api/articles/backfill-derived recomputes them
+DERIVED_FIELDS_VERSION = 7
+
+
+def article_derived_fields(doc, word_count=None):
+    """
+    Values computed from an article's title, body and image, stored on the document as
+    'derived' at write time so cache loads copy them instead of recomputing per load.
+    """
+    title = doc.get('title', '')
+    body = doc.get('full_article') or doc.get('content') or ''
+    if word_count is None:
+        word_count = len(body.split())
+
+    terms, search_terms = article_text_terms(doc)
+
+    province, tags = classify_article(doc.get('category', ''), doc.get('track', 'regular'), title)
+
+    derived = {
+        'version': DERIVED_FIELDS_VERSION,
+        'body_length': doc['body_length'] if 'body_length' in doc else len(body),
+        'word_count': word_count,
+        'reading_minutes': max(1, word_count // 200),
+        'short_id': generate_short_id(title),
+        'province': province,
+        # Browse categories/subcategories the article is listed under
+        'tags': tags,
+        # Term counts for related-article similarity (cards only carry the excerpt)
+        'terms': terms,
+        # Every body word with its count, so search matches terms beyond the top ones above
+        'search_terms': search_terms,
+        # Key numbers and MinHash signature for duplicate checks
+        'duplicate': duplicate_features(doc),
+    }
+    derived.update(article_image_fields(doc.get('id', ''), doc.get('category', ''), title,
+                                        doc.get('image_url', '')))
+    return derived
+
+
+def article_text_terms(doc):
+    """Related-article terms and search term counts of an article (from its body, else its excerpt)"""
+    title = doc.get('title', '')
+    body = doc.get('full_article') or doc.get('content') or doc.get('excerpt') or ''
+    takeaways = takeaways_text(doc.get('key_takeaways'))
+    return extract_terms(' '.join([title, title, takeaways, body])), term_counts(body)
+
+
+def takeaways_text(key_takeaways):
+    """Key takeaways as plain text (they come as strings or {text: ...} objects)"""
+    return ' '.join(
+        ' '.join(str(v) for v in item.values()) if isinstance(item, dict) else str(item)
+        for item in key_takeaways or []
+    )
+
+
+def article_image_fields(article_id, category, title, image_url):
+    """Display image, thumbnail and credit - the article's own image or an Unsplash fallback"""
+    # Keep the article's image if it is a valid one (Cloudinary, Railway, stored or base64 Gemini)
+    has_valid_image = image_url and (
+        'cloudinary.com' in image_url or
+        'web-production' in image_url or
+        image_url.startswith(('/images/', f"{PUBLIC_SITE_URL}/images/")) or  # Gemini images extracted into the image store
+        image_url.startswith('data:image')  # Base64 Gemini-generated images (not migrated yet)
+    )
+    if has_valid_image:
+        return {
+            # Base64 and stored images are their own thumbnail
+            'image_url': image_url,
+            'image_thumb': image_url if image_url.startswith(('data:image', '/images/')) else
+                           image_url.replace('/upload/', '/upload/w_400,h_300,c_fill/'),
+            'image_credit': 'Philata AI',
+            'image_credit_link': 'https://philata.com',
+        }
+
+    # Fall back to Unsplash for articles without custom images
+    unsplash = get_unique_unsplash_image(article_id, category, title)
+    return {
+        'image_url': unsplash.get('url', ''),
+        'image_thumb': unsplash.get('thumb', ''),
+        'image_credit': unsplash.get('credit', ''),
+        'image_credit_link': unsplash.get('credit_link', ''),
+    }
+
+
+def make_excerpt(html, length=300):
+    """Plain-text excerpt from the start of an article body"""
+    import re
+    text = re.sub(r'<[^>]*>', ' ', html or '')
+    text = re.sub(r'<[^>]*$', '', text)  # Tag cut off by the prefix
+    return ' '.join(text.split())[:length]
+
+
+def normalize_article_body(r):
+    """Heavy per-article fields, shaped the way article templates expect them"""
+    return {
+        'full_article': r.get('full_article', ''),
+        'stat_cards': r.get('stat_cards', []),
+        'charts': r.get('charts', []),
+        'comparison_tables': r.get('comparison_tables', []),
+        # Social media captions - normalize both nested and flat formats
+        'captions': r.get('captions', {}) if r.get('captions') else {
+            'instagram': r.get('caption_instagram', ''),
+            'facebook': r.get('caption_facebook', ''),
+            'linkedin': r.get('caption_linkedin', ''),
+            'twitter': r.get('caption_twitter', ''),
+        },
+    }
+
+
+def fetch_article_body(article):
+    """Load the body fields for one article card from MongoDB, or the local file as fallback"""
+    projection = {field: 1 for field in ARTICLE_BODY_FIELDS}
+
+    try:
+        articles_col = get_articles_collection()
+        if articles_col is not None:
+            doc = None
+            if ObjectId.is_valid(article.get('doc_id', '')):
+                doc = articles_col.find_one({'_id': ObjectId(article['doc_id'])}, projection)
+            if doc is None and article.get('slug'):
+                doc = articles_col.find_one({'slug': article['slug']}, projection)
+            if doc is not None:
+                return normalize_article_body(doc)
+    except Exception as e:
+        print(f"Error loading article body from MongoDB: {e}")
+
+    try:
+        doc = _results_journal.find('slug', article['slug']) if article.get('slug') else None
+        if doc is None and article.get('id'):
+            doc = _results_journal.find('id', article['id'])  # Stored without a slug
+        if doc is not None:
+            return normalize_article_body(doc)
+    except Exception as e:
+        print(f"Error loading article body from local file: {e}")
+
+    return None
+
+
+def load_article_detail(article):
+    """Article card merged with its body, using the LRU body cache"""
+    # The version changes on every write, so stale bodies are never served
+    key = (article.get('slug'), article.get('version'))
+    body = _article_body_cache.get(key)
+    if body is None:
+        body = fetch_article_body(article)
+        if body is None:
+            body = normalize_article_body({})
+        else:
+            _article_body_cache.put(key, body)
+    return dict(article, **body)
 
 
 def load_articles_fresh():
@@ -460,11 +1285,10 @@ def load_articles_fresh():
     # Fallback to local file
     if not raw_results:
         try:
-            with open(RESULTS_FILE, 'r') as f:
-                local_data = json.load(f)
-                if local_data:
-                    raw_results = local_data
-                    print(f"[Admin] Loaded {len(raw_results)} articles from local file")
+            local_data = _results_journal.load()
+            if local_data:
+                raw_results = local_data
+                print(f"[Admin] Loaded {len(raw_results)} articles from local file")
         except Exception as e:
             print(f"[Admin] Error loading local results: {e}")
 
@@ -486,7 +1310,8 @@ def load_articles_fresh():
                 'full_article': r.get('full_article', ''),
                 'source': r.get('source', ''),
                 'source_url': r.get('source_url', ''),
-                'reading_time': max(1, len(r.get('full_article', '').split()) // 200),
+                'reading_time': (r.get('derived') or {}).get('reading_minutes') or
+                                max(1, len(r.get('full_article', '').split()) // 200),
                 'image_url': r.get('image_url', ''),
                 'featured_image': r.get('featured_image', ''),
                 'status': r.get('status', 'published'),
@@ -524,36 +1349,110 @@ def load_results():
         print(f"Error loading from MongoDB: {e}")
 
     # Fallback to local file
-    if os.path.exists(RESULTS_FILE):
-        with open(RESULTS_FILE, 'r') as f:
-            return json.load(f)
-    return []
+    return _results_journal.load()
 
 
-def save_results(results):
-    """Save results to file and memory cache"""
-    global _memory_cache
-    # Save to file
-    with open(RESULTS_FILE, 'w') as f:
-        json.dump(results, f, indent=2)
-    # Update memory cache
-    with _cache_lock:
-        _memory_cache['results'] = results
-        _memory_cache['last_fetch'] = datetime.now()
+def find_result(field, value):
+    """Result whose field (id or slug) equals value: the local results first, then MongoDB"""
+    doc = _results_journal.find(field, value)
+    if doc is not None:
+        return doc
+    try:
+        articles_col = get_articles_collection()
+        if articles_col is not None:
+            doc = articles_col.find_one({field: value})
+            if doc is not None:
+                doc['_id'] = str(doc['_id'])
+                return doc
+    except Exception as e:
+        print(f"Error loading result from MongoDB: {e}")
+    return None
 
 
-def load_approved():
-    """Load approved content"""
-    if os.path.exists(APPROVED_FILE):
-        with open(APPROVED_FILE, 'r') as f:
-            return json.load(f)
-    return []
+def update_result(field, value, changes):
+    """
+    Set fields of a result in the local journal (one appended line, not a file rewrite).
+    A result only in MongoDB is copied into the local results with the changes applied.
+    Returns the updated document, or None if there is no such result.
+    """
+    keys = _results_journal.keys(field, value)
+    if keys:
+        _results_journal.update(keys[0], changes)
+        return _results_journal.get(keys[0])
+    doc = find_result(field, value)
+    if doc is None:
+        return None
+    doc.update(changes)
+    _results_journal.put(doc)
+    return doc
+
 
+def page_version(data_files, articles):
+    """Version stamp and last-modified time of the content a cached page was rendered from"""
+    stamp = []
+    last_modified = 0.0
 
-def save_approved(approved):
-    """Save approved content"""
-    with open(APPROVED_FILE, 'w') as f:
-        json.dump(approved, f, indent=2)
+    if articles:
+        index = get_article_index()
+        stamp.append(index.version)
+        last_modified = index.last_modified
+
+    for path in data_files:
+        try:
+            st = os.stat(path)
+        except OSError:
+            stamp.append(None)
+            continue
+        stamp.append(st.st_mtime_ns)
+        last_modified = max(last_modified, st.st_mtime)
+
+    return tuple(stamp), last_modified
+
+
+def cached_page(*data_files, articles=False, query_args=()):
+    """
+    Cache a public page's rendered HTML until the articles (articles=True) or any of
+    data_files change. Responses carry a strong ETag (hash of the HTML) and Last-Modified,
+    so conditional GETs from browsers and the CDN end in a 304.
+    Pages are keyed on the path and the query_args the view reads, in that order; other
+    query parameters (utm_source, cache busters) share the page's entry.
+    Logged-in visitors get a fresh render (base.html shows their account).
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if current_user.is_authenticated:
+                return f(*args, **kwargs)
+
+            version, last_modified = page_version(data_files, articles)
+            # Host, scheme and unknown parameters vary per proxy/link and must not split the cache
+            key = (request.path,) + tuple((arg, request.args.get(arg)) for arg in query_args if arg in request.args)
+            entry = _page_cache.get(key)
+
+            if entry is None or entry['version'] != version:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200 or response.is_streamed:
+                    return response
+                body = response.get_data()
+                entry = {
+                    'version': version,
+                    'body': body,
+                    'content_type': response.content_type,
+                    'etag': hashlib.sha256(body).hexdigest()[:32],
+                    'last_modified': datetime.fromtimestamp(last_modified or time.time(), timezone.utc),
+                }
+                _page_cache.put(key, entry)
+
+            response = make_response(entry['body'])
+            response.content_type = entry['content_type']
+            response.set_etag(entry['etag'])
+            response.last_modified = entry['last_modified']
+            # Caches may store the page but must revalidate (cheap 304) before reuse
+            response.cache_control.public = True
+            response.cache_control.no_cache = True
+            return response.make_conditional(request)
+        return decorated_function
+    return decorator
 
 
 # =============================================================================
@@ -870,6 +1769,7 @@ def api_get_checklist(program):
 # =============================================================================
 
 @app.route('/tools/crs-calculator')
+@cached_page()
 def crs_calculator():
     """CRS Score Calculator"""
     return render_template('crs_calculator.html')
@@ -888,13 +1788,13 @@ def processing_times():
 
 
 @app.route('/tools/crs-prediction')
+@cached_page(DRAWS_FILE)
 def crs_prediction():
     """CRS Score Prediction page"""
     try:
         # Load draws from auto-updated JSON file
-        draws_file = os.path.join(os.path.dirname(__file__), 'data', 'draws.json')
-        if os.path.exists(draws_file):
-            with open(draws_file, 'r') as f:
+        if os.path.exists(DRAWS_FILE):
+            with open(DRAWS_FILE, 'r') as f:
                 data = json.load(f)
             draws = data.get('draws', [])
             # Calculate average CRS from recent draws
@@ -1328,54 +2228,111 @@ def api_crs_prediction():
 
 
 @app.route('/tools/immigration-targets')
+@cached_page()
 def immigration_targets():
     """Immigration Targets page - Levels Plan data"""
     return render_template('immigration_targets.html')
 
 
 @app.route('/tools/noc-finder')
+@cached_page()
 def noc_finder():
-    """NOC Code Finder - Search occupation codes"""
+    """NOC Code Finder - Search occupation codes (searches run against /api/noc)"""
     return render_template('noc_finder.html')
 
 
+def get_noc_index():
+    """NOC lookup index, rebuilt when noc.json changes"""
+    stamp = file_stamp(NOC_FILE)
+    with _cache_lock:
+        if _memory_cache['noc_index'] is not None and _memory_cache['noc_stamp'] == stamp:
+            return _memory_cache['noc_index']
+
+    index = NocIndex(load_noc_codes())
+    with _cache_lock:
+        _memory_cache['noc_index'] = index
+        _memory_cache['noc_stamp'] = stamp
+    return index
+
+
+@app.route('/api/noc')
+def api_noc():
+    """
+    NOC 2021 occupation lookup.
+    ?code=21231 for one occupation; ?q= searches codes, titles and keywords (exact code,
+    then code/word prefixes, then typo-tolerant matches), narrowed by ?teer= and ?category=.
+    """
+    index = get_noc_index()
+
+    code = request.args.get('code')
+    if code:
+        record = index.get(code)
+        if record is None:
+            return jsonify({'error': f'Unknown NOC code {code}'}), 404
+        return jsonify(record)
+
+    query = request.args.get('q', '').strip()
+    teer = request.args.get('teer', type=int)
+    category = request.args.get('category') or None
+    limit = max(1, min(request.args.get('limit', 50, type=int), 600))
+
+    if not query and (teer is not None or category):
+        # Browse a TEER level or category without a search term
+        codes = index.by_teer.get(teer, []) if teer is not None else index.by_category.get(category, [])
+        records = [index.by_code[c] for c in codes if not category or index.by_code[c].get('category') == category]
+        found = {'mode': 'browse', 'total': len(records), 'results': records[:limit]}
+    else:
+        found = index.search(query, teer=teer, category=category, limit=limit)
+
+    response = jsonify({'query': query, 'mode': found['mode'], 'total': found['total'], 'results': found['results']})
+    response.headers['Cache-Control'] = 'public, max-age=3600'
+    return response
+
+
 @app.route('/tools/language-converter')
+@cached_page()
 def language_converter():
     """Language Score Converter - IELTS/CELPIP/TEF to CLB"""
     return render_template('language_converter.html')
 
 
 @app.route('/tools/points-simulator')
+@cached_page()
 def points_simulator():
     """Points Improvement Simulator"""
     return render_template('points_simulator.html')
 
 
 @app.route('/tools/eligibility-checker')
+@cached_page()
 def eligibility_checker():
     """Eligibility Checker for immigration programs"""
     return render_template('eligibility_checker.html')
 
 
 @app.route('/tools/document-checklist')
+@cached_page()
 def document_checklist():
     """Document Checklist Generator"""
     return render_template('document_checklist.html')
 
 
 @app.route('/tools/cost-calculator')
+@cached_page()
 def cost_calculator():
     """Immigration Cost Calculator"""
     return render_template('cost_calculator.html')
 
 
 @app.route('/tools/cost-of-living')
+@cached_page()
 def cost_of_living():
     """Cost of Living Comparison by City"""
     return render_template('cost_of_living.html')
 
 
 @app.route('/tools/pool-stats')
+@cached_page()
 def pool_stats():
     """Express Entry Pool Statistics"""
     return render_template('pool_stats.html')
@@ -1397,30 +2354,35 @@ def api_draws():
 
 @app.route('/tools/pnp-calculator')
 @app.route('/tools/pnp-calculator/<province_id>')
+@cached_page()
 def pnp_calculator(province_id=None):
     """Provincial Nominee Program Calculator - Points & Eligibility"""
     return render_template('pnp_calculator.html', initial_province=province_id)
 
 
 @app.route('/tools/lico-calculator')
+@cached_page()
 def lico_calculator():
     """LICO Calculator - Income requirements for PGP sponsorship"""
     return render_template('lico_calculator.html')
 
 
 @app.route('/tools/physical-presence-calculator')
+@cached_page()
 def physical_presence_calculator():
     """Physical Presence Calculator - Citizenship requirements"""
     return render_template('physical_presence_calculator.html')
 
 
 @app.route('/tools/student-solvency')
+@cached_page()
 def student_solvency():
     """Student Solvency Validator - Study permit financial requirements"""
     return render_template('student_solvency.html')
 
 
 @app.route('/tools/dli-search')
+@cached_page()
 def dli_search():
     """DLI Search - Find PGWP-eligible schools"""
     return render_template('dli_search.html')
@@ -1489,385 +2451,581 @@ def dashboard():
 # BROWSE BY CATEGORY
 # =============================================================================
 
-# Province keywords for PNP filtering
-PROVINCE_KEYWORDS = {
-    'ontario': ['ontario', 'oinp', 'toronto', 'ottawa'],
-    'british_columbia': ['british columbia', 'bc', 'bc pnp', 'vancouver', 'victoria'],
-    'alberta': ['alberta', 'ainp', 'aaip', 'calgary', 'edmonton'],
-    'saskatchewan': ['saskatchewan', 'sinp', 'saskatoon', 'regina'],
-    'manitoba': ['manitoba', 'mpnp', 'winnipeg'],
-    'nova_scotia': ['nova scotia', 'nsnp', 'halifax'],
-    'new_brunswick': ['new brunswick', 'nbpnp', 'fredericton', 'moncton'],
-    'pei': ['prince edward island', 'pei', 'pei pnp', 'charlottetown'],
-    'newfoundland': ['newfoundland', 'labrador', 'nlpnp', "st. john's"],
-    'yukon': ['yukon', 'ynp', 'whitehorse'],
-    'nwt': ['northwest territories', 'nwt', 'yellowknife'],
-    'nunavut': ['nunavut', 'iqaluit'],
-}
-
-def detect_province(title):
-    """Detect province from article title"""
-    title_lower = title.lower()
-    for province, keywords in PROVINCE_KEYWORDS.items():
-        for keyword in keywords:
-            if keyword in title_lower:
-                return province
-    return None
-
-
 @app.route('/browse')
+@cached_page(articles=True)
 def browse_categories():
     """Browse articles by category with subcategories"""
-    all_articles = load_articles()
-    all_content = load_results()
-
-    # Define category structure with filters
-    categories = {
-        'news': {
-            'name': 'News & Updates',
-            'icon': 'bi-newspaper',
-            'description': 'Latest immigration news and policy updates',
-            'color': '#EF4444',
-            'subcategories': [
-                {'id': 'breaking', 'name': 'Breaking News', 'icon': 'bi-lightning-charge'},
-                {'id': 'policy', 'name': 'Policy Updates', 'icon': 'bi-file-earmark-text'},
-                {'id': 'program', 'name': 'Program Updates', 'icon': 'bi-megaphone'},
-            ]
-        },
-        'express_entry': {
-            'name': 'Express Entry',
-            'icon': 'bi-lightning',
-            'description': 'Federal skilled worker and CRS updates',
-            'color': '#14B8A6',
-            'subcategories': [
-                {'id': 'draw_results', 'name': 'Draw Results', 'icon': 'bi-trophy'},
-                {'id': 'crs_updates', 'name': 'CRS Updates', 'icon': 'bi-graph-up'},
-                {'id': 'fsw', 'name': 'Federal Skilled Worker', 'icon': 'bi-briefcase'},
-            ]
-        },
-        'pnp': {
-            'name': 'Provincial Programs (PNP)',
-            'icon': 'bi-map',
-            'description': 'Provincial Nominee Programs by province',
-            'color': '#8B5CF6',
-            'subcategories': [
-                {'id': 'ontario', 'name': 'Ontario (OINP)', 'icon': 'bi-geo-alt'},
-                {'id': 'british_columbia', 'name': 'British Columbia', 'icon': 'bi-geo-alt'},
-                {'id': 'alberta', 'name': 'Alberta (AAIP)', 'icon': 'bi-geo-alt'},
-                {'id': 'saskatchewan', 'name': 'Saskatchewan (SINP)', 'icon': 'bi-geo-alt'},
-                {'id': 'manitoba', 'name': 'Manitoba (MPNP)', 'icon': 'bi-geo-alt'},
-                {'id': 'nova_scotia', 'name': 'Nova Scotia', 'icon': 'bi-geo-alt'},
-                {'id': 'new_brunswick', 'name': 'New Brunswick', 'icon': 'bi-geo-alt'},
-                {'id': 'pei', 'name': 'Prince Edward Island', 'icon': 'bi-geo-alt'},
-                {'id': 'newfoundland', 'name': 'Newfoundland', 'icon': 'bi-geo-alt'},
-                {'id': 'territories', 'name': 'Territories (YT/NWT/NU)', 'icon': 'bi-geo-alt'},
-            ]
-        },
-        'educational': {
-            'name': 'Educational',
-            'icon': 'bi-book',
-            'description': 'Guides and tutorials for immigration process',
-            'color': '#3B82F6',
-            'subcategories': [
-                {'id': 'application_process', 'name': 'Application Process', 'icon': 'bi-clipboard-check'},
-                {'id': 'language_tests', 'name': 'Language Tests', 'icon': 'bi-translate'},
-                {'id': 'crs_optimization', 'name': 'CRS Optimization', 'icon': 'bi-sliders'},
-                {'id': 'settlement', 'name': 'Settlement Tips', 'icon': 'bi-house-heart'},
-            ]
-        },
-        'forms': {
-            'name': 'Forms & Guides',
-            'icon': 'bi-file-earmark-ruled',
-            'description': 'Official forms and how to fill them',
-            'color': '#F59E0B',
-            'subcategories': [
-                {'id': 'express_entry_forms', 'name': 'Express Entry Forms', 'icon': 'bi-file-text'},
-                {'id': 'pnp_forms', 'name': 'PNP Forms', 'icon': 'bi-file-text'},
-                {'id': 'study_forms', 'name': 'Study Permit Forms', 'icon': 'bi-file-text'},
-                {'id': 'work_forms', 'name': 'Work Permit Forms', 'icon': 'bi-file-text'},
-            ]
-        },
-        'permits': {
-            'name': 'Permits',
-            'icon': 'bi-card-checklist',
-            'description': 'Study and work permit information',
-            'color': '#22C55E',
-            'subcategories': [
-                {'id': 'study_permit', 'name': 'Study Permits', 'icon': 'bi-mortarboard'},
-                {'id': 'work_permit', 'name': 'Work Permits', 'icon': 'bi-briefcase'},
-                {'id': 'pgwp', 'name': 'PGWP', 'icon': 'bi-award'},
-            ]
-        },
-    }
+    index = get_article_index()
 
-    # Count articles per category and subcategory
-    for cat_id, cat in categories.items():
-        cat['total_count'] = 0
-        for sub in cat['subcategories']:
-            sub_id = sub['id']
-            count = 0
-
-            # Filter logic based on category and subcategory
-            for article in all_articles:
-                article_cat = article.get('category', '')
-                article_track = article.get('track', '')
-                article_title = article.get('title', '')
-
-                matches = False
-
-                # News category
-                if cat_id == 'news':
-                    if sub_id == 'breaking' and article_track == 'breaking':
-                        matches = True
-                    elif sub_id == 'policy' and article_cat == 'policy':
-                        matches = True
-                    elif sub_id == 'program' and article_cat in ['program', 'general']:
-                        matches = True
-
-                # Express Entry
-                elif cat_id == 'express_entry':
-                    if article_cat == 'express_entry':
-                        if sub_id == 'draw_results' and ('draw' in article_title.lower() or 'ita' in article_title.lower()):
-                            matches = True
-                        elif sub_id == 'crs_updates' and 'crs' in article_title.lower():
-                            matches = True
-                        elif sub_id == 'fsw':
-                            matches = True
-
-                # PNP by province
-                elif cat_id == 'pnp':
-                    if article_cat == 'pnp':
-                        province = detect_province(article_title)
-                        if sub_id == 'territories' and province in ['yukon', 'nwt', 'nunavut']:
-                            matches = True
-                        elif province == sub_id:
-                            matches = True
-
-                # Educational
-                elif cat_id == 'educational':
-                    if article_cat == 'educational':
-                        title_lower = article_title.lower()
-                        if sub_id == 'application_process' and any(kw in title_lower for kw in ['application', 'process', 'submit', 'apply']):
-                            matches = True
-                        elif sub_id == 'language_tests' and any(kw in title_lower for kw in ['ielts', 'celpip', 'tef', 'language', 'english', 'french']):
-                            matches = True
-                        elif sub_id == 'crs_optimization' and any(kw in title_lower for kw in ['crs', 'score', 'points', 'boost', 'improve']):
-                            matches = True
-                        elif sub_id == 'settlement' and any(kw in title_lower for kw in ['settle', 'housing', 'bank', 'job search']):
-                            matches = True
-                        else:
-                            matches = True  # Default educational
-
-                # Forms
-                elif cat_id == 'forms':
-                    if article_cat == 'forms':
-                        title_lower = article_title.lower()
-                        if sub_id == 'express_entry_forms' and any(kw in title_lower for kw in ['imm 0008', 'ee', 'express entry']):
-                            matches = True
-                        elif sub_id == 'pnp_forms' and 'pnp' in title_lower:
-                            matches = True
-                        elif sub_id == 'study_forms' and any(kw in title_lower for kw in ['study', 'student', 'imm 1294']):
-                            matches = True
-                        elif sub_id == 'work_forms' and any(kw in title_lower for kw in ['work', 'lmia', 'imm 1295']):
-                            matches = True
-                        else:
-                            matches = True  # Default forms
-
-                # Permits
-                elif cat_id == 'permits':
-                    if sub_id == 'study_permit' and article_cat == 'study_permit':
-                        matches = True
-                    elif sub_id == 'work_permit' and article_cat == 'work_permit':
-                        matches = True
-                    elif sub_id == 'pgwp' and 'pgwp' in article_title.lower():
-                        matches = True
-
-                if matches:
-                    count += 1
-
-            sub['count'] = count
-            cat['total_count'] += count
-
-        # Get latest articles for this category
-        cat_articles = [a for a in all_articles if a.get('category') == cat_id or
-                       (cat_id == 'news' and a.get('track') == 'breaking') or
-                       (cat_id == 'pnp' and a.get('category') == 'pnp')]
-        cat['latest'] = cat_articles[:3]
+    # Tags are assigned when articles are written; MongoDB counts them over the whole
+    # collection, otherwise the cached index's tag lists are counted
+    counts = article_facet_counts(index)
+    if counts is not None:
+        tag_counts = counts['tags']
+    else:
+        tag_counts = {tag: len(articles) for tag, articles in index.by_tag.items()}
+
+    categories = {}
+    for cat_id, cat in BROWSE_CATEGORIES.items():
+        categories[cat_id] = dict(
+            cat,
+            total_count=tag_counts.get(cat_id, 0),
+            subcategories=[dict(sub, count=tag_counts.get(f"{cat_id}/{sub['id']}", 0))
+                           for sub in cat['subcategories']],
+        )
 
     return render_template('browse.html', categories=categories)
 
 
+def filter_browse_articles(index, category, subcategory):
+    """Articles for /browse/<category> (newest first) and the subcategory display name"""
+    if not subcategory:
+        return index.in_tag(category), None
+
+    filtered_articles = index.in_tag(f"{category}/{subcategory}")
+    return filtered_articles, subcategory_name(category, subcategory) if filtered_articles else None
+
+
+PAGINATION_ARGS = ('page', 'per_page', 'before')
+
+
+def pagination_args(default_per_page=24):
+    """Read page/per_page/before query parameters for article listings"""
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', default_per_page, type=int)
+    per_page = max(1, min(per_page, 100))
+    before = request.args.get('before') or None
+    return page, per_page, before
+
+
 @app.route('/browse/<category>')
+@cached_page(articles=True, query_args=('sub',) + PAGINATION_ARGS)
 def browse_category(category):
     """Browse articles in a specific category"""
-    all_articles = load_articles()
     subcategory = request.args.get('sub')
-
-    filtered_articles = []
     category_name = category.replace('_', ' ').title()
-    subcategory_name = None
-
-    for article in all_articles:
-        article_cat = article.get('category', '')
-        article_track = article.get('track', '')
-        article_title = article.get('title', '')
-
-        matches = False
-
-        # Filter by main category
-        if category == 'news':
-            if subcategory == 'breaking' and article_track == 'breaking':
-                matches = True
-                subcategory_name = 'Breaking News'
-            elif subcategory == 'policy' and article_cat == 'policy':
-                matches = True
-                subcategory_name = 'Policy Updates'
-            elif subcategory == 'program' and article_cat in ['program', 'general']:
-                matches = True
-                subcategory_name = 'Program Updates'
-            elif not subcategory and (article_track == 'breaking' or article_cat in ['policy', 'program', 'general']):
-                matches = True
-
-        elif category == 'express_entry':
-            if article_cat == 'express_entry':
-                if subcategory == 'draw_results' and ('draw' in article_title.lower() or 'ita' in article_title.lower()):
-                    matches = True
-                    subcategory_name = 'Draw Results'
-                elif subcategory == 'crs_updates' and 'crs' in article_title.lower():
-                    matches = True
-                    subcategory_name = 'CRS Updates'
-                elif not subcategory:
-                    matches = True
-
-        elif category == 'pnp':
-            if article_cat == 'pnp':
-                province = detect_province(article_title)
-                if subcategory and province == subcategory:
-                    matches = True
-                    subcategory_name = subcategory.replace('_', ' ').title()
-                elif subcategory == 'territories' and province in ['yukon', 'nwt', 'nunavut']:
-                    matches = True
-                    subcategory_name = 'Territories'
-                elif not subcategory:
-                    matches = True
-
-        elif category == 'educational':
-            if article_cat == 'educational':
-                if subcategory:
-                    subcategory_name = subcategory.replace('_', ' ').title()
-                matches = True
-
-        elif category == 'forms':
-            if article_cat == 'forms':
-                if subcategory:
-                    subcategory_name = subcategory.replace('_', ' ').title()
-                matches = True
-
-        elif category == 'permits':
-            if subcategory == 'study_permit' and article_cat == 'study_permit':
-                matches = True
-                subcategory_name = 'Study Permits'
-            elif subcategory == 'work_permit' and article_cat == 'work_permit':
-                matches = True
-                subcategory_name = 'Work Permits'
-            elif not subcategory and article_cat in ['study_permit', 'work_permit']:
-                matches = True
-
-        if matches:
-            filtered_articles.append(article)
+
+    filtered_articles, subcategory_name = filter_browse_articles(get_article_index(), category, subcategory)
+
+    page, per_page, before = pagination_args()
+    pagination = paginate(filtered_articles, page, per_page, before)
 
     return render_template('browse_category.html',
-                          articles=filtered_articles,
+                          articles=pagination['items'],
+                          pagination=pagination,
                           category=category,
                           category_name=category_name,
                           subcategory=subcategory,
                           subcategory_name=subcategory_name)
 
 
-@app.route('/articles')
-def articles():
-    """Articles listing page"""
-    all_articles = load_articles()
-    category = request.args.get('category')
-    sort = request.args.get('sort', 'newest')
+def listing_articles(index, category=None, sort='newest'):
+    """Articles for /articles - index lists are already sorted newest first"""
+    all_articles = index.in_category(category) if category else index.articles
+    if sort == 'oldest':
+        all_articles = all_articles[::-1]
+    return all_articles
+
+
+@app.route('/articles')
+@cached_page(articles=True, query_args=('category', 'sort') + PAGINATION_ARGS)
+def articles():
+    """Articles listing page"""
+    category = request.args.get('category')
+    sort = request.args.get('sort', 'newest')
+
+    all_articles = listing_articles(get_article_index(), category, sort)
+
+    page, per_page, before = pagination_args()
+    if sort == 'oldest':
+        before = None  # Keyset pagination only runs newest first
+    pagination = paginate(all_articles, page, per_page, before)
+
+    return render_template('articles.html', articles=pagination['items'], pagination=pagination,
+                          category=category, sort=sort)
+
+
+@app.route('/api/articles/list')
+def api_articles_list():
+    """
+    Paginated article cards as JSON (for infinite scroll).
+    Same filters as the pages: ?category=&sort= like /articles, or ?browse=<category>&sub=
+    like /browse/<category>. Pass next_before back as ?before= to fetch the next page.
+    """
+    index = get_article_index()
+    browse = request.args.get('browse')
+    sort = request.args.get('sort', 'newest')
+
+    if browse:
+        all_articles, _ = filter_browse_articles(index, browse, request.args.get('sub'))
+    else:
+        all_articles = listing_articles(index, request.args.get('category'), sort)
+
+    page, per_page, before = pagination_args()
+    if sort == 'oldest':
+        before = None
+    pagination = paginate(all_articles, page, per_page, before)
+
+    return jsonify({
+        'articles': [{k: v for k, v in a.items() if k not in ('doc_id', 'version')}
+                     for a in pagination['items']],
+        'page': pagination['page'],
+        'per_page': pagination['per_page'],
+        'total': pagination['total'],
+        'pages': pagination['pages'],
+        'has_more': pagination['has_more'],
+        'next_before': pagination['next_before'],
+    })
+
+
+@app.route('/a/<short_id>')
+def short_url_redirect(short_id):
+    """Short URL redirect - finds article by short_id and redirects to full URL"""
+    article = get_article_index().get_by_short_id(short_id)
+
+    if article:
+        slug = article.get('slug') or create_slug(article.get('title', ''))
+        return redirect(f'/articles/{slug}', code=301)
+
+    # If not found, redirect to articles listing
+    return redirect('/articles', code=302)
+
+
+@app.route('/articles/<slug>')
+@cached_page(articles=True)
+def article_detail(slug):
+    """Individual article page"""
+    # Try up to 2 times to load articles (in case of cold start/race condition)
+    for attempt in range(2):
+        index = get_article_index()
+
+        # Find article by slug or ID
+        article = index.get(slug)
+
+        if article:
+            break
+
+        # If not found on first attempt, wait briefly and retry (cold start scenario)
+        if attempt == 0 and not len(index):
+            time.sleep(0.5)  # Brief wait for API response
+
+    if not article:
+        # Return a proper 404 page instead of plain text
+        return render_template('404.html', message=f"Article '{slug}' not found"), 404
+
+    related = related_articles(index, article)
+
+    # Share links use the public URL, not request.url: the cached page must not depend on the Host header
+    return render_template('article_detail.html', article=load_article_detail(article), related=related,
+                           site_url=PUBLIC_SITE_URL, share_url=f"{PUBLIC_SITE_URL}{request.path}")
+
+
+def related_articles(index, article, limit=3):
+    """Most similar articles (precomputed neighbours), topped up from the same category"""
+    related = []
+    for slug in _related_articles.neighbours(article.get('slug'), limit):
+        candidate = index.by_slug.get(slug)
+        if candidate is not None:
+            related.append(candidate)
+
+    if len(related) < limit:
+        for candidate in index.related(article, limit=limit):
+            if len(related) >= limit:
+                break
+            if all(candidate is not r for r in related):
+                related.append(candidate)
+    return related
+
+
+# =============================================================================
+# SEARCH
+# =============================================================================
+
+DUPLICATE_CORPUS_FIELDS = {'id': 1, 'slug': 1, 'title': 1, 'source_url': 1, 'category': 1, 'pipeline': 1,
+                           'created_at': 1, 'modified_at': 1, 'derived.duplicate': 1}
+DUPLICATE_REFRESH_INTERVAL = 60  # Seconds between background loads of articles changed elsewhere
+DUPLICATE_FULL_RELOAD = timedelta(minutes=30)  # Full load also drops articles deleted outside this app
+DUPLICATE_LOAD_WAIT = 60  # Seconds the first check in a worker waits for the initial load
+_duplicate_loader_pid = None
+_duplicate_loader_lock = threading.Lock()
+_duplicate_ready = threading.Event()
+
+
+def load_duplicate_documents(articles_col, query):
+    """
+    Duplicate index documents of the MongoDB articles matching query, with their stored
+    features. Articles saved before the features existed are read with their body to
+    compute them, unless the index already holds them at the same version.
+    """
+    docs = []
+    stale = []
+    for doc in articles_col.find(query, DUPLICATE_CORPUS_FIELDS):
+        doc['_id'] = str(doc['_id'])
+        version = str(doc.get('modified_at') or doc.get('created_at') or '')
+        # An article indexed from its body before keeps that entry (upsert skips equal versions)
+        if not has_features(doc) and _duplicate_index.version(document_key(doc)) != version:
+            stale.append(ObjectId(doc['_id']) if ObjectId.is_valid(doc['_id']) else doc['_id'])
+        docs.append(doc)
+
+    if stale:
+        computed = {}
+        body_fields = dict(DUPLICATE_CORPUS_FIELDS, summary=1, full_article=1, content=1, stat_cards=1)
+        for start in range(0, len(stale), 200):
+            for doc in articles_col.find({'_id': {'$in': stale[start:start + 200]}}, body_fields):
+                computed[str(doc['_id'])] = dict(
+                    {k: v for k, v in doc.items() if k in DUPLICATE_CORPUS_FIELDS},
+                    _id=str(doc['_id']), derived={'duplicate': duplicate_features(doc)})
+        docs = [computed.get(doc['_id'], doc) for doc in docs]
+        print(f"Duplicate index: computed features for {len(computed)} articles "
+              f"(run /api/articles/backfill-derived to store them)")
+    return docs
+
+
+def refresh_duplicate_index(full):
+    """
+    Catch the duplicate index up with MongoDB and the local results: every article (full),
+    or only articles modified or deleted since the last load. Runs in the background
+    (see start_duplicate_index); this worker's own writes are applied as they happen.
+    """
+    started = datetime.utcnow()
+    with _cache_lock:
+        watermark = _memory_cache.get('duplicate_watermark')
+        local_stamp = _memory_cache.get('duplicate_local_stamp')
+    articles_col = get_articles_collection()
+    full = full or watermark is None
+
+    # Local results are only re-read when the file changed
+    stamp = _results_journal.stamp()
+    local = _results_journal.load() if full or stamp != local_stamp else []
+
+    if full:
+        stored = load_duplicate_documents(articles_col, {}) if articles_col is not None else []
+        _duplicate_index.sync(corpus_documents(stored, local))
+    else:
+        since = watermark - WATERMARK_OVERLAP
+        stored = []
+        if articles_col is not None:
+            stored = load_duplicate_documents(articles_col, {'modified_at': {'$gt': since}})
+            tombstones_col = get_article_tombstones_collection()
+            if tombstones_col is not None:
+                deleted = list(tombstones_col.find({'deleted_at': {'$gt': since}}))
+                _duplicate_index.remove([d.get('slug') for d in deleted] + [d.get('article_id') for d in deleted])
+        _duplicate_index.upsert(corpus_documents(stored, local))
+
+    with _cache_lock:
+        _memory_cache['duplicate_watermark'] = started
+        _memory_cache['duplicate_local_stamp'] = stamp
+
+
+def start_duplicate_index():
+    """Start this worker's background loader of the duplicate index (again after a fork)"""
+    global _duplicate_loader_pid
+    with _duplicate_loader_lock:
+        if _duplicate_loader_pid == os.getpid():
+            return
+        _duplicate_loader_pid = os.getpid()
+
+    def run():
+        last_full = None
+        while True:
+            full = last_full is None or datetime.now() - last_full >= DUPLICATE_FULL_RELOAD
+            try:
+                refresh_duplicate_index(full)
+                if full:
+                    last_full = datetime.now()
+            except Exception as e:
+                print(f"Duplicate index refresh failed: {e}")
+            _duplicate_ready.set()
+            time.sleep(DUPLICATE_REFRESH_INTERVAL)
+
+    threading.Thread(target=run, name='duplicate-index', daemon=True).start()
+
+
+def index_written_duplicates(docs):
+    """Apply this worker's article writes to the duplicate index right away"""
+    try:
+        _duplicate_index.upsert(corpus_documents(
+            [doc for doc in docs if doc.get('full_article') or has_features(doc)]))
+    except Exception as e:
+        print(f"Duplicate index update failed: {e}")
+
+
+def article_index_terms(articles):
+    """
+    {slug: (version, related-article terms, search term counts)} for the indexed articles.
+    Cards leave these out, so articles new or changed since the last call have them read
+    with their own projection (see load_article_terms); the rest are kept from before.
+    """
+    with _cache_lock:
+        known = _memory_cache['article_terms']
+    terms = {}
+    missing = []
+    for article in articles:
+        slug = article.get('slug')
+        if not slug:
+            continue
+        entry = known.get(slug)
+        if entry is not None and entry[0] == article.get('version'):
+            terms[slug] = entry
+        else:
+            missing.append(article)
+
+    if missing:
+        loaded = load_article_terms(missing)
+        for article in missing:
+            slug = article['slug']
+            terms[slug] = (article.get('version'),) + (loaded.get(slug) or article_text_terms(article))
+
+    with _cache_lock:
+        _memory_cache['article_terms'] = terms
+    return terms
+
+
+def load_article_terms(articles):
+    """
+    {slug: (related-article terms, search term counts)} of articles: stored derived fields
+    from MongoDB, else computed from the full body (MongoDB documents not backfilled yet,
+    local results). Articles found nowhere are left out.
+    """
+    slugs = [article['slug'] for article in articles]
+    terms = {}
+    articles_col = get_articles_collection()
+    if articles_col is not None:
+        try:
+            stale = []
+            for start in range(0, len(slugs), 200):
+                batch = slugs[start:start + 200]
+                for doc in articles_col.find({'slug': {'$in': batch}},
+                                             {'slug': 1, 'derived.version': 1, 'derived.terms': 1,
+                                              'derived.search_terms': 1}):
+                    derived = doc.get('derived') or {}
+                    if derived.get('version') == DERIVED_FIELDS_VERSION:
+                        terms[doc['slug']] = (derived.get('terms') or {}, derived.get('search_terms') or {})
+                    else:
+                        stale.append(doc['slug'])
+            for start in range(0, len(stale), 200):
+                for doc in articles_col.find({'slug': {'$in': stale[start:start + 200]}},
+                                             {'slug': 1, 'title': 1, 'key_takeaways': 1, 'full_article': 1,
+                                              'content': 1}):
+                    terms[doc['slug']] = article_text_terms(doc)
+        except Exception as e:
+            print(f"Error loading article terms: {e}")
+
+    for slug in slugs:
+        if slug not in terms:
+            doc = _results_journal.find('slug', slug)
+            if doc is not None:
+                terms[slug] = article_text_terms(doc)
+    return terms
+
+
+def article_search_documents(articles, terms):
+    """Search documents for article cards; the body is represented by its term counts (see article_index_terms)"""
+    documents = {}
+    for article in articles:
+        slug = article.get('slug')
+        if not slug:
+            continue
+        documents[f"article:{slug}"] = (
+            article.get('version') or article.get('created_at'),
+            [
+                (article.get('title', ''), 3),
+                (takeaways_text(article.get('key_takeaways')), 2),
+                (terms[slug][2], 1),
+            ],
+            {
+                'type': 'article',
+                'title': article.get('title', ''),
+                'url': f"/articles/{slug}",
+                'excerpt': (article.get('excerpt') or '')[:200],
+                'category': article.get('category', ''),
+                'created_at': article.get('created_at', ''),
+                'image': article.get('image_thumb', ''),
+            },
+        )
+    return documents
+
+
+def file_stamp(path):
+    """mtime of a data file (None if missing) - changes whenever the file is rewritten"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def sync_guide_search():
+    """Re-index guides when guides.json changed (the admin guide editor rewrites it)"""
+    stamp = file_stamp(GUIDES_FILE)
+    with _cache_lock:
+        if _memory_cache.get('search_guides_stamp') == stamp:
+            return
+
+    documents = {}
+    for category in load_guides().get('categories', {}).values():
+        for guide in category.get('guides', []):
+            sections = ' '.join(f"{s.get('title', '')} {s.get('content', '')}" for s in guide.get('sections', []))
+            documents[f"guide:{category.get('id')}/{guide.get('id')}"] = (
+                stamp,
+                [
+                    (guide.get('title', ''), 3),
+                    (f"{guide.get('subtitle', '')} {guide.get('overview', '')}", 2),
+                    (sections, 1),
+                ],
+                {
+                    'type': 'guide',
+                    'title': guide.get('title', ''),
+                    'url': f"/guides/{category.get('id')}/{guide.get('id')}",
+                    'excerpt': (guide.get('subtitle') or guide.get('overview') or '')[:200],
+                    'category': category.get('title', ''),
+                },
+            )
+        for province in category.get('provinces', []):
+            streams = ' '.join(f"{s.get('name', '')} {s.get('description', '')}" for s in province.get('streams', []))
+            documents[f"guide:pnp/{province.get('id')}"] = (
+                stamp,
+                [
+                    (f"{province.get('name', '')} {province.get('program_name', '')}", 3),
+                    (province.get('description', ''), 2),
+                    (streams, 1),
+                ],
+                {
+                    'type': 'guide',
+                    'title': province.get('program_name') or province.get('name', ''),
+                    'url': f"/guides/pnp/{province.get('id')}",
+                    'excerpt': (province.get('description') or '')[:200],
+                    'category': category.get('title', ''),
+                },
+            )
+
+    _search_index.sync('guide', documents)
+    with _cache_lock:
+        _memory_cache['search_guides_stamp'] = stamp
+
+
+def run_search(query, kind=None, page=1, per_page=10):
+    """One page of ranked search results, shaped like paginate()"""
+    get_article_index()  # Keeps the article side of the index current
+    sync_guide_search()
 
-    if category:
-        all_articles = [a for a in all_articles if a.get('category') == category]
+    page = max(1, page)
+    found = _search_index.search(query, limit=per_page, offset=(page - 1) * per_page, kind=kind)
+    total = found['total']
+    return {
+        'items': [dict(meta, score=round(score, 3)) for score, _, meta in found['results']],
+        'page': page,
+        'per_page': per_page,
+        'total': total,
+        'pages': (total + per_page - 1) // per_page,
+        'has_more': page * per_page < total,
+    }
 
-    # Sort by date
-    if sort == 'oldest':
-        all_articles = sorted(all_articles, key=lambda x: x.get('created_at', ''), reverse=False)
-    else:  # newest first (default)
-        all_articles = sorted(all_articles, key=lambda x: x.get('created_at', ''), reverse=True)
-
-    return render_template('articles.html', articles=all_articles, category=category, sort=sort)
-
-
-def generate_short_id(title):
-    """Generate short ID from title (matching n8n workflow)"""
-    if not title:
-        return 'news'
-    hash_val = 0
-    for char in title:
-        hash_val = ((hash_val << 5) - hash_val) + ord(char)
-        hash_val = hash_val & 0xFFFFFFFF  # Keep as 32-bit
-    # Convert to base36 and take first 6 chars
-    import string
-    chars = string.digits + string.ascii_lowercase
-    result = ''
-    val = abs(hash_val)
-    while val > 0:
-        result = chars[val % 36] + result
-        val //= 36
-    return result[:6] if result else 'news'
 
+@app.route('/api/search')
+def api_search():
+    """
+    Full-text search over articles and guides, ranked by BM25.
+    ?q= query, ?type=article|guide to restrict, ?page= / ?per_page= to paginate.
+    """
+    query = request.args.get('q', '').strip()
+    kind = request.args.get('type') if request.args.get('type') in ('article', 'guide') else None
+    page, per_page, _ = pagination_args(default_per_page=10)
 
-@app.route('/a/<short_id>')
-def short_url_redirect(short_id):
-    """Short URL redirect - finds article by short_id and redirects to full URL"""
-    all_articles = load_articles()
+    if not query:
+        return jsonify({'query': '', 'results': [], 'total': 0, 'page': 1, 'per_page': per_page,
+                        'pages': 0, 'has_more': False})
 
-    # Find article by matching short_id
-    for article in all_articles:
-        if generate_short_id(article.get('title', '')) == short_id:
-            slug = article.get('slug') or create_slug(article.get('title', ''))
-            return redirect(f'/articles/{slug}', code=301)
+    results = run_search(query, kind, page, per_page)
+    return jsonify({
+        'query': query,
+        'results': results['items'],
+        'total': results['total'],
+        'page': results['page'],
+        'per_page': results['per_page'],
+        'pages': results['pages'],
+        'has_more': results['has_more'],
+    })
 
-    # If not found, redirect to articles listing
-    return redirect('/articles', code=302)
 
+SUGGEST_TYPES = ('article', 'guide', 'province', 'noc')
 
-@app.route('/articles/<slug>')
-def article_detail(slug):
-    """Individual article page"""
-    import time
 
-    # Try up to 2 times to load articles (in case of cold start/race condition)
-    for attempt in range(2):
-        all_articles = load_articles()
+def sync_suggestions():
+    """Rebuild the typeahead groups whose source changed (article index, guides.json, noc.json)"""
+    index = get_article_index()
+    stamps = {'article': index.version, 'guide': file_stamp(GUIDES_FILE), 'noc': file_stamp(NOC_FILE)}
+    with _cache_lock:
+        changed = {group for group, stamp in stamps.items() if _memory_cache['suggest_stamps'].get(group) != stamp}
+    if not changed:
+        return
+
+    # Rank: guides and provincial programs first, then NOC codes, then articles newest first
+    if 'article' in changed:
+        _suggest_index.sync('article', {
+            article['slug']: (article.get('title', ''), (3, position),
+                              {'type': 'article', 'url': f"/articles/{article['slug']}"}, '')
+            for position, article in enumerate(index.articles) if article.get('slug')
+        })
 
-        # Find article by slug or ID
-        article = None
-        for a in all_articles:
-            if a.get('slug') == slug or a.get('id') == slug:
-                article = a
-                break
+    if 'guide' in changed:
+        guides = {}
+        provinces = {}
+        for category in load_guides().get('categories', {}).values():
+            for guide in category.get('guides', []):
+                url = f"/guides/{category.get('id')}/{guide.get('id')}"
+                guides[url] = (guide.get('title', ''), (1, 0), {'type': 'guide', 'url': url}, category.get('title', ''))
+            for province in category.get('provinces', []):
+                url = f"/guides/pnp/{province.get('id')}"
+                provinces[url] = (province.get('program_name') or province.get('name', ''), (0, 0),
+                                  {'type': 'province', 'url': url},
+                                  f"{province.get('name', '')} {province.get('code', '')}")
+                for stream in province.get('streams', []):
+                    provinces[f"{url}#{stream.get('name')}"] = (
+                        f"{stream.get('name', '')} ({province.get('name', '')})", (1, 1),
+                        {'type': 'province', 'url': url}, province.get('program_name', ''))
+        _suggest_index.sync('guide', guides)
+        _suggest_index.sync('province', provinces)
+
+    if 'noc' in changed:
+        _suggest_index.sync('noc', {
+            noc['code']: (noc['title'], (2, 0),
+                          {'type': 'noc', 'url': f"/tools/noc-finder?q={noc['code']}", 'code': noc['code'],
+                           'teer': noc.get('teer')},
+                          f"{noc['code']} {' '.join(noc.get('keywords', []))}")
+            for noc in get_noc_index().records
+        })
 
-        if article:
-            break
+    with _cache_lock:
+        _memory_cache['suggest_stamps'] = stamps
 
-        # If not found on first attempt, wait briefly and retry (cold start scenario)
-        if attempt == 0 and not all_articles:
-            time.sleep(0.5)  # Brief wait for API response
 
-    if not article:
-        # Return a proper 404 page instead of plain text
-        return render_template('404.html', message=f"Article '{slug}' not found"), 404
+@app.route('/api/suggest')
+def api_suggest():
+    """
+    Typeahead suggestions over article and guide titles, provincial programs and NOC codes.
+    ?q= what has been typed so far, ?type=article|guide|province|noc to restrict, ?limit= (max 20).
+    """
+    query = request.args.get('q', '').strip()
+    kind = request.args.get('type') if request.args.get('type') in SUGGEST_TYPES else None
+    limit = max(1, min(request.args.get('limit', 8, type=int), 20))
+
+    sync_suggestions()
+    suggestions = [dict(meta, label=label) for label, meta in _suggest_index.suggest(query, limit, kind)]
 
-    # Get related articles (same category)
-    related = [a for a in all_articles if a.get('category') == article.get('category') and a.get('id') != article.get('id')][:3]
+    response = jsonify({'query': query, 'suggestions': suggestions})
+    response.headers['Cache-Control'] = 'public, max-age=60'
+    return response
 
-    return render_template('article_detail.html', article=article, related=related)
+
+@app.route('/search')
+def search():
+    """Search results page (not page-cached: every distinct query would take a cache slot)"""
+    query = request.args.get('q', '').strip()
+    kind = request.args.get('type') if request.args.get('type') in ('article', 'guide') else None
+    page, per_page, _ = pagination_args(default_per_page=10)
+
+    results = run_search(query, kind, page, per_page) if query else None
+    return render_template('search.html', query=query, kind=kind, results=results)
 
 
 # =============================================================================
@@ -1875,6 +3033,7 @@ def article_detail(slug):
 # =============================================================================
 
 @app.route('/guides')
+@cached_page(GUIDES_FILE)
 def guides():
     """Immigration guides main page"""
     guides_data = load_guides()
@@ -1882,6 +3041,7 @@ def guides():
 
 
 @app.route('/guides/<category_id>')
+@cached_page(GUIDES_FILE)
 def guides_category(category_id):
     """Guide category page"""
     guides_data = load_guides()
@@ -1901,6 +3061,7 @@ def guides_category(category_id):
 
 
 @app.route('/guides/<category_id>/<guide_id>')
+@cached_page(GUIDES_FILE)
 def guide_detail(category_id, guide_id):
     """Individual guide detail page"""
     guides_data = load_guides()
@@ -1928,6 +3089,7 @@ def guide_detail(category_id, guide_id):
 
 
 @app.route('/guides/pnp/<province_id>')
+@cached_page(GUIDES_FILE)
 def province_detail(province_id):
     """Province PNP detail page"""
     guides_data = load_guides()
@@ -2034,11 +3196,12 @@ def migrate_to_mongodb():
 
             slug = article.get('slug') or create_slug(article.get('title', ''))
             article['slug'] = slug
+            article['derived'] = article_derived_fields(article)
 
             # Upsert to MongoDB
             result = articles_col.update_one(
                 {'slug': slug},
-                {'$set': article},
+                {'$set': with_modified_at(article)},
                 upsert=True
             )
             if result.upserted_id or result.modified_count:
@@ -2046,6 +3209,8 @@ def migrate_to_mongodb():
             else:
                 skipped += 1
 
+        cache_bump_version()
+
         return jsonify({
             'success': True,
             'migrated': migrated,
@@ -2056,6 +3221,83 @@ def migrate_to_mongodb():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/articles/backfill-derived', methods=['POST'])
+def backfill_derived_fields():
+    """One-time backfill: store derived fields on articles saved before they existed (or at an older version)"""
+    data = request.get_json() or {}
+    password = data.get('password', request.args.get('p', ''))
+
+    if password != ADMIN_PASSWORD:
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    try:
+        articles_col = get_articles_collection()
+        if articles_col is None:
+            return jsonify({'error': 'MongoDB not connected'}), 500
+
+        projection = {'id': 1, 'title': 1, 'category': 1, 'track': 1, 'image_url': 1, 'full_article': 1,
+                      'content': 1, 'key_takeaways': 1, 'summary': 1, 'stat_cards': 1}
+        cursor = articles_col.find({'derived.version': {'$ne': DERIVED_FIELDS_VERSION}}, projection)
+
+        updated = 0
+        batch = []
+        for doc in cursor:
+            batch.append(UpdateOne({'_id': doc['_id']},
+                                   {'$set': with_modified_at({'derived': article_derived_fields(doc)})}))
+            if len(batch) >= 200:
+                updated += articles_col.bulk_write(batch, ordered=False).modified_count
+                batch = []
+        if batch:
+            updated += articles_col.bulk_write(batch, ordered=False).modified_count
+
+        cache_bump_version()
+
+        return jsonify({'success': True, 'updated': updated})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/articles/migrate-images', methods=['POST'])
+def migrate_article_images():
+    """One-time migration: move base64 data: URI images out of article documents into the image store"""
+    data = request.get_json() or {}
+    password = data.get('password', request.args.get('p', ''))
+
+    if password != ADMIN_PASSWORD:
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    try:
+        articles_col = get_articles_collection()
+        if articles_col is None:
+            return jsonify({'error': 'MongoDB not connected'}), 500
+
+        # The local image directory is wiped on redeploy; only migrate into durable storage
+        if get_images_fs() is None:
+            return jsonify({'error': 'GridFS image storage not available'}), 500
+
+        query = {'$or': [{'image_url': {'$regex': '^data:image'}},
+                         {'featured_image': {'$regex': '^data:image'}}]}
+        projection = {field: 0 for field in ARTICLE_BODY_FIELDS if field != 'full_article'}
+
+        migrated = 0
+        failed = 0
+        for doc in articles_col.find(query, projection):
+            image_fields = {field: store_article_image(doc.get(field, '')) for field in ('image_url', 'featured_image')}
+            if any(is_data_uri(value) for value in image_fields.values()):
+                failed += 1  # Unsupported type, undecodable or not stored - the document keeps its data
+                continue
+            doc.update(image_fields)
+            image_fields['derived'] = article_derived_fields(doc)
+            articles_col.update_one({'_id': doc['_id']}, {'$set': with_modified_at(image_fields)})
+            migrated += 1
+
+        cache_bump_version()
+
+        return jsonify({'success': True, 'migrated': migrated, 'failed': failed})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/api/results', methods=['GET'])
 def get_results():
     """Get all results"""
@@ -2079,7 +3321,121 @@ def get_results():
     })
 
 
+def build_article(data, content_id=None):
+    """Article document for validated /api/articles data"""
+    # Use provided slug or generate from title
+    slug = data.get('slug') or create_slug(data.get('title', ''))
+
+    # Generate unique ID - use track, fallback to category, then 'content'
+    content_id = content_id or _content_ids.new(article_id_prefix(data))
+
+    # Build article URL
+    article_url = data.get('article_url') or f"https://www.philata.com/articles/{slug}"
+
+    article = {
+        "id": content_id,
+        "slug": slug,
+        "article_url": article_url,
+
+        # Content
+        "title": data.get('title', ''),
+        "subheadline": data.get('subheadline', data.get('subtitle', '')),
+        "hook": data.get('hook', ''),
+        "full_article": data.get('full_article') or data.get('content_html', ''),
+        "key_takeaways": data.get('key_takeaways', []),
+        "reading_time": data.get('reading_time', '3 min read'),
+
+        # Visualizations
+        "charts": data.get('charts', []),
+        "stat_cards": data.get('stat_cards', []),
+        "comparison_tables": data.get('comparison_tables', []),
+
+        # Image
+        "image_url": store_article_image(convert_image_url(data.get('image_url', ''))),  # Branded image for social media
+        "featured_image": store_article_image(convert_image_url(data.get('featured_image', ''))),  # Raw AI image for article hero
+        "filename": data.get('filename', ''),
+        "image_credit": data.get('image_credit'),
+
+        # Social media captions - normalize both nested and flat formats
+        "captions": data.get('captions', {}) if data.get('captions') else {
+            'instagram': data.get('caption_instagram', ''),
+            'facebook': data.get('caption_facebook', ''),
+            'linkedin': data.get('caption_linkedin', ''),
+            'twitter': data.get('caption_twitter', ''),
+        },
+
+        # Verification
+        "verification": data.get('verification', {
+            "status": "unverified",
+            "confidence": 0,
+            "reasoning": ""
+        }),
+
+        # Sources
+        "sources": data.get('sources', {
+            "official": [],
+            "secondary": [],
+            "verified_facts": []
+        }),
+        "disclaimer": data.get('disclaimer'),
+
+        # SEO
+        "seo": data.get('seo', {}),
+
+        # Metadata
+        "track": data.get('track', 'regular'),
+        "category": data.get('category', 'general'),
+        "content_type": data.get('content_type', 'news'),
+        "is_breaking": data.get('is_breaking', False),
+
+        # Legacy fields (backward compatibility)
+        "source": data.get('source', ''),
+        "source_url": data.get('source_url', ''),
+        "official_source_url": data.get('official_source_url') or (
+            data.get('sources', {}).get('official', [{}])[0].get('url') if data.get('sources', {}).get('official') else None
+        ),
+
+        # Status
+        "status": "pending",
+        "created_at": eastern_now().strftime('%Y-%m-%dT%H:%M:%S'),
+        "approved_at": None,
+        "posted_at": None
+    }
+    article['derived'] = article_derived_fields(article)
+    return article
+
+
+def article_id_prefix(data):
+    return data.get('track') or data.get('category') or 'content'
+
+
+def post_api_article_payload(article):
+    """Payload that lists an article on the Post API"""
+    return {
+        "id": article.get('id'),
+        "title": article.get('title', ''),
+        "track": article.get('track', 'regular'),
+        "category": article.get('category', 'general'),
+        "full_article": article.get('full_article', ''),
+        "source": article.get('source', ''),
+        "source_url": article.get('source_url', ''),
+        "official_source_url": article.get('official_source_url', ''),
+        "image_url": convert_image_url(article.get('image_url', '')),
+        "featured_image": convert_image_url(article.get('featured_image', '')),
+        "filename": article.get('filename', ''),
+        "captions": article.get('captions', {}),
+        "verified": article.get('verification', {}).get('status') == 'verified',
+        # Enhanced fields
+        "slug": article.get('slug', ''),
+        "key_takeaways": article.get('key_takeaways', []),
+        "stat_cards": article.get('stat_cards', []),
+        "verification": article.get('verification', {}),
+        "sources": article.get('sources', {}),
+    }
+
+
 @app.route('/api/articles', methods=['POST'])
+@idempotent('add_article', key_fields=('title', 'source_url', 'full_article'))  # Retries are replayed, not rate limited
 @rate_limit(max_requests=60, window_seconds=60)  # 60 requests per minute
 def add_article():
     """
@@ -2094,134 +3450,32 @@ def add_article():
         if not is_valid:
             return jsonify({'error': error}), 400
 
-        results = load_results()
-
-        # Use provided slug or generate from title
-        slug = data.get('slug') or create_slug(data.get('title', ''))
-
-        # Generate unique ID - use track, fallback to category, then 'content'
-        track = data.get('track') or data.get('category') or 'content'
-        content_id = f"{track}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{len(results)}"
-
-        # Build article URL
-        article_url = data.get('article_url') or f"https://www.philata.com/articles/{slug}"
-
-        article = {
-            "id": content_id,
-            "slug": slug,
-            "article_url": article_url,
-
-            # Content
-            "title": data.get('title', ''),
-            "subheadline": data.get('subheadline', data.get('subtitle', '')),
-            "hook": data.get('hook', ''),
-            "full_article": data.get('full_article') or data.get('content_html', ''),
-            "key_takeaways": data.get('key_takeaways', []),
-            "reading_time": data.get('reading_time', '3 min read'),
-
-            # Visualizations
-            "charts": data.get('charts', []),
-            "stat_cards": data.get('stat_cards', []),
-            "comparison_tables": data.get('comparison_tables', []),
-
-            # Image
-            "image_url": convert_image_url(data.get('image_url', '')),  # Branded image for social media
-            "featured_image": convert_image_url(data.get('featured_image', '')),  # Raw AI image for article hero
-            "filename": data.get('filename', ''),
-            "image_credit": data.get('image_credit'),
-
-            # Social media captions - normalize both nested and flat formats
-            "captions": data.get('captions', {}) if data.get('captions') else {
-                'instagram': data.get('caption_instagram', ''),
-                'facebook': data.get('caption_facebook', ''),
-                'linkedin': data.get('caption_linkedin', ''),
-                'twitter': data.get('caption_twitter', ''),
-            },
-
-            # Verification
-            "verification": data.get('verification', {
-                "status": "unverified",
-                "confidence": 0,
-                "reasoning": ""
-            }),
-
-            # Sources
-            "sources": data.get('sources', {
-                "official": [],
-                "secondary": [],
-                "verified_facts": []
-            }),
-            "disclaimer": data.get('disclaimer'),
-
-            # SEO
-            "seo": data.get('seo', {}),
-
-            # Metadata
-            "track": data.get('track', 'regular'),
-            "category": data.get('category', 'general'),
-            "content_type": data.get('content_type', 'news'),
-            "is_breaking": data.get('is_breaking', False),
-
-            # Legacy fields (backward compatibility)
-            "source": data.get('source', ''),
-            "source_url": data.get('source_url', ''),
-            "official_source_url": data.get('official_source_url') or (
-                data.get('sources', {}).get('official', [{}])[0].get('url') if data.get('sources', {}).get('official') else None
-            ),
-
-            # Status
-            "status": "pending",
-            "created_at": eastern_now().strftime('%Y-%m-%dT%H:%M:%S'),
-            "approved_at": None,
-            "posted_at": None
-        }
+        article = build_article(data)
+        slug = article['slug']
+        content_id = article['id']
+        article_url = article['article_url']
 
-        results.insert(0, article)
-        save_results(results)
+        _results_journal.put(article)
 
         # Save to MongoDB for persistent storage
         try:
             articles_col = get_articles_collection()
             if articles_col is not None:
                 # Use upsert to avoid duplicates (by slug)
-                articles_col.update_one(
+                result = articles_col.update_one(
                     {'slug': slug},
-                    {'$set': article},
+                    {'$set': with_modified_at(article)},
                     upsert=True
                 )
                 print(f"   MongoDB: Article saved with slug '{slug}'")
+                cache_upsert(dict(article, _id=result.upserted_id) if result.upserted_id else article)
         except Exception as mongo_err:
             print(f"   ⚠️ MongoDB save failed: {mongo_err}")
 
-        # Also send to Post API so it appears in /articles/ listing
+        # Also send to Post API so it appears in /articles/ listing (delivered in the background)
         try:
-            post_api_payload = {
-                "id": content_id,
-                "title": article.get('title', ''),
-                "track": article.get('track', 'regular'),
-                "category": article.get('category', 'general'),
-                "full_article": article.get('full_article', ''),
-                "source": article.get('source', ''),
-                "source_url": article.get('source_url', ''),
-                "official_source_url": article.get('official_source_url', ''),
-                "image_url": article.get('image_url', ''),
-                "featured_image": article.get('featured_image', ''),
-                "filename": article.get('filename', ''),
-                "captions": article.get('captions', {}),
-                "verified": article.get('verification', {}).get('status') == 'verified',
-                # Enhanced fields
-                "slug": slug,
-                "key_takeaways": article.get('key_takeaways', []),
-                "stat_cards": article.get('stat_cards', []),
-                "verification": article.get('verification', {}),
-                "sources": article.get('sources', {}),
-            }
-            post_response = requests.post(
-                f"{POST_API_URL}/results/log",
-                json=post_api_payload,
-                timeout=10
-            )
-            print(f"   Post API response: {post_response.status_code}")
+            _post_api_outbox.enqueue('/results/log', post_api_article_payload(article))
+            print(f"   Post API sync queued")
         except Exception as post_err:
             print(f"   ⚠️ Post API sync failed: {post_err}")
 
@@ -2241,6 +3495,107 @@ def add_article():
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+MAX_BULK_ARTICLES = 100
+
+
+def bulk_article_items():
+    """Articles in a /api/articles/bulk body: a list, or {"articles": [...]}"""
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get('articles')
+    return data if isinstance(data, list) else None
+
+
+@app.route('/api/articles/bulk', methods=['POST'])
+@idempotent('add_articles_bulk')
+@rate_limit(max_requests=60, window_seconds=60, scope='add_article',
+            cost=lambda: max(1, len(bulk_article_items() or [])))  # Shares the 60 articles/minute of /api/articles
+def add_articles_bulk():
+    """
+    Add several articles in one request (e.g. after a scraper run).
+    Each item is validated like /api/articles; valid ones are written with one
+    MongoDB bulk_write, one local journal write and one cache refresh.
+    Returns a result per item, in request order.
+    """
+    try:
+        items = bulk_article_items()
+        if items is None:
+            return jsonify({'error': 'Expected a list of articles or {"articles": [...]}'}), 400
+        if not items or len(items) > MAX_BULK_ARTICLES:
+            return jsonify({'error': f'Send between 1 and {MAX_BULK_ARTICLES} articles'}), 400
+
+        results = [None] * len(items)
+        articles = {}  # index -> article
+        slugs = set()
+        valid = []
+        for i, data in enumerate(items):
+            is_valid, error = validate_article_data(data if isinstance(data, dict) else None)
+            if is_valid:
+                valid.append(i)
+            else:
+                results[i] = {'index': i, 'success': False, 'error': error}
+
+        content_ids = _content_ids.allocate([article_id_prefix(items[i]) for i in valid]) if valid else []
+        for i, content_id in zip(valid, content_ids):
+            article = build_article(items[i], content_id)
+            if article['slug'] in slugs:
+                results[i] = {'index': i, 'success': False, 'error': f"Duplicate slug in request: {article['slug']}"}
+                continue
+            slugs.add(article['slug'])
+            articles[i] = article
+
+        # One round trip for all upserts (by slug, like /api/articles)
+        if articles:
+            try:
+                articles_col = get_articles_collection()
+                if articles_col is not None:
+                    indexes = list(articles)
+                    operations = [UpdateOne({'slug': articles[i]['slug']},
+                                            {'$set': with_modified_at(articles[i])}, upsert=True) for i in indexes]
+                    try:
+                        upserted_ids = articles_col.bulk_write(operations, ordered=False).upserted_ids
+                    except BulkWriteError as e:
+                        upserted_ids = {u['index']: u['_id'] for u in e.details.get('upserted', [])}
+                        for write_error in e.details.get('writeErrors', []):
+                            i = indexes[write_error['index']]
+                            results[i] = {'index': i, 'success': False, 'error': write_error.get('errmsg', 'Write failed')}
+                            del articles[i]
+                    print(f"   MongoDB: {len(articles)} article(s) saved in bulk")
+                    cache_upsert(*[dict(articles[indexes[n]], _id=_id) for n, _id in upserted_ids.items()
+                                   if indexes[n] in articles],
+                                 *[articles[i] for n, i in enumerate(indexes) if i in articles and n not in upserted_ids])
+            except Exception as mongo_err:
+                print(f"   ⚠️ MongoDB bulk save failed: {mongo_err}")
+
+        if articles:
+            # Same order as one /api/articles call per item (the last one ends up first)
+            _results_journal.put_many(articles.values())
+            try:
+                _post_api_outbox.enqueue_many('/results/log', [post_api_article_payload(a) for a in articles.values()])
+            except Exception as post_err:
+                print(f"   ⚠️ Post API sync failed: {post_err}")
+
+        for i, article in articles.items():
+            results[i] = {
+                'index': i,
+                'success': True,
+                'id': article['id'],
+                'slug': article['slug'],
+                'article_url': article['article_url']
+            }
+
+        print(f"✅ Bulk ingest: {len(articles)} of {len(items)} article(s) created")
+        return jsonify({
+            "success": bool(articles),
+            "created": len(articles),
+            "failed": len(items) - len(articles),
+            "results": results
+        }), 200 if articles else 400
+    except Exception as e:
+        print(f"❌ Bulk article creation failed: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
 @app.route('/api/articles/update-image', methods=['POST'])
 def update_article_image():
     """Update an existing article's image_url"""
@@ -2252,27 +3607,32 @@ def update_article_image():
         if not slug or not image_url:
             return jsonify({"success": False, "error": "slug and image_url required"}), 400
 
-        results = load_results()
-        updated = False
+        image_url = store_article_image(image_url)
 
-        for i, article in enumerate(results):
-            if article.get('slug') == slug:
-                results[i]['image_url'] = image_url
-                updated = True
-                print(f"✅ Updated image for article: {slug}")
-                break
+        article = find_result('slug', slug)
+        updated = article is not None
 
         if updated:
-            save_results(results)
+            article['image_url'] = image_url
+            update_result('slug', slug, {'image_url': image_url, 'derived': article_derived_fields(article)})
+            print(f"✅ Updated image for article: {slug}")
             # Also update in MongoDB
             try:
                 articles_col = get_articles_collection()
                 if articles_col is not None:
+                    # The stored display image and thumbnail derive from image_url
+                    doc = articles_col.find_one({'slug': slug}, {'id': 1, 'title': 1, 'category': 1, 'track': 1,
+                                                                 'full_article': 1, 'content': 1,
+                                                                 'key_takeaways': 1})
+                    changes = {'image_url': image_url}
+                    if doc is not None:
+                        changes['derived'] = article_derived_fields(dict(doc, image_url=image_url))
                     articles_col.update_one(
                         {'slug': slug},
-                        {'$set': {'image_url': image_url}}
+                        {'$set': with_modified_at(changes)}
                     )
                     print(f"   MongoDB: Updated image for '{slug}'")
+                    cache_upsert(dict(changes, slug=slug), insert=False)
             except Exception as mongo_err:
                 print(f"   ⚠️ MongoDB update failed: {mongo_err}")
             return jsonify({"success": True, "slug": slug, "image_url": image_url})
@@ -2292,208 +3652,34 @@ def check_article_duplicate():
     - Source URL match
     - Key numbers extraction (CRS, ITAs, dates, amounts)
     - Stat cards comparison
-    - Content fingerprinting
+    - Title similarity
+    - Content fingerprinting (MinHash near-duplicate text)
+    Every stored and local article is indexed; only those sharing a slug, source URL,
+    key number or LSH bucket are compared.
     """
-    import re
-    from datetime import datetime, timedelta
-
-    def extract_numbers(text):
-        """Extract all significant numbers from text (CRS scores, ITA counts, dates, etc.)"""
-        if not text:
-            return set()
-        # Find numbers with context (e.g., "500 CRS", "5,000 ITAs", "January 15")
-        patterns = [
-            r'\b(\d{3})\s*(?:CRS|points?|score)',  # CRS scores (3 digits)
-            r'\b(\d{1,3}(?:,\d{3})+|\d{4,})\s*(?:ITAs?|invitations?|applicants?|people|candidates?)',  # Large numbers
-            r'\b(\d{1,2}(?:st|nd|rd|th)?\s+(?:January|February|March|April|May|June|July|August|September|October|November|December))',  # Dates
-            r'\b(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2}',  # Dates alt
-            r'\$\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',  # Dollar amounts
-            r'\b(\d+(?:\.\d+)?)\s*(?:percent|%)',  # Percentages
-            r'#\s*(\d+)',  # Draw numbers
-            r'\b(\d{4})\b',  # Years
-        ]
-        numbers = set()
-        text_lower = text.lower()
-        for pattern in patterns:
-            matches = re.findall(pattern, text_lower, re.IGNORECASE)
-            for m in matches:
-                # Normalize: remove commas, lowercase
-                normalized = str(m).replace(',', '').lower().strip()
-                if normalized and len(normalized) >= 2:
-                    numbers.add(normalized)
-        return numbers
-
-    def extract_stat_values(stat_cards):
-        """Extract values from stat cards"""
-        if not stat_cards:
-            return set()
-        values = set()
-        for card in stat_cards:
-            val = str(card.get('value', '')).replace(',', '').lower().strip()
-            if val:
-                values.add(val)
-        return values
-
-    def normalize_url(url):
-        """Normalize URL for comparison"""
-        if not url:
-            return ''
-        url = url.lower().strip()
-        # Remove protocol, www, trailing slashes
-        url = re.sub(r'^https?://', '', url)
-        url = re.sub(r'^www\.', '', url)
-        url = url.rstrip('/')
-        return url
-
-    def is_generic_index_url(url):
-        """Check if URL is a generic index/listing page that shouldn't be used for duplicate matching"""
-        if not url:
-            return True
-        url_lower = url.lower()
-        # Generic patterns that indicate index/listing pages
-        generic_patterns = [
-            '/index.aspx', '/index.html', '/index.php', '/index.htm',
-            '/pages/index', '/decisions/pages/', '/newsroom', '/news-releases',
-            '/media-room', '/press-releases', '/announcements',
-            'canada.ca/en/immigration', 'canada.ca/fr/immigration',  # Generic IRCC pages
-            '/search?', '/results?', '/list?',  # Search/list pages
-        ]
-        for pattern in generic_patterns:
-            if pattern in url_lower:
-                return True
-        # Also check if URL ends with just a domain or section (no specific article ID)
-        if url_lower.endswith(('.gc.ca', '.ca/en', '.ca/fr', '/en', '/fr')):
-            return True
-        return False
-
     try:
         data = request.get_json()
         title = data.get('title', '').strip()
-        slug = data.get('slug', '')
-        source_url = data.get('source_url', '')
-        full_article = data.get('full_article', '')
-        stat_cards = data.get('stat_cards', [])
-        summary = data.get('summary', '')
 
         if not title:
             return jsonify({"exists": False, "reason": "No title provided"})
 
-        results = load_results()
-
-        # Extract key data from new article
-        new_numbers = extract_numbers(title + ' ' + summary + ' ' + full_article)
-        new_stats = extract_stat_values(stat_cards)
-        new_source = normalize_url(source_url)
-        new_all_numbers = new_numbers | new_stats
-
         print(f"🔍 Checking duplicate for: {title[:50]}...")
-        print(f"   Key numbers: {new_all_numbers}")
-
-        for article in results:
-            existing_id = article.get('id', '')
-            existing_title = article.get('title', '')
-            existing_slug = article.get('slug', '')
-            existing_source = normalize_url(article.get('source_url', ''))
-            existing_article = article.get('full_article', '')
-            existing_stats = article.get('stat_cards', [])
-            existing_summary = article.get('summary', '')
-
-            # 1. Exact slug match
-            if slug and existing_slug == slug:
-                return jsonify({
-                    "exists": True,
-                    "reason": "slug_match",
-                    "existing_id": existing_id,
-                    "existing_title": existing_title,
-                    "created_at": article.get('created_at')
-                })
-
-            # 2. Same source URL (same news article) - but skip generic index pages
-            if new_source and existing_source and new_source == existing_source:
-                # Don't match on generic index/listing pages
-                if not is_generic_index_url(source_url):
-                    return jsonify({
-                        "exists": True,
-                        "reason": "source_url_match",
-                        "existing_id": existing_id,
-                        "existing_title": existing_title,
-                        "created_at": article.get('created_at')
-                    })
-
-            # 3. Extract numbers from existing article
-            existing_numbers = extract_numbers(existing_title + ' ' + existing_summary + ' ' + existing_article)
-            existing_stat_values = extract_stat_values(existing_stats)
-            existing_all_numbers = existing_numbers | existing_stat_values
-
-            # Determine if this is a cross-pipeline check (media vs news)
-            new_pipeline = data.get('pipeline', data.get('category', ''))
-            existing_pipeline = article.get('pipeline', article.get('category', ''))
-
-            # News and media pipelines cover the same stories from different sources
-            news_types = {'news', 'breaking', 'breaking_news'}
-            media_types = {'media', 'magazine'}
-            is_cross_pipeline = (
-                (new_pipeline in news_types and existing_pipeline in media_types) or
-                (new_pipeline in media_types and existing_pipeline in news_types)
-            )
-
-            # 4. Key numbers match - MORE AGGRESSIVE for cross-pipeline
-            if len(new_all_numbers) >= 2 and len(existing_all_numbers) >= 2:
-                matching_numbers = new_all_numbers & existing_all_numbers
-                # Filter to only meaningful matches (exclude common years)
-                meaningful_matches = {n for n in matching_numbers if not (n.isdigit() and len(n) == 4 and 2020 <= int(n) <= 2030)}
-
-                # Lower threshold for cross-pipeline (media reporting on same news)
-                # 2 matching numbers for cross-pipeline, 3 for same pipeline
-                min_matches = 2 if is_cross_pipeline else 3
-
-                if len(meaningful_matches) >= min_matches:
-                    return jsonify({
-                        "exists": True,
-                        "reason": "cross_pipeline_match" if is_cross_pipeline else "key_numbers_match",
-                        "matching_numbers": list(meaningful_matches)[:5],
-                        "existing_id": existing_id,
-                        "existing_title": existing_title,
-                        "existing_pipeline": existing_pipeline,
-                        "created_at": article.get('created_at')
-                    })
-
-            # 5. Title word similarity
-            def normalize_text(t):
-                t = re.sub(r'[^\w\s]', '', t.lower())
-                # Remove common words that don't help identify duplicates
-                stopwords = {'the', 'a', 'an', 'in', 'on', 'at', 'to', 'for', 'of', 'and', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can'}
-                words = set(t.split()) - stopwords
-                return words
-
-            new_words = normalize_text(title)
-            existing_words = normalize_text(existing_title)
-
-            if len(new_words) >= 3 and len(existing_words) >= 3:
-                overlap = len(new_words & existing_words) / max(len(new_words), 1)
-
-                # Lower threshold for cross-pipeline (60%) vs same pipeline (70%)
-                threshold = 0.60 if is_cross_pipeline else 0.70
-
-                if overlap >= threshold:
-                    # For cross-pipeline, require just 1 matching number
-                    # For same pipeline, require at least 1 matching number
-                    matching_nums = new_all_numbers & existing_all_numbers
-                    meaningful_nums = {n for n in matching_nums if not (n.isdigit() and len(n) == 4 and 2020 <= int(n) <= 2030)}
-
-                    if meaningful_nums:
-                        return jsonify({
-                            "exists": True,
-                            "reason": "cross_pipeline_title_match" if is_cross_pipeline else "title_and_numbers_match",
-                            "similarity": round(overlap * 100),
-                            "matching_numbers": list(meaningful_nums)[:3],
-                            "existing_id": existing_id,
-                            "existing_title": existing_title,
-                            "existing_pipeline": existing_pipeline,
-                            "created_at": article.get('created_at')
-                        })
 
-        return jsonify({"exists": False})
+        # The first check in a worker waits for the initial load; later ones never do
+        start_duplicate_index()
+        if not _duplicate_ready.wait(DUPLICATE_LOAD_WAIT):
+            print("   Duplicate index still loading; checking against the articles loaded so far")
+        match = _duplicate_index.check(
+            title,
+            slug=data.get('slug', ''),
+            source_url=data.get('source_url', ''),
+            summary=data.get('summary', ''),
+            full_article=data.get('full_article', ''),
+            stat_cards=data.get('stat_cards', []),
+            pipeline=data.get('pipeline', data.get('category', '')),
+        )
+        return jsonify(match or {"exists": False})
 
     except Exception as e:
         print(f"❌ Duplicate check failed: {e}")
@@ -2513,11 +3699,9 @@ def add_result():
         if not data or not data.get('title'):
             return jsonify({'error': 'Missing required field: title'}), 400
 
-        results = load_results()
-
         # Generate unique ID - use track, fallback to category, then 'content'
         track = data.get('track') or data.get('category') or 'content'
-        content_id = f"{track}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{len(results)}"
+        content_id = _content_ids.new(track)
 
         result = {
             "id": content_id,
@@ -2543,8 +3727,7 @@ def add_result():
             "posted_at": None
         }
 
-        results.insert(0, result)  # Add to beginning
-        save_results(results)
+        _results_journal.put(result)  # Add to beginning
 
         return jsonify({
             "success": True,
@@ -2555,76 +3738,58 @@ def add_result():
         return jsonify({"success": False, "error": str(e)}), 500
 
 
-@app.route('/api/results/<content_id>/approve', methods=['POST'])
-def approve_content(content_id):
-    """Approve content for posting"""
+def transition_content(content_id, status, message):
+    """Response for a review status change (404 if unknown, 409 if the current status forbids it)"""
     try:
-        results = load_results()
-        approved = load_approved()
-
-        for result in results:
-            if result.get('id') == content_id:
-                result['status'] = 'approved'
-                result['approved_at'] = datetime.now().isoformat()
-                approved.append(result)
-                break
-
-        save_results(results)
-        save_approved(approved)
-
-        return jsonify({"success": True, "message": "Content approved"})
+        doc = _content_states.transition(content_id, status)
+    except ContentNotFound:
+        return jsonify({"success": False, "error": "Content not found"}), 404
+    except InvalidTransition as e:
+        return jsonify({"success": False, "error": str(e), "status": e.current}), 409
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
+    # Patch the cached card instead of refreshing the whole cache
+    if doc.get('_id'):
+        cache_upsert(doc, insert=False)
+
+    return jsonify({"success": True, "message": message, "status": doc.get('status')})
+
+
+@app.route('/api/results/<content_id>/approve', methods=['POST'])
+def approve_content(content_id):
+    """Approve content for posting"""
+    return transition_content(content_id, 'approved', "Content approved")
+
 
 @app.route('/api/results/<content_id>/reject', methods=['POST'])
 def reject_content(content_id):
     """Reject content"""
-    try:
-        results = load_results()
-
-        for result in results:
-            if result.get('id') == content_id:
-                result['status'] = 'rejected'
-                break
-
-        save_results(results)
-        return jsonify({"success": True, "message": "Content rejected"})
-    except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+    return transition_content(content_id, 'rejected', "Content rejected")
 
 
 @app.route('/api/results/<content_id>/delete', methods=['DELETE', 'POST'])
 def delete_content(content_id):
     """Permanently delete content"""
     try:
-        results = load_results()
-        original_count = len(results)
-
         # Find the article to get slug for MongoDB deletion
-        deleted_slug = None
-        for r in results:
-            if r.get('id') == content_id:
-                deleted_slug = r.get('slug')
-                break
-
-        # Filter out the article to delete
-        results = [r for r in results if r.get('id') != content_id]
-
-        if len(results) == original_count:
+        result = find_result('id', content_id)
+        if result is None:
             return jsonify({"success": False, "error": "Article not found"}), 404
+        deleted_slug = result.get('slug')
 
-        save_results(results)
+        _results_journal.delete(_results_journal.keys('id', content_id))
 
         # Also delete from MongoDB
         if deleted_slug:
             try:
                 articles_col = get_articles_collection()
                 if articles_col is not None:
-                    articles_col.delete_one({'slug': deleted_slug})
+                    delete_articles(articles_col, {'slug': deleted_slug})
                     print(f"   MongoDB: Deleted article '{deleted_slug}'")
             except Exception as mongo_err:
                 print(f"   ⚠️ MongoDB delete failed: {mongo_err}")
+            cache_remove(deleted_slug)
 
         return jsonify({"success": True, "message": f"Article {content_id} deleted"})
     except Exception as e:
@@ -2646,20 +3811,17 @@ def delete_article_by_slug():
         try:
             articles_col = get_articles_collection()
             if articles_col is not None:
-                result = articles_col.delete_one({'slug': slug})
-                deleted_mongo = result.deleted_count > 0
-                print(f"MongoDB: Deleted {result.deleted_count} article(s) with slug '{slug}'")
+                deleted_count = delete_articles(articles_col, {'slug': slug})
+                deleted_mongo = deleted_count > 0
+                print(f"MongoDB: Deleted {deleted_count} article(s) with slug '{slug}'")
         except Exception as mongo_err:
             print(f"MongoDB delete error: {mongo_err}")
 
         # Also delete from local results.json
-        results = load_results()
-        original_count = len(results)
-        results = [r for r in results if r.get('slug') != slug]
-        deleted_local = len(results) < original_count
+        deleted_local = _results_journal.delete(_results_journal.keys('slug', slug)) > 0
 
-        if deleted_local:
-            save_results(results)
+        if deleted_mongo:
+            cache_remove(slug)
 
         if deleted_mongo or deleted_local:
             return jsonify({
@@ -2686,16 +3848,15 @@ def clear_all_articles():
         try:
             articles_col = get_articles_collection()
             if articles_col is not None:
-                result = articles_col.delete_many({})
-                deleted_mongo = result.deleted_count
+                deleted_mongo = delete_articles(articles_col, {})
                 print(f"MongoDB: Deleted {deleted_mongo} articles")
         except Exception as mongo_err:
             print(f"MongoDB clear error: {mongo_err}")
 
         # Clear local results.json
-        results = load_results()
-        deleted_local = len(results)
-        save_results([])
+        deleted_local = len(_results_journal)
+        _results_journal.clear()
+        cache_clear()
 
         return jsonify({
             "success": True,
@@ -2711,19 +3872,7 @@ def clear_all_articles():
 @app.route('/api/results/<content_id>/posted', methods=['POST'])
 def mark_posted(content_id):
     """Mark content as posted"""
-    try:
-        results = load_results()
-
-        for result in results:
-            if result.get('id') == content_id:
-                result['status'] = 'posted'
-                result['posted_at'] = datetime.now().isoformat()
-                break
-
-        save_results(results)
-        return jsonify({"success": True, "message": "Content marked as posted"})
-    except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+    return transition_content(content_id, 'posted', "Content marked as posted")
 
 
 @app.route('/api/stats', methods=['GET'])
@@ -2754,8 +3903,8 @@ def get_stats():
 def clear_results():
     """Clear all results data"""
     try:
-        save_results([])
-        save_approved([])
+        _results_journal.clear()
+        forget_idempotent_responses()
         return jsonify({"success": True, "message": "All results cleared"})
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
@@ -2764,7 +3913,11 @@ def clear_results():
 @app.route('/api/approved', methods=['GET'])
 def get_approved():
     """Get approved content ready for posting"""
-    approved = load_approved()
+    approved = _content_states.approved()
+    for item in approved:
+        for field in ('image_url', 'featured_image'):
+            if item.get(field):
+                item[field] = convert_image_url(item[field])
     return jsonify({
         "count": len(approved),
         "content": approved
@@ -2812,7 +3965,12 @@ def upload_image():
 
 @app.route('/images/<filename>')
 def serve_image(filename):
-    """Serve images"""
+    """Serve images (image store files never change, so they are cached for a year)"""
+    if _image_store.ensure_local(filename):
+        response = send_from_directory(IMAGES_DIR, filename, max_age=31536000)
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
     return send_from_directory(IMAGES_DIR, filename)
 
 
@@ -3793,17 +4951,11 @@ def clear_all_data():
 
     cleared = []
 
-    # Clear in-memory cache first
-    global _memory_cache
-    with _cache_lock:
-        _memory_cache['articles'] = []
-        _memory_cache['results'] = []
-        _memory_cache['last_fetch'] = None
-    cleared.append('memory_cache')
-
     # Clear all JSON data files
+    _results_journal.clear()
+    cleared.append('results')
+
     data_files = {
-        'results': RESULTS_FILE,
         'articles': ARTICLES_FILE,
         'approved': APPROVED_FILE,
         'guides': GUIDES_FILE,
@@ -3819,38 +4971,35 @@ def clear_all_data():
         except Exception as e:
             pass
 
-    # Also clear the backend queue and results
-    try:
-        requests.post(f"{POST_API_URL}/queue/clear", timeout=5)
-        cleared.append('backend_queue')
-    except:
-        pass
-
-    try:
-        requests.post(f"{POST_API_URL}/results/clear", timeout=5)
-        cleared.append('backend_results')
-    except:
-        pass
-
-    try:
-        requests.post(f"{POST_API_URL}/posting/reset", timeout=5)
-        cleared.append('posting_status')
-    except:
-        pass
+    # Also clear the backend queue and results (delivered in the background). Messages
+    # still queued for it would be undone by the clear, so drop them first
+    _post_api_outbox.clear()
+    queued = []
+    for name, path in [('backend_queue', '/queue/clear'), ('backend_results', '/results/clear'),
+                       ('posting_status', '/posting/reset')]:
+        try:
+            _post_api_outbox.enqueue(path)
+            queued.append(name)
+        except Exception as e:
+            print(f"Error queueing {path}: {e}")
 
     # Clear MongoDB articles collection
     try:
         articles_col = get_articles_collection()
         if articles_col is not None:
-            articles_col.delete_many({})
+            delete_articles(articles_col, {})
             cleared.append('mongodb_articles')
     except Exception as e:
         print(f"Error clearing MongoDB: {e}")
 
+    cache_clear()
+    cleared.append('memory_cache')
+
     return jsonify({
         'success': True,
         'message': 'All data cleared',
-        'cleared': cleared
+        'cleared': cleared,
+        'queued': queued
     })
 
 
@@ -4387,20 +5536,20 @@ def admin_article_new():
             return render_template('admin/article_edit.html', article=data)
 
         # Save article
-        results = load_results()
         data['id'] = f"admin_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
-        results.append(data)
-        save_results(results)
+        data['derived'] = article_derived_fields(data)
+        _results_journal.put(data, front=False)
 
         # Also save to MongoDB if connected
         articles_col = get_articles_collection()
         if articles_col is not None:
             try:
-                articles_col.update_one(
+                result = articles_col.update_one(
                     {'slug': data['slug']},
-                    {'$set': data},
+                    {'$set': with_modified_at(data)},
                     upsert=True
                 )
+                cache_upsert(dict(data, _id=result.upserted_id) if result.upserted_id else data)
             except Exception as e:
                 print(f"MongoDB save error: {e}")
 
@@ -4414,13 +5563,16 @@ def admin_article_new():
 @admin_required
 def admin_article_edit(slug):
     """Edit existing article"""
-    articles = load_articles()
-    article = next((a for a in articles if a.get('slug') == slug), None)
+    card = get_article_index().by_slug.get(slug)
 
-    if not article:
+    if not card:
         flash('Article not found', 'error')
         return redirect(url_for('admin_articles'))
 
+    # Edit a copy of the full article (card + body) without the card-only fields;
+    # the card keeps its version so the body comes from the right cache entry
+    article = {k: v for k, v in load_article_detail(card).items() if k not in ARTICLE_CARD_ONLY_FIELDS}
+
     if request.method == 'POST':
         # Handle image upload if file provided
         image_url = request.form.get('image_url', '') or article.get('image_url', '')
@@ -4447,23 +5599,26 @@ def admin_article_edit(slug):
         article['keywords'] = request.form.get('keywords', '')
         article['updated_at'] = datetime.utcnow().isoformat()
         article['updated_by'] = current_user.username
-
-        # Save to results
-        results = load_results()
-        for i, a in enumerate(results):
-            if a.get('slug') == slug:
-                results[i] = article
-                break
-        save_results(results)
-
-        # Also update MongoDB
+        article['derived'] = article_derived_fields(article)
+        # New version: the listings re-index the article and the detail page loads the new body
+        article['modified_at'] = datetime.utcnow()
+        _article_body_cache.pop((slug, card.get('version')))
+        _article_body_cache.put((slug, str(article['modified_at'])), normalize_article_body(article))
+
+        # Save to results (the full article, so the local fallback keeps the body)
+        keys = _results_journal.keys('slug', slug)
+        if keys:
+            _results_journal.put(article, key=keys[0])
+
+        # Also update MongoDB (the body fields are unchanged there)
         articles_col = get_articles_collection()
         if articles_col is not None:
             try:
                 articles_col.update_one(
                     {'slug': slug},
-                    {'$set': article}
+                    {'$set': {k: v for k, v in article.items() if k not in ARTICLE_BODY_FIELDS}}
                 )
+                cache_upsert({k: v for k, v in article.items() if k not in ARTICLE_BODY_FIELDS}, insert=False)
             except Exception as e:
                 print(f"MongoDB update error: {e}")
 
@@ -4484,14 +5639,12 @@ def admin_article_delete(slug):
     if articles_col is not None:
         try:
             # Try by slug first
-            result = articles_col.delete_one({'slug': slug})
-            if result.deleted_count > 0:
+            if delete_articles(articles_col, {'slug': slug}) > 0:
                 deleted = True
             else:
                 # Try by _id if slug didn't match
                 try:
-                    result = articles_col.delete_one({'_id': ObjectId(slug)})
-                    if result.deleted_count > 0:
+                    if delete_articles(articles_col, {'_id': ObjectId(slug)}) > 0:
                         deleted = True
                 except:
                     pass
@@ -4500,24 +5653,14 @@ def admin_article_delete(slug):
 
     # Also try to remove from local file if it exists
     try:
-        if os.path.exists(RESULTS_FILE):
-            with open(RESULTS_FILE, 'r') as f:
-                results = json.load(f)
-            original_count = len(results)
-            # Try by slug or _id
-            results = [a for a in results if a.get('slug') != slug and str(a.get('_id', '')) != slug]
-            if len(results) < original_count:
-                with open(RESULTS_FILE, 'w') as f:
-                    json.dump(results, f, indent=2)
-                deleted = True
+        # Try by slug or _id
+        if _results_journal.delete(_results_journal.keys('slug', slug) + _results_journal.keys('_id', slug)):
+            deleted = True
     except Exception as e:
         print(f"Local file delete error: {e}")
 
-    # Clear cache to reflect changes immediately
-    global _memory_cache
-    with _cache_lock:
-        _memory_cache['results'] = []
-        _memory_cache['last_fetch'] = None
+    # Drop the cached card (by slug or _id) and publish to the other workers
+    cache_remove(slug)
 
     if deleted:
         flash('Article deleted successfully!', 'success')
@@ -4538,52 +5681,33 @@ def admin_articles_bulk_delete():
         if not ids:
             return jsonify({'success': False, 'error': 'No articles selected'}), 400
 
-        deleted_count = 0
-        articles_col = get_articles_collection()
-
-        for article_id in ids:
-            deleted = False
+        ids = [str(article_id) for article_id in ids]
+        deleted_ids = set()  # Requested ids (slugs or _ids) that matched an article
 
-            # Delete from MongoDB
-            if articles_col is not None:
-                try:
-                    # Try by slug first
-                    result = articles_col.delete_one({'slug': article_id})
-                    if result.deleted_count > 0:
-                        deleted = True
-                    else:
-                        # Try by _id if slug didn't match
-                        try:
-                            result = articles_col.delete_one({'_id': ObjectId(article_id)})
-                            if result.deleted_count > 0:
-                                deleted = True
-                        except:
-                            pass
-                except Exception as e:
-                    print(f"MongoDB delete error for {article_id}: {e}")
-
-            # Also try to remove from local file
+        # Delete from MongoDB: one query for every id, by slug or by _id
+        articles_col = get_articles_collection()
+        if articles_col is not None:
             try:
-                if os.path.exists(RESULTS_FILE):
-                    with open(RESULTS_FILE, 'r') as f:
-                        results = json.load(f)
-                    original_count = len(results)
-                    results = [a for a in results if a.get('slug') != article_id and str(a.get('_id', '')) != article_id]
-                    if len(results) < original_count:
-                        with open(RESULTS_FILE, 'w') as f:
-                            json.dump(results, f, indent=2)
-                        deleted = True
+                object_ids = [ObjectId(article_id) for article_id in ids if ObjectId.is_valid(article_id)]
+                for doc in delete_article_documents(articles_col, {'$or': [{'slug': {'$in': ids}},
+                                                                           {'_id': {'$in': object_ids}}]}):
+                    deleted_ids.update([doc.get('slug'), str(doc['_id'])])
             except Exception as e:
-                print(f"Local file delete error for {article_id}: {e}")
+                print(f"MongoDB bulk delete error: {e}")
 
-            if deleted:
-                deleted_count += 1
+        # Also remove from the local file (one journal write)
+        try:
+            keys = _results_journal.keys_in('slug', ids) + _results_journal.keys_in('_id', ids)
+            for doc in filter(None, map(_results_journal.get, keys)):
+                deleted_ids.update([doc.get('slug'), str(doc.get('_id'))])
+            _results_journal.delete(keys)
+        except Exception as e:
+            print(f"Local file bulk delete error: {e}")
 
-        # Clear cache
-        global _memory_cache
-        with _cache_lock:
-            _memory_cache['results'] = []
-            _memory_cache['last_fetch'] = None
+        deleted_count = len(deleted_ids.intersection(ids))
+
+        # Drop only the removed cards from the cache and publish to the other workers
+        cache_remove(*deleted_ids)
 
         return jsonify({
             'success': True,
@@ -4599,14 +5723,13 @@ def admin_articles_bulk_delete():
 @admin_required
 def admin_article_preview(slug):
     """Preview article (same as public view but with admin bar)"""
-    articles = load_articles()
-    article = next((a for a in articles if a.get('slug') == slug), None)
+    article = get_article_index().by_slug.get(slug)
 
     if not article:
         flash('Article not found', 'error')
         return redirect(url_for('admin_articles'))
 
-    return render_template('admin/article_preview.html', article=article, is_preview=True)
+    return render_template('admin/article_preview.html', article=load_article_detail(article), is_preview=True)
 
 
 @app.route('/admin/upload-image', methods=['POST'])
@@ -4968,22 +6091,29 @@ def admin_media_delete(filename):
 @admin_required
 def admin_analytics():
     """Analytics dashboard"""
-    # Get article stats
-    articles = load_articles()
-    total_articles = len(articles)
+    # Get article stats (whole collection from MongoDB, else the cached articles)
+    index = get_article_index()
+    counts = article_facet_counts(index)
+    if counts is not None:
+        total_articles = counts['total']
+        categories = counts['categories']
+        articles_by_month = counts['months']
+    else:
+        articles = index.articles
+        total_articles = len(articles)
 
-    # Category breakdown
-    categories = {}
-    for article in articles:
-        cat = article.get('category', 'uncategorized')
-        categories[cat] = categories.get(cat, 0) + 1
+        # Category breakdown
+        categories = {}
+        for article in articles:
+            cat = article.get('category', 'uncategorized')
+            categories[cat] = categories.get(cat, 0) + 1
 
-    # Articles by month
-    articles_by_month = {}
-    for article in articles:
-        created = article.get('created_at', '')[:7]  # YYYY-MM
-        if created:
-            articles_by_month[created] = articles_by_month.get(created, 0) + 1
+        # Articles by month
+        articles_by_month = {}
+        for article in articles:
+            created = article.get('created_at', '')[:7]  # YYYY-MM
+            if created:
+                articles_by_month[created] = articles_by_month.get(created, 0) + 1
 
     # User stats
     users_col = get_users_collection()
@@ -5048,6 +6178,23 @@ def admin_settings():
     return render_template('admin/settings.html', admins=admins, env_info=env_info)
 
 
+@app.route('/admin/outbox')
+@admin_required
+def admin_outbox():
+    """Queued and dead-lettered Post API calls"""
+    return jsonify({
+        'pending': _post_api_outbox.messages('pending'),
+        'dead': _post_api_outbox.messages('dead')
+    })
+
+
+@app.route('/admin/outbox/retry', methods=['POST'])
+@admin_required
+def admin_outbox_retry():
+    """Queue every dead-lettered Post API call again"""
+    return jsonify({'success': True, 'retried': _post_api_outbox.retry_dead()})
+
+
 @app.route('/admin/settings/admin/add', methods=['POST'])
 @admin_required
 def admin_settings_add_admin():
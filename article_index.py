@@ -0,0 +1,201 @@
+"""
+Article Index
+Precomputed lookup tables over the normalized article list
+"""
+
+import itertools
+import string
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+# Monotonic build counter so caches can tell one index from the next
+_index_versions = itertools.count(1)
+
+
+def generate_short_id(title):
+    """Generate short ID from title (matching n8n workflow)"""
+    if not title:
+        return 'news'
+    hash_val = 0
+    for char in title:
+        hash_val = ((hash_val << 5) - hash_val) + ord(char)
+        hash_val = hash_val & 0xFFFFFFFF  # Keep as 32-bit
+    # Convert to base36 and take first 6 chars
+    chars = string.digits + string.ascii_lowercase
+    result = ''
+    val = abs(hash_val)
+    while val > 0:
+        result = chars[val % 36] + result
+        val //= 36
+    return result[:6] if result else 'news'
+
+
+class ArticleIndex:
+    """
+    Read-only index over a list of normalized articles.
+    Built once per cache refresh so page lookups are dict accesses
+    instead of scans over the whole list.
+    """
+
+    def __init__(self, articles):
+        # Articles are expected newest first (load_articles sorts them)
+        self.articles = articles
+        self.version = next(_index_versions)
+        # Newest change in the data (same in every worker, unlike the build time)
+        self.last_modified = max((version_timestamp(a.get('version')) for a in articles), default=0.0)
+        self.by_slug = {}
+        self.by_id = {}
+        self.by_short_id = {}
+        self.by_category = {}
+        self.by_tag = {}
+
+        for article in articles:
+            # First (newest) article wins on collisions, same as the old linear scans
+            slug = article.get('slug')
+            if slug:
+                self.by_slug.setdefault(slug, article)
+
+            article_id = article.get('id')
+            if article_id:
+                self.by_id.setdefault(article_id, article)
+
+            short_id = article.get('short_id') or generate_short_id(article.get('title', ''))
+            self.by_short_id.setdefault(short_id, article)
+
+            self.by_category.setdefault(article.get('category', ''), []).append(article)
+            for tag in article.get('tags', []):
+                self.by_tag.setdefault(tag, []).append(article)
+
+    def __len__(self):
+        return len(self.articles)
+
+    def get(self, key):
+        """Find an article by slug, falling back to ID"""
+        if not key:
+            return None
+        return self.by_slug.get(key) or self.by_id.get(key)
+
+    def get_by_short_id(self, short_id):
+        """Find an article by its short URL ID"""
+        return self.by_short_id.get(short_id)
+
+    def in_category(self, category):
+        """Articles in a category, newest first"""
+        return self.by_category.get(category, [])
+
+    def in_tag(self, tag):
+        """Articles with a browse tag (e.g. 'pnp' or 'pnp/ontario'), newest first"""
+        return self.by_tag.get(tag, [])
+
+    def related(self, article, limit=3):
+        """Other articles in the same category, newest first"""
+        related = []
+        for candidate in self.in_category(article.get('category', '')):
+            if candidate.get('id') != article.get('id'):
+                related.append(candidate)
+                if len(related) >= limit:
+                    break
+        return related
+
+
+def version_timestamp(value):
+    """Epoch seconds of a stored modified_at/created_at value (naive values are UTC; 0 if not a date)"""
+    try:
+        moment = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return 0.0
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def listing_key(article):
+    """Sort key of the newest-first listing order: created_at, then slug to break ties"""
+    return (article.get('created_at') or '', article.get('slug') or '')
+
+
+def encode_cursor(article):
+    """Keyset cursor for the article a page ended with ("created_at|slug")"""
+    return '|'.join(listing_key(article))
+
+
+def decode_cursor(before):
+    """listing_key() of a cursor; a bare created_at (no slug) continues after everything at that time"""
+    if '|' not in before:
+        return (before, '')
+    created_at, _, slug = before.rpartition('|')
+    return (created_at, slug)
+
+
+def paginate(articles, page=1, per_page=24, before=None):
+    """
+    Slice one page out of a newest-first article list (sorted by listing_key).
+    Passing `before` (a cursor from next_before) switches to keyset pagination: the
+    page starts at the first article after it in listing order, which stays stable
+    while new articles are being published.
+    """
+    total = len(articles)
+    page = max(1, page)
+
+    if before:
+        # Binary search on the descending listing order
+        cursor = decode_cursor(before)
+        lo, hi = 0, total
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if listing_key(articles[mid]) >= cursor:
+                lo = mid + 1
+            else:
+                hi = mid
+        start = lo
+        page = start // per_page + 1
+    else:
+        start = (page - 1) * per_page
+
+    items = articles[start:start + per_page]
+    has_more = start + len(items) < total
+
+    return {
+        'items': items,
+        'page': page,
+        'per_page': per_page,
+        'total': total,
+        'pages': (total + per_page - 1) // per_page,
+        'has_more': has_more,
+        'next_before': encode_cursor(items[-1]) if items and has_more else None,
+    }
+
+
+class LRUCache:
+    """Small thread-safe LRU map (used for article bodies fetched on demand)"""
+
+    def __init__(self, max_size=200):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            return self._items.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
@@ -0,0 +1,97 @@
+"""
+Shared Article Snapshot
+Serialized article cache shared by all gunicorn workers on one box.
+One worker at a time (holding the refresher lock) fetches from MongoDB and
+publishes a new snapshot; the others load it from the file instead of querying
+MongoDB (each worker still decodes its own copy).
+"""
+
+import os
+import json
+import time
+import fcntl
+from contextlib import contextmanager
+
+# Fixed-width header so the generation can be read without parsing the payload
+HEADER_SIZE = 64
+MAGIC = b'PHSNAP1'
+
+
+class ArticleSnapshot:
+    """Atomically replaced snapshot file with a generation counter"""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock_path = path + '.lock'
+
+    def stamp(self):
+        """Cheap change marker (inode + mtime); None if there is no snapshot yet"""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns)
+
+    def read_generation(self):
+        """Generation of the current snapshot, read from the header only"""
+        try:
+            with open(self.path, 'rb') as f:
+                return self._parse_header(f.read(HEADER_SIZE))[0]
+        except (OSError, ValueError):
+            return 0
+
+    def load(self):
+        """Load the snapshot payload; None if missing or corrupt"""
+        try:
+            with open(self.path, 'rb') as f:
+                generation, written_at = self._parse_header(f.read(HEADER_SIZE))
+                payload = json.loads(f.read())
+        except (OSError, ValueError) as e:
+            print(f"Article snapshot unreadable: {e}")
+            return None
+
+        payload['generation'] = generation
+        payload['written_at'] = written_at
+        return payload
+
+    def write(self, payload):
+        """
+        Publish a new snapshot (call while holding the refresher lock).
+        Written to a temp file and renamed into place so readers never see a partial file.
+        Returns the new generation.
+        """
+        generation = self.read_generation() + 1
+        written_at = time.time()
+        header = b'%s %d %.3f' % (MAGIC, generation, written_at)
+        body = json.dumps(payload, default=str).encode('utf-8')
+
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(header.ljust(HEADER_SIZE - 1) + b'\n')
+            f.write(body)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        return generation
+
+    @contextmanager
+    def refresher_lock(self, blocking=False):
+        """Cross-process lock electing the worker that refreshes; yields whether it was acquired"""
+        with open(self.lock_path, 'a') as lock_file:
+            flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+            try:
+                fcntl.flock(lock_file.fileno(), flags)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    @staticmethod
+    def _parse_header(header):
+        parts = bytes(header).split()
+        if len(parts) < 3 or parts[0] != MAGIC:
+            raise ValueError("bad snapshot header")
+        return int(parts[1]), float(parts[2])
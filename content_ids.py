@@ -0,0 +1,54 @@
+"""
+Content IDs
+Allocates content ids ({track}_{YYYYmmdd_HHMMSS}_{n}) without reading stored
+content. n comes from a MongoDB counter document incremented with $inc, so ids
+are unique across workers and machines, and a batch of ids costs one round
+trip. Without MongoDB, n is this process's id plus a per-process sequence.
+"""
+
+import os
+import itertools
+import threading
+from datetime import datetime
+
+from pymongo import ReturnDocument
+
+COUNTER_ID = 'content_id'
+
+
+class ContentIds:
+    """Unique, time-ordered content ids"""
+
+    def __init__(self, get_counters):
+        self._get_counters = get_counters
+        self._lock = threading.Lock()
+        self._pid = None
+        self._local = None
+
+    def new(self, prefix):
+        return self.allocate([prefix])[0]
+
+    def allocate(self, prefixes):
+        """One id per prefix, with a single counter increment"""
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        return [f"{prefix}_{stamp}_{n}" for prefix, n in zip(prefixes, self._numbers(len(prefixes)))]
+
+    def _numbers(self, count):
+        counters = self._get_counters()
+        if counters is not None:
+            try:
+                counter = counters.find_one_and_update(
+                    {'_id': COUNTER_ID},
+                    {'$inc': {'value': count}},
+                    upsert=True,
+                    return_document=ReturnDocument.AFTER,
+                )
+                return range(counter['value'] - count + 1, counter['value'] + 1)
+            except Exception as e:
+                print(f"Content id counter unavailable: {e}")
+
+        with self._lock:
+            if self._pid != os.getpid():  # New sequence after a fork
+                self._pid = os.getpid()
+                self._local = itertools.count(1)
+            return [f"{self._pid}-{next(self._local)}" for _ in range(count)]
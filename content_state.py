@@ -0,0 +1,97 @@
+"""
+Content State
+Review workflow for generated content: pending -> approved -> posted, and
+rejection of pending or approved items. Every transition is one conditional
+update (the current status is part of the filter), so two reviewers racing on
+the same item cannot both win and posted content cannot be approved again.
+"""
+
+from datetime import datetime
+
+from pymongo import ReturnDocument
+
+# status -> (statuses it may be reached from, timestamp field it sets)
+TRANSITIONS = {
+    'approved': (('pending', None), 'approved_at'),
+    'rejected': (('pending', None, 'approved'), 'rejected_at'),
+    'posted': (('approved',), 'posted_at'),
+}
+APPROVED_LIMIT = 500
+# Fields returned with a transitioned document
+STATE_PROJECTION = {'id': 1, 'slug': 1, 'title': 1, 'status': 1,
+                    'approved_at': 1, 'rejected_at': 1, 'posted_at': 1}
+
+
+class ContentNotFound(Exception):
+    pass
+
+
+class InvalidTransition(Exception):
+    """The content exists but its current status does not allow the transition"""
+
+    def __init__(self, status, current):
+        super().__init__(f"Cannot mark content as {status} while it is {current or 'pending'}")
+        self.status = status
+        self.current = current
+
+
+class ContentStates:
+    """
+    Status transitions against MongoDB, falling back to the local results journal
+    for content that only exists locally (e.g. /api/results items) or when MongoDB
+    is unavailable. A local copy of MongoDB content is patched along with it.
+    """
+
+    def __init__(self, get_collection, journal):
+        self._get_collection = get_collection
+        self._journal = journal
+
+    def transition(self, content_id, status):
+        """
+        Move content to status; returns the updated document's state fields.
+        Raises ContentNotFound or InvalidTransition.
+        """
+        allowed, timestamp_field = TRANSITIONS[status]
+        changes = {'status': status, timestamp_field: datetime.now().isoformat()}
+
+        articles_col = self._get_collection()
+        if articles_col is not None:
+            doc = articles_col.find_one_and_update(
+                {'id': content_id, 'status': {'$in': list(allowed)}},
+                # modified_at lets incremental cache refreshes pick the change up
+                {'$set': dict(changes, modified_at=datetime.utcnow())},
+                projection=STATE_PROJECTION,
+                return_document=ReturnDocument.AFTER,
+            )
+            if doc is None:
+                # Only a failed transition pays for a second query
+                current = articles_col.find_one({'id': content_id}, {'status': 1})
+                if current is not None:
+                    raise InvalidTransition(status, current.get('status'))
+            else:
+                doc['_id'] = str(doc['_id'])
+                for key in self._journal.keys('id', content_id):
+                    self._journal.update(key, changes)
+                return doc
+
+        for key in self._journal.keys('id', content_id):
+            if self._journal.update(key, changes, expect={'status': allowed}):
+                doc = self._journal.get(key)
+                return {field: doc.get(field) for field in STATE_PROJECTION}
+            raise InvalidTransition(status, (self._journal.get(key) or {}).get('status'))
+        raise ContentNotFound(content_id)
+
+    def approved(self, limit=APPROVED_LIMIT):
+        """Approved content ready for posting, oldest approval first"""
+        content = []
+        articles_col = self._get_collection()
+        if articles_col is not None:
+            for doc in articles_col.find({'status': 'approved'}).sort('approved_at', 1).limit(limit):
+                doc['_id'] = str(doc['_id'])
+                content.append(doc)
+
+        seen = {doc.get('id') for doc in content}
+        local = [doc for doc in map(self._journal.get, self._journal.keys('status', 'approved'))
+                 if doc is not None and doc.get('id') not in seen]
+        content.extend(sorted(local, key=lambda doc: doc.get('approved_at') or ''))
+        return content[:limit]
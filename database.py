@@ -4,6 +4,7 @@ Handles connection to MongoDB Atlas and provides database access
 """
 
 import os
+import gridfs
 from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
 
@@ -79,6 +80,15 @@ def _create_indexes(db):
         db.articles.create_index('slug', unique=True, sparse=True)
         db.articles.create_index('created_at')
         db.articles.create_index('category')
+        db.articles.create_index('modified_at')
+        # Listed articles with current derived fields (browse/analytics counts, backfill)
+        db.articles.create_index([('derived.version', 1), ('derived.body_length', 1)])
+        # Review status transitions (by content id) and the approved queue
+        db.articles.create_index('id')
+        db.articles.create_index([('status', 1), ('approved_at', 1)])
+
+        # Article tombstones (deletes seen by incremental cache refreshes)
+        db.article_tombstones.create_index('deleted_at', expireAfterSeconds=7 * 24 * 3600)
 
         print("Database indexes created successfully")
 
@@ -126,6 +136,24 @@ def get_articles_collection():
     return db.articles if db is not None else None
 
 
+def get_article_tombstones_collection():
+    """Get deleted-article tombstones collection"""
+    db = get_database()
+    return db.article_tombstones if db is not None else None
+
+
+def get_counters_collection():
+    """Get counters collection (one document per id sequence)"""
+    db = get_database()
+    return db.counters if db is not None else None
+
+
+def get_images_fs():
+    """Get GridFS store for uploaded article images (durable copies of the image store files)"""
+    db = get_database()
+    return gridfs.GridFS(db, collection='images') if db is not None else None
+
+
 def is_connected():
     """Check if database is connected"""
     db = get_database()
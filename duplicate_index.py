@@ -0,0 +1,425 @@
+"""
+Duplicate Index
+Finds stored articles that a new article duplicates, for /api/articles/check.
+Each article's key numbers (CRS scores, ITA counts, dates, amounts) and a MinHash
+signature of its text are computed once when it is written (duplicate_features,
+stored in the article's derived fields). The index keeps them in lookup tables -
+slug, source URL, key number and LSH band buckets - so a check only evaluates the
+few articles that share something with the candidate instead of every article.
+The index covers every stored and local article, not only the cached listing cards;
+writes update it in place (upsert/remove) and a background load catches up with the rest.
+"""
+
+import re
+import zlib
+import threading
+from collections import defaultdict
+
+from text_tokens import words
+
+FEATURES_VERSION = 2
+
+# One-permutation MinHash: each shingle hash lands in one of NUM_BINS bins, which keep their minimum
+NUM_BINS = 32
+BANDS = 8  # LSH bands of NUM_BINS // BANDS bins; articles sharing any band are candidates
+ROWS = NUM_BINS // BANDS
+SHINGLE_WORDS = 3
+EMPTY_BIN = 0xFFFFFFFF
+NEAR_DUPLICATE_SIMILARITY = 0.7  # Estimated shingle Jaccard similarity that counts as the same text
+
+NUMBER_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'\b(\d{3})\s*(?:CRS|points?|score)',  # CRS scores (3 digits)
+    r'\b(\d{1,3}(?:,\d{3})+|\d{4,})\s*(?:ITAs?|invitations?|applicants?|people|candidates?)',  # Large numbers
+    r'\b(\d{1,2}(?:st|nd|rd|th)?\s+(?:January|February|March|April|May|June|July|August|September|October|November|December))',  # Dates
+    r'\b(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2}',  # Dates alt
+    r'\$\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',  # Dollar amounts
+    r'\b(\d+(?:\.\d+)?)\s*(?:percent|%)',  # Percentages
+    r'#\s*(\d+)',  # Draw numbers
+    r'\b(\d{4})\b',  # Years
+)]
+
+# Words that don't help identify duplicates
+TITLE_STOPWORDS = frozenset({
+    'the', 'a', 'an', 'in', 'on', 'at', 'to', 'for', 'of', 'and', 'is', 'are', 'was', 'were', 'be', 'been',
+    'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might',
+    'must', 'can',
+})
+
+# Generic index/listing pages that shouldn't be used for duplicate matching
+GENERIC_URL_PATTERNS = (
+    '/index.aspx', '/index.html', '/index.php', '/index.htm',
+    '/pages/index', '/decisions/pages/', '/newsroom', '/news-releases',
+    '/media-room', '/press-releases', '/announcements',
+    'canada.ca/en/immigration', 'canada.ca/fr/immigration',  # Generic IRCC pages
+    '/search?', '/results?', '/list?',  # Search/list pages
+)
+
+# News and media pipelines cover the same stories from different sources
+NEWS_PIPELINES = {'news', 'breaking', 'breaking_news'}
+MEDIA_PIPELINES = {'media', 'magazine'}
+
+
+def extract_numbers(text):
+    """All significant numbers in a text (CRS scores, ITA counts, dates, etc.), normalized"""
+    numbers = set()
+    if not text:
+        return numbers
+    text_lower = text.lower()
+    for pattern in NUMBER_PATTERNS:
+        for m in pattern.findall(text_lower):
+            # Normalize: remove commas, lowercase
+            normalized = str(m).replace(',', '').lower().strip()
+            if normalized and len(normalized) >= 2:
+                numbers.add(normalized)
+    return numbers
+
+
+def extract_stat_values(stat_cards):
+    """Values of stat cards, normalized like extract_numbers"""
+    values = set()
+    for card in stat_cards or []:
+        val = str(card.get('value', '') if isinstance(card, dict) else '').replace(',', '').lower().strip()
+        if val:
+            values.add(val)
+    return values
+
+
+def meaningful_numbers(numbers):
+    """Numbers without the common years, which many unrelated articles share"""
+    return {n for n in numbers if not (n.isdigit() and len(n) == 4 and 2020 <= int(n) <= 2030)}
+
+
+def normalize_url(url):
+    """URL without protocol, www and trailing slashes"""
+    if not url:
+        return ''
+    url = url.lower().strip()
+    url = re.sub(r'^https?://', '', url)
+    url = re.sub(r'^www\.', '', url)
+    return url.rstrip('/')
+
+
+def is_generic_index_url(url):
+    if not url:
+        return True
+    url_lower = url.lower()
+    if any(pattern in url_lower for pattern in GENERIC_URL_PATTERNS):
+        return True
+    # A URL ending with just a domain or section has no specific article
+    return url_lower.endswith(('.gc.ca', '.ca/en', '.ca/fr', '/en', '/fr'))
+
+
+def title_words(title):
+    return {w for w in words(title) if len(w) > 1} - TITLE_STOPWORDS
+
+
+def minhash_signature(text):
+    """
+    One-permutation MinHash of the text's word shingles: a single hash per shingle,
+    empty bins filled from the next non-empty one. The share of equal bins between
+    two signatures estimates the Jaccard similarity of their shingle sets.
+    Empty for a text without words.
+    """
+    tokens = words(text)
+    if not tokens:
+        return []
+    signature = [EMPTY_BIN] * NUM_BINS
+    for i in range(max(1, len(tokens) - SHINGLE_WORDS + 1)):
+        h = zlib.crc32(' '.join(tokens[i:i + SHINGLE_WORDS]).encode('utf-8'))
+        bin_ = h % NUM_BINS
+        value = h // NUM_BINS
+        if value < signature[bin_]:
+            signature[bin_] = value
+
+    filled = [i for i, value in enumerate(signature) if value != EMPTY_BIN]
+    for i in range(NUM_BINS):
+        if signature[i] == EMPTY_BIN:
+            # Borrow from the next filled bin (circularly), offset by the distance so borrowed bins differ
+            j = next((f for f in filled if f > i), filled[0])
+            signature[i] = signature[j] + ((j - i) % NUM_BINS) * (EMPTY_BIN // NUM_BINS + 1)
+    return signature
+
+
+def similarity(a, b):
+    """Estimated Jaccard similarity of two signatures"""
+    if not a or not b:
+        return 0.0
+    return sum(x == y for x, y in zip(a, b)) / NUM_BINS
+
+
+def duplicate_features(doc):
+    """Values a duplicate check compares, computed once per article from its full document"""
+    body = doc.get('full_article') or doc.get('content') or doc.get('excerpt') or ''
+    text = ' '.join([doc.get('title', ''), doc.get('summary', ''), body])
+    numbers = extract_numbers(text) | extract_stat_values(doc.get('stat_cards'))
+    return {
+        'version': FEATURES_VERSION,
+        'numbers': sorted(numbers),
+        'signature': minhash_signature(text),
+    }
+
+
+def has_features(doc):
+    """Whether a document carries current stored duplicate features"""
+    return ((doc.get('derived') or {}).get('duplicate') or {}).get('version') == FEATURES_VERSION
+
+
+def document_key(doc):
+    return doc.get('slug') or doc.get('id') or str(doc.get('_id', ''))
+
+
+def corpus_documents(*sources):
+    """
+    {key: (version, doc)} for DuplicateIndex.sync()/upsert() from lists of documents.
+    A key found in several sources keeps its latest version; at equal versions a document
+    with stored features wins over one the index would have to derive from an excerpt.
+    """
+    documents = {}
+    for docs in sources:
+        for doc in docs:
+            key = document_key(doc)
+            if not key:
+                continue
+            version = str(doc.get('modified_at') or doc.get('created_at') or '')
+            known = documents.get(key)
+            if (known is None or version > known[0] or
+                    (version == known[0] and has_features(doc) and not has_features(known[1]))):
+                documents[key] = (version, doc)
+    return documents
+
+
+def is_cross_pipeline(new_pipeline, existing_pipeline):
+    return ((new_pipeline in NEWS_PIPELINES and existing_pipeline in MEDIA_PIPELINES) or
+            (new_pipeline in MEDIA_PIPELINES and existing_pipeline in NEWS_PIPELINES))
+
+
+class DuplicateIndex:
+    """
+    Stored articles by slug, source URL, key number and LSH band.
+    check() collects the articles that could match any rule from those tables and
+    evaluates the rules on them only, newest first, so it returns the same match a
+    scan over every article would.
+    """
+
+    def __init__(self):
+        self._entries = {}  # key -> entry
+        self._by_slug = defaultdict(set)
+        self._by_url = defaultdict(set)
+        self._by_number = defaultdict(set)
+        self._buckets = defaultdict(set)  # (band, rows) -> keys
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def sync(self, docs):
+        """
+        Bring the index in line with {key: (version, doc)}: upsert() them and drop every
+        other article.
+        """
+        with self._lock:
+            for key in self._entries.keys() - docs.keys():
+                self._remove(key)
+        self.upsert(docs)
+
+    def upsert(self, docs):
+        """
+        Add or replace articles from {key: (version, doc)}. Only new and edited articles
+        are (re-)indexed; features are read from doc['derived']['duplicate'] when present
+        and computed from the document otherwise.
+        """
+        with self._lock:
+            for key, (version, doc) in docs.items():
+                entry = self._entries.get(key)
+                if entry is None or entry['version'] != version:
+                    if entry is not None:
+                        self._remove(key)
+                    self._add(key, version, doc)
+
+    def remove(self, keys):
+        """Drop articles by key, slug or MongoDB _id"""
+        keys = {str(key) for key in keys if key}
+        with self._lock:
+            for key in [key for key, entry in self._entries.items()
+                        if key in keys or entry['slug'] in keys or entry['_id'] in keys]:
+                self._remove(key)
+
+    def version(self, key):
+        """Version an article is indexed at, or None"""
+        entry = self._entries.get(key)
+        return entry['version'] if entry is not None else None
+
+    def check(self, title, slug='', source_url='', summary='', full_article='', stat_cards=None, pipeline=''):
+        """The first stored article the new one duplicates, as the /api/articles/check response, or None"""
+        features = duplicate_features({'title': title, 'summary': summary, 'full_article': full_article,
+                                       'stat_cards': stat_cards})
+        numbers = set(features['numbers'])
+        meaningful = meaningful_numbers(numbers)
+        words = title_words(title)
+        url = normalize_url(source_url)
+        url_usable = bool(url) and not is_generic_index_url(source_url)
+        signature = features['signature']
+
+        with self._lock:
+            candidates = set(self._by_slug.get(slug, ())) if slug else set()
+            if url_usable:
+                candidates |= self._by_url.get(url, set())
+            # The number and title rules both need a shared meaningful number
+            for number in meaningful:
+                candidates |= self._by_number.get(number, set())
+            for bucket in self._bands(signature):
+                candidates |= self._buckets.get(bucket, set())
+
+            for key in sorted(candidates, key=lambda key: (str(self._entries[key]['created_at'] or ''), key),
+                              reverse=True):
+                match = self._match(self._entries[key], slug, url, url_usable, numbers, meaningful, words,
+                                    signature, pipeline)
+                if match is not None:
+                    return match
+        return None
+
+    def _match(self, entry, slug, url, url_usable, numbers, meaningful, words, signature, pipeline):
+        found = {
+            "exists": True,
+            "existing_id": entry['id'],
+            "existing_title": entry['title'],
+            "created_at": entry['created_at'],
+        }
+
+        # 1. Exact slug match
+        if slug and entry['slug'] == slug:
+            return dict(found, reason="slug_match")
+
+        # 2. Same source URL (same news article), unless it is a generic listing page
+        if url_usable and entry['url'] == url:
+            return dict(found, reason="source_url_match")
+
+        cross_pipeline = is_cross_pipeline(pipeline, entry['pipeline'])
+        shared = meaningful & entry['meaningful']
+
+        # 3. Key numbers match - 2 matching numbers for cross-pipeline, 3 for same pipeline
+        if len(numbers) >= 2 and len(entry['numbers']) >= 2 and len(shared) >= (2 if cross_pipeline else 3):
+            return dict(found, reason="cross_pipeline_match" if cross_pipeline else "key_numbers_match",
+                        matching_numbers=list(shared)[:5], existing_pipeline=entry['pipeline'])
+
+        # 4. Similar title (60% of its words for cross-pipeline, 70% otherwise) plus a matching number
+        if len(words) >= 3 and len(entry['words']) >= 3 and shared:
+            overlap = len(words & entry['words']) / max(len(words), 1)
+            if overlap >= (0.60 if cross_pipeline else 0.70):
+                return dict(found, reason="cross_pipeline_title_match" if cross_pipeline else "title_and_numbers_match",
+                            similarity=round(overlap * 100), matching_numbers=list(shared)[:3],
+                            existing_pipeline=entry['pipeline'])
+
+        # 5. Nearly the same text
+        estimate = similarity(signature, entry['signature'])
+        if estimate >= NEAR_DUPLICATE_SIMILARITY:
+            return dict(found, reason="near_duplicate", similarity=round(estimate * 100),
+                        existing_pipeline=entry['pipeline'])
+        return None
+
+    def _add(self, key, version, doc):
+        features = (doc.get('derived') or {}).get('duplicate')
+        if not features or features.get('version') != FEATURES_VERSION:
+            features = duplicate_features(doc)
+        numbers = frozenset(features['numbers'])
+        entry = {
+            'version': version,
+            'id': doc.get('id', ''),
+            '_id': str(doc.get('_id', '')),
+            'title': doc.get('title', ''),
+            'slug': doc.get('slug', ''),
+            'url': normalize_url(doc.get('source_url', '')),
+            'created_at': doc.get('created_at'),
+            'pipeline': doc.get('pipeline', doc.get('category', '')),
+            'numbers': numbers,
+            'meaningful': frozenset(meaningful_numbers(numbers)),
+            'words': frozenset(title_words(doc.get('title', ''))),
+            'signature': tuple(features['signature']),
+        }
+        self._entries[key] = entry
+        for table, values in self._postings(entry):
+            for value in values:
+                table[value].add(key)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        for table, values in self._postings(entry):
+            for value in values:
+                keys = table.get(value)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del table[value]
+
+    def _postings(self, entry):
+        return (
+            (self._by_slug, [entry['slug']] if entry['slug'] else []),
+            (self._by_url, [entry['url']] if entry['url'] else []),
+            (self._by_number, entry['meaningful']),
+            (self._buckets, self._bands(entry['signature'])),
+        )
+
+    @staticmethod
+    def _bands(signature):
+        if not signature:
+            return []
+        return [(band, tuple(signature[band * ROWS:(band + 1) * ROWS])) for band in range(BANDS)]
+
+
+if __name__ == '__main__':
+    # Benchmark: python duplicate_index.py
+    import random
+    import time
+
+    random.seed(25)
+    vocabulary = ['draw', 'invitations', 'express', 'entry', 'ontario', 'nominee', 'program', 'candidates',
+                  'score', 'permit', 'study', 'work', 'family', 'sponsorship', 'processing', 'times', 'update',
+                  'province', 'skilled', 'trades', 'francophone', 'healthcare', 'occupation', 'targeted']
+
+    def make_article(i):
+        words = random.choices(vocabulary, k=400)
+        numbers = f"{random.randint(400, 560)} CRS {random.randint(1, 9)},{random.randint(100, 999)} ITAs #{i}"
+        return {'id': f'news_{i}', 'slug': f'article-{i}', 'title': ' '.join(random.sample(vocabulary, 6)),
+                'source_url': f'https://example.ca/news/{i}', 'category': random.choice(['news', 'media']),
+                'created_at': f'2026-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}',
+                'full_article': '<p>' + ' '.join(words[:200]) + f' {numbers} ' + ' '.join(words[200:]) + '</p>'}
+
+    articles = [make_article(i) for i in range(500)]
+    candidates = [make_article(1000 + i) for i in range(50)]
+    candidates += [dict(random.choice(articles), slug='', source_url='') for _ in range(10)]
+
+    def linear_scan(candidate):
+        """Previous approach: extract every stored article's numbers and title words per check"""
+        new_numbers = extract_numbers(candidate['title'] + ' ' + candidate['full_article'])
+        for article in articles:
+            existing = extract_numbers(article['title'] + ' ' + article.get('summary', '') + ' ' + article['full_article'])
+            shared = meaningful_numbers(new_numbers & existing)
+            if len(shared) >= 3 or (shared and len(title_words(candidate['title']) & title_words(article['title'])) >= 3):
+                return article
+        return None
+
+    start = time.perf_counter()
+    for article in articles:
+        article['derived'] = {'duplicate': duplicate_features(article)}
+    features = (time.perf_counter() - start) / len(articles)
+
+    index = DuplicateIndex()
+    start = time.perf_counter()
+    index.sync({article['slug']: (article['created_at'], article) for article in articles})
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    found = [index.check(c['title'], c['slug'], c['source_url'], full_article=c['full_article'],
+                         pipeline=c['category']) for c in candidates]
+    indexed = (time.perf_counter() - start) / len(candidates)
+
+    start = time.perf_counter()
+    for c in candidates[:10]:
+        linear_scan(c)
+    scan = (time.perf_counter() - start) / 10
+
+    print(f"{len(articles)} articles: features {features * 1000:.2f} ms/article at write time, "
+          f"index build {build * 1000:.1f} ms")
+    print(f"check: index {indexed * 1000:.2f} ms | linear scan {scan * 1000:.1f} ms | "
+          f"{sum(f is not None for f in found[50:])}/10 copies found, "
+          f"{sum(f is not None for f in found[:50])}/50 new articles flagged")
@@ -0,0 +1,86 @@
+"""
+Idempotency
+Responses of recent write requests, keyed by the client's Idempotency-Key header
+(or a hash of the request's identifying fields), so a retried request gets the
+original response back instead of writing again. Entries live in a
+ResultsJournal (data/idempotency.json + journal) shared by all workers, expire
+after a TTL and are capped in number, oldest dropped first. Each entry records
+the slugs its request created, so deleting those articles forgets it.
+"""
+
+import time
+import hashlib
+
+from results_journal import ResultsJournal
+
+TTL = 24 * 3600  # Seconds a stored response is replayed for
+CONTENT_KEY_TTL = 10 * 60  # Keys derived from request content only cover retries, not later re-ingests
+MAX_ENTRIES = 5000
+LEASE = 150  # Seconds an unfinished request holds its key (longer than the worker timeout)
+TRIM_BATCH = 32  # Expired entries dropped per new key at most
+
+
+def content_key(*values):
+    """Key derived from identifying request fields (e.g. title and source URL)"""
+    text = '\x1f'.join(' '.join(str(v or '').lower().split()) for v in values)
+    return 'sha256:' + hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class IdempotencyStore:
+    """
+    begin(key) claims a key for one request: it returns None to go ahead, or the
+    stored entry ({'status': 'done', 'response', 'status_code'} for a finished
+    request, {'status': 'in_progress'} while another worker is still on it).
+    The request then calls finish() with its response, or release() when it failed
+    and a retry should run it again.
+    """
+
+    def __init__(self, path, ttl=TTL, max_entries=MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._journal = ResultsJournal(path)
+
+    def begin(self, key):
+        now = time.time()
+        claimed = self._journal.put_new({'id': key, 'status': 'in_progress', 'expires_at': now + LEASE},
+                                        key=key, front=False,
+                                        replace=lambda entry: entry.get('expires_at', 0) <= now)
+        if claimed is None:
+            entry = self._journal.get(key)
+            if entry is not None and entry.get('expires_at', 0) > now:
+                return entry
+            return self.begin(key)  # Expired or released in between
+        self._trim(now)
+        return None
+
+    def finish(self, key, response, status_code, ttl=None, slugs=()):
+        """Store the response a retry with this key will get (slugs: articles the request created)"""
+        self._journal.update(key, {'status': 'done', 'response': response, 'status_code': status_code,
+                                   'expires_at': time.time() + (ttl or self.ttl), 'slug': list(slugs)})
+
+    def release(self, key):
+        """Forget a claimed key without storing a response"""
+        self._journal.delete([key])
+
+    def release_slugs(self, slugs):
+        """Forget the responses of requests that created these articles (they were deleted)"""
+        keys = self._journal.keys_in('slug', slugs)
+        if keys:
+            self._journal.delete(keys)
+
+    def clear(self):
+        self._journal.clear()
+
+    def _trim(self, now):
+        """
+        Drop the oldest entries while they are expired or beyond max_entries. Entries are
+        kept oldest first, so this only looks at the front of the table.
+        """
+        excess = len(self._journal) - self.max_entries
+        stale = []
+        for i, entry in enumerate(self._journal.head(max(excess, 0) + TRIM_BATCH)):
+            if i >= excess and entry.get('expires_at', 0) > now:
+                break
+            stale.append(entry['id'])
+        if stale:
+            self._journal.delete(stale)
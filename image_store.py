@@ -0,0 +1,107 @@
+"""
+Image Store
+Content-addressed files for article images that arrive as base64 data: URIs.
+The file name is the SHA-256 of the image bytes, so a stored file never changes
+and can be cached forever; storing the same image twice is a no-op.
+With MongoDB available every image is also kept in GridFS, because the local
+directory does not survive a redeploy; a missing local file is restored from there.
+"""
+
+import os
+import re
+import base64
+import binascii
+import hashlib
+
+# Raster types only - SVG could carry script when served from our own origin
+IMAGE_EXTENSIONS = {
+    'image/png': 'png',
+    'image/jpeg': 'jpg',
+    'image/jpg': 'jpg',
+    'image/webp': 'webp',
+    'image/gif': 'gif',
+}
+
+DATA_URI_PATTERN = re.compile(r'^data:(image/[a-z+.-]+);base64,', re.IGNORECASE)
+STORED_NAME_PATTERN = re.compile(r'^[0-9a-f]{64}\.(png|jpg|webp|gif)$')
+
+
+def is_data_uri(value):
+    """True for data:image/...;base64 strings"""
+    return isinstance(value, str) and value.startswith('data:image')
+
+
+class ImageStore:
+    """Writes decoded data: URIs into a directory (and GridFS) under their content hash"""
+
+    def __init__(self, directory, get_fs=None):
+        self.directory = directory
+        self._get_fs = get_fs or (lambda: None)
+
+    def store_data_uri(self, data_uri):
+        """
+        Decode a base64 data: URI and store it. Returns the stored file name, or None
+        if the URI is not a supported base64 image or could not be stored durably.
+        """
+        match = DATA_URI_PATTERN.match(data_uri or '')
+        if not match:
+            return None
+        ext = IMAGE_EXTENSIONS.get(match.group(1).lower())
+        if not ext:
+            return None
+
+        try:
+            image_bytes = base64.b64decode(data_uri[match.end():], validate=False)
+        except (binascii.Error, ValueError):
+            return None
+        if not image_bytes:
+            return None
+
+        filename = f"{hashlib.sha256(image_bytes).hexdigest()}.{ext}"
+        fs = self._get_fs()
+        if fs is not None:
+            try:
+                if not fs.exists(filename=filename):
+                    fs.put(image_bytes, filename=filename, contentType=match.group(1).lower())
+            except Exception as e:
+                print(f"Could not store image in GridFS: {e}")
+                return None
+        try:
+            self._write(filename, image_bytes)
+        except OSError:
+            if fs is None:
+                raise
+            # GridFS has it; the local copy is restored on first request
+        return filename
+
+    def ensure_local(self, filename):
+        """Restore a stored image from GridFS if the local copy is missing; True if it exists locally"""
+        if not self.is_stored_name(filename):
+            return False
+        if os.path.exists(os.path.join(self.directory, filename)):
+            return True
+        fs = self._get_fs()
+        if fs is None:
+            return False
+        try:
+            if not fs.exists(filename=filename):
+                return False
+            self._write(filename, fs.get_last_version(filename).read())
+        except Exception as e:
+            print(f"Could not restore image {filename} from GridFS: {e}")
+            return False
+        return True
+
+    def _write(self, filename, image_bytes):
+        path = os.path.join(self.directory, filename)
+        if not os.path.exists(path):
+            # Temp file + rename so concurrent workers never serve a partial image
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(image_bytes)
+            os.replace(tmp_path, path)
+
+    @staticmethod
+    def is_stored_name(filename):
+        """True if filename was produced by this store (and is therefore immutable)"""
+        return bool(STORED_NAME_PATTERN.match(filename or ''))
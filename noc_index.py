@@ -0,0 +1,204 @@
+"""
+NOC Index
+Lookup tables over the NOC 2021 occupation list (data/noc.json): code -> record,
+TEER and category -> codes, a sorted token list for word-prefix search and a
+deletion index for typo-tolerant search. Built once per file change; query
+results are cached.
+"""
+
+import bisect
+from collections import defaultdict
+from itertools import combinations
+
+from article_index import LRUCache
+from text_tokens import words as tokenize
+
+MAX_EDITS = 2
+
+
+def typo_limit(word):
+    """Edits allowed for a query word: 1 up to 5 letters, 2 for longer words"""
+    return 1 if len(word) <= 5 else MAX_EDITS
+
+
+def deletes(word, edits):
+    """word with up to `edits` letters removed (including word itself)"""
+    variants = {word}
+    for n in range(1, min(edits, len(word) - 1) + 1):
+        for positions in combinations(range(len(word)), n):
+            variants.add(''.join(c for i, c in enumerate(word) if i not in positions))
+    return variants
+
+
+def edit_distance(a, b, limit):
+    """Levenshtein distance between a and b, or limit + 1 once it is known to exceed limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class NocIndex:
+    """
+    Exact, prefix and fuzzy lookup over NOC unit groups.
+    search() tries an exact code, then code or word prefixes, then (only when
+    nothing matched) words within a small edit distance of the query words.
+    Two words within k edits share a variant with at most k letters deleted, so
+    fuzzy candidates come from the deletion index and only they are verified.
+    """
+
+    def __init__(self, records):
+        self.records = sorted(records, key=lambda r: r['code'])
+        self.by_code = {}
+        self.by_teer = defaultdict(list)
+        self.by_category = defaultdict(list)
+        token_codes = defaultdict(set)
+
+        for record in self.records:
+            code = record['code']
+            self.by_code[code] = record
+            self.by_teer[record.get('teer')].append(code)
+            self.by_category[record.get('category', '')].append(code)
+            text = ' '.join([record.get('title', ''), record.get('category', '')] + record.get('keywords', []))
+            for token in tokenize(text):
+                token_codes[token].add(code)
+
+        self._codes = [record['code'] for record in self.records]
+        self._tokens = sorted(token_codes)
+        self._token_codes = dict(token_codes)
+        self._deletes = defaultdict(set)  # token with letters deleted -> tokens
+        for token in self._tokens:
+            if not token.isdigit():
+                for variant in deletes(token, MAX_EDITS):
+                    self._deletes[variant].add(token)
+        self._cache = LRUCache(1024)
+
+    def __len__(self):
+        return len(self.records)
+
+    def get(self, code):
+        """Record for an exact NOC code"""
+        return self.by_code.get((code or '').strip())
+
+    def search(self, query, teer=None, category=None, limit=50):
+        """
+        Matching records (best first) as {'mode': 'exact'|'prefix'|'fuzzy', 'total', 'results'}.
+        teer / category narrow the results.
+        """
+        key = ((query or '').strip().lower(), teer, category, limit)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        mode, codes = self._match(key[0])
+        if teer is not None:
+            codes = [code for code in codes if self.by_code[code].get('teer') == teer]
+        if category:
+            codes = [code for code in codes if self.by_code[code].get('category') == category]
+
+        result = {'mode': mode, 'total': len(codes), 'results': [self.by_code[code] for code in codes[:limit]]}
+        self._cache.put(key, result)
+        return result
+
+    def _match(self, query):
+        if not query:
+            return 'prefix', []
+
+        if query.isdigit():
+            if query in self.by_code:
+                return 'exact', [query]
+            start = bisect.bisect_left(self._codes, query)
+            end = bisect.bisect_left(self._codes, query + ':', start)  # ':' sorts right after '9'
+            return 'prefix', self._codes[start:end]
+
+        words = tokenize(query)
+        if not words:
+            return 'prefix', []
+
+        # Every query word must start one of the occupation's words
+        codes = set.intersection(*(self._prefix_codes(word) for word in words))
+        if codes:
+            return 'prefix', self._rank(codes, query)
+
+        # Nothing matched: also accept words within a few typos of each query word
+        codes = set.intersection(*(self._prefix_codes(word) | self._fuzzy_codes(word) for word in words))
+        return 'fuzzy', self._rank(codes, query)
+
+    def _prefix_codes(self, word):
+        codes = set()
+        for token in self._tokens[bisect.bisect_left(self._tokens, word):]:
+            if not token.startswith(word):
+                break
+            codes |= self._token_codes[token]
+        return codes
+
+    def _fuzzy_codes(self, word):
+        limit = typo_limit(word)
+        candidates = set()
+        for variant in deletes(word, limit):
+            candidates |= self._deletes.get(variant, set())
+        codes = set()
+        for token in candidates:
+            if edit_distance(word, token, limit) <= limit:
+                codes |= self._token_codes[token]
+        return codes
+
+    def _rank(self, codes, query):
+        """Titles starting with the query first, then titles containing it, then by code"""
+        def rank(code):
+            title = self.by_code[code].get('title', '').lower()
+            return (not title.startswith(query), query not in title, code)
+        return sorted(codes, key=rank)
+
+
+if __name__ == '__main__':
+    # Benchmark: python noc_index.py
+    import json
+    import os
+    import random
+    import time
+
+    with open(os.path.join(os.path.dirname(__file__), 'data', 'noc.json')) as f:
+        records = json.load(f)
+
+    start = time.perf_counter()
+    index = NocIndex(records)
+    build = time.perf_counter() - start
+
+    random.seed(16)
+    titles = [r['title'].lower() for r in records]
+    samples = {
+        'exact': [r['code'] for r in random.sample(records, 100)],
+        'prefix': [random.choice(tokenize(t))[:4] for t in random.sample(titles, 100)],
+        'fuzzy': [],
+    }
+    for title in random.sample(titles, 100):
+        word = max(tokenize(title), key=len)
+        i = random.randrange(len(word))
+        samples['fuzzy'].append(word[:i] + word[i + 1:])  # One deleted letter
+
+    def linear_scan(term):
+        """Previous browser-side approach: substring test over every record"""
+        return [r for r in records if term in r['code'] or term in r['title'].lower() or
+                term in r['category'].lower() or any(term in k for k in r['keywords'])]
+
+    print(f"{len(index)} occupations, build {build * 1000:.1f} ms")
+    for mode, queries in samples.items():
+        start = time.perf_counter()
+        for query in queries:
+            index._match(query)
+        indexed = (time.perf_counter() - start) / len(queries)
+        start = time.perf_counter()
+        for query in queries:
+            linear_scan(query)
+        scan = (time.perf_counter() - start) / len(queries)
+        found = sum(bool(index.search(query)['total']) for query in queries)
+        print(f"{mode:>7}: index {indexed * 1000:6.3f} ms | linear scan {scan * 1000:6.3f} ms | "
+              f"found {found}/{len(queries)} (scan {sum(bool(linear_scan(q)) for q in queries)})")
@@ -0,0 +1,170 @@
+"""
+Outbox
+Outbound side effects (Post API calls) recorded locally and delivered in the
+background, so a request never waits on a remote service. Messages live in a
+ResultsJournal (data/outbox.json + journal), so they survive restarts. One
+worker at a time (holding the dispatcher lock) delivers them over a pooled HTTP
+session, strictly in order, retrying failures with exponential backoff; messages
+that keep failing move to a dead-letter list for an admin to inspect or retry.
+"""
+
+import os
+import time
+import uuid
+import fcntl
+import random
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from results_journal import ResultsJournal
+
+BATCH_SIZE = 20  # Messages delivered per wake-up (outcomes recorded with one fsync)
+MAX_ATTEMPTS = 8
+BASE_DELAY = 2.0  # Seconds before the first retry; doubles per attempt
+MAX_DELAY = 600.0
+POLL_INTERVAL = 5.0  # Also picks up messages queued by other workers
+REQUEST_TIMEOUT = 10
+
+
+def backoff_delay(attempts):
+    """Seconds to wait after `attempts` failed deliveries (exponential, capped, with jitter)"""
+    delay = min(BASE_DELAY * 2 ** (attempts - 1), MAX_DELAY)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def is_retryable(status_code):
+    """Server errors, throttling and timeouts may succeed later; other 4xx will not"""
+    return status_code >= 500 or status_code in (408, 429)
+
+
+class Outbox:
+    """
+    Durable queue of HTTP POSTs, delivered at least once and strictly in order of queueing:
+    a message waiting to be retried holds back the ones queued after it, until it is
+    delivered or moves to the dead letters (so a clear never overtakes an earlier log).
+    Each message is {'id', 'url', 'payload', 'status': 'pending'|'dead', 'attempts',
+    'next_attempt', 'queued_at', 'last_error'}.
+    """
+
+    def __init__(self, path, base_url):
+        self.base_url = base_url.rstrip('/')
+        self.lock_path = path + '.dispatch.lock'
+        self._journal = ResultsJournal(path)
+        self._wake = threading.Event()
+        self._pid = None
+        self._start_lock = threading.Lock()
+        self._session = None
+
+    def enqueue(self, path, payload=None):
+        """Record a POST to base_url + path; returns the message id"""
+        return self.enqueue_many(path, [payload])[0]
+
+    def enqueue_many(self, path, payloads):
+        """Record one POST per payload with a single journal write; returns the message ids"""
+        queued_at = time.time()
+        keys = self._journal.put_many([{
+            'id': uuid.uuid4().hex,
+            'url': self.base_url + path,
+            'payload': payload,
+            'status': 'pending',
+            'attempts': 0,
+            'next_attempt': 0,
+            'queued_at': queued_at,
+            'last_error': None,
+        } for payload in payloads], front=False)
+        self.start()
+        self._wake.set()
+        return keys
+
+    def messages(self, status):
+        """Messages with a status ('pending' or 'dead'), oldest first"""
+        return [m for m in self._journal.load() if m.get('status') == status]
+
+    def retry_dead(self):
+        """Move every dead letter back to the queue; returns how many"""
+        dead = self.messages('dead')
+        self._journal.write([{'op': 'update', 'key': m['id'],
+                              'set': {'status': 'pending', 'attempts': 0, 'next_attempt': 0}} for m in dead])
+        if dead:
+            self.start()
+            self._wake.set()
+        return len(dead)
+
+    def clear(self):
+        """Drop every pending and dead message (before queueing a remote clear that makes them moot)"""
+        self._journal.clear()
+
+    def start(self):
+        """Start the dispatcher thread in this process (again after a fork)"""
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._session = None
+            threading.Thread(target=self._run, name='outbox-dispatcher', daemon=True).start()
+
+    def dispatch(self):
+        """Deliver due messages if no other worker is; returns how many were delivered"""
+        with open(self.lock_path, 'a') as lock_file:
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return 0
+            try:
+                return self._deliver_due()
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _run(self):
+        while True:
+            self._wake.wait(POLL_INTERVAL)
+            self._wake.clear()
+            try:
+                while self.dispatch() >= BATCH_SIZE:
+                    pass  # A full batch went out; more may be waiting
+            except Exception as e:
+                print(f"Outbox dispatch failed: {e}")
+
+    def _deliver_due(self):
+        now = time.time()
+        ops = []
+        delivered = 0
+        for message in self.messages('pending')[:BATCH_SIZE]:
+            if message.get('next_attempt', 0) > now:
+                break  # The oldest message is backing off; later ones wait behind it
+            error, retryable = self._post(message)
+            if error is None:
+                ops.append({'op': 'delete', 'keys': [message['id']]})
+                delivered += 1
+                continue
+
+            attempts = message.get('attempts', 0) + 1
+            changes = {'attempts': attempts, 'last_error': error}
+            if retryable and attempts < MAX_ATTEMPTS:
+                changes['next_attempt'] = time.time() + backoff_delay(attempts)
+                ops.append({'op': 'update', 'key': message['id'], 'set': changes})
+                break
+            changes['status'] = 'dead'
+            print(f"Outbox: giving up on {message['url']} after {attempts} attempt(s): {error}")
+            ops.append({'op': 'update', 'key': message['id'], 'set': changes})
+
+        if ops:
+            self._journal.write(ops)
+        return delivered
+
+    def _post(self, message):
+        """(error or None, retryable)"""
+        if self._session is None:
+            session = requests.Session()
+            session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=2))
+            session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=2))
+            self._session = session
+        try:
+            response = self._session.post(message['url'], json=message.get('payload'), timeout=REQUEST_TIMEOUT)
+        except requests.RequestException as e:
+            return str(e), True
+        if response.status_code >= 400:
+            return f"HTTP {response.status_code}", is_retryable(response.status_code)
+        return None, False
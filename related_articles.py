@@ -0,0 +1,228 @@
+"""
+Related Articles
+TF-IDF similarity between articles with a precomputed top-k neighbour list per article.
+Term counts are extracted once when an article is written (see extract_terms); the index
+is kept in sync with the article cache and only re-scores what changed.
+"""
+
+import math
+import heapq
+import threading
+from collections import Counter, defaultdict
+
+from text_tokens import STOPWORDS as ENGLISH_STOPWORDS, words
+
+# Words too common across immigration news to relate two articles
+STOPWORDS = ENGLISH_STOPWORDS | {
+    'also', 'canada', 'canadian', 'immigration', 'ircc', 'may', 'must', 'new', 'one', 'per',
+    'said', 'says', 'three', 'two',
+}
+
+
+def extract_terms(text, limit=60):
+    """Most frequent content words of a text (HTML allowed) as {term: count}"""
+    counts = Counter(t for t in words(text) if len(t) > 2 and t not in STOPWORDS and not t.isdigit())
+    return dict(counts.most_common(limit))
+
+
+class RelatedArticles:
+    """
+    Incremental nearest-neighbour index over sparse TF-IDF vectors.
+    Adding an article scores it against the articles sharing its strongest terms
+    (via posting lists) and offers it to their neighbour lists, so one new article
+    costs one sparse query instead of a rebuild.
+    """
+
+    def __init__(self, k=10, query_terms=20, max_df=0.1, group_bonus=0.05):
+        self.k = k
+        self.query_terms = query_terms  # Strongest terms of an article used to find candidates
+        self.max_df = max_df  # Terms in more than this share of articles are too common to rank by
+        self.group_bonus = group_bonus  # Small tie-break towards the same category
+        self._terms = {}
+        self._groups = {}
+        self._vectors = {}
+        self._df = Counter()
+        self._postings = defaultdict(dict)  # term -> {key: weight}
+        self._neighbours = {}  # key -> [(score, key), ...] best first
+        self._listed_by = defaultdict(set)  # key -> keys whose neighbour list contains it
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._terms)
+
+    def neighbours(self, key, limit=3):
+        """Precomputed most similar article keys, best first"""
+        return [other for _, other in self._neighbours.get(key, [])[:limit]]
+
+    def sync(self, items):
+        """
+        Bring the index in line with {key: (terms, group)}. New and edited articles are
+        added, missing ones removed; a mostly new set is rebuilt from scratch instead.
+        """
+        with self._lock:
+            current = self._terms.keys()
+            removed = current - items.keys()
+            added = items.keys() - current
+            changed = {key for key in current & items.keys()
+                       if items[key][0] != self._terms[key] or items[key][1] != self._groups[key]}
+
+            if len(added) + len(removed) + len(changed) > len(current) // 2:
+                self._rebuild(items)
+                return
+
+            for key in removed | changed:
+                self._remove(key)
+            for key in added | changed:
+                self._add(key, *items[key])
+
+    def _rebuild(self, items):
+        self._terms = {key: dict(terms) for key, (terms, _) in items.items()}
+        self._groups = {key: group for key, (_, group) in items.items()}
+        self._df = Counter()
+        for terms in self._terms.values():
+            self._df.update(terms.keys())
+
+        self._vectors = {}
+        self._postings = defaultdict(dict)
+        for key, terms in self._terms.items():
+            self._index_vector(key, terms)
+
+        self._neighbours = {}
+        self._listed_by = defaultdict(set)
+        for key in self._terms:
+            self._set_neighbours(key, self._query(key))
+
+    def _add(self, key, terms, group):
+        self._terms[key] = dict(terms)
+        self._groups[key] = group
+        self._df.update(terms.keys())
+        self._index_vector(key, terms)
+
+        scored = self._query(key)
+        self._set_neighbours(key, scored)
+        for score, other in scored:
+            self._offer(other, score, key)
+
+    def _remove(self, key):
+        terms = self._terms.pop(key)
+        self._groups.pop(key)
+        self._df.subtract(terms.keys())
+        for term in self._vectors.pop(key):
+            postings = self._postings[term]
+            postings.pop(key, None)
+            if not postings:
+                del self._postings[term]
+                del self._df[term]
+
+        self._set_neighbours(key, [])
+        self._neighbours.pop(key, None)
+        # Articles that listed the removed one need a fresh list
+        for other in self._listed_by.pop(key, set()):
+            if other in self._terms:
+                self._set_neighbours(other, self._query(other))
+
+    def _index_vector(self, key, terms):
+        """Unit-length TF-IDF vector (IDF as of now) added to the posting lists"""
+        n = len(self._terms)
+        vector = {}
+        for term, count in terms.items():
+            vector[term] = (1 + math.log(count)) * (math.log((n + 1) / (self._df[term] + 1)) + 1)
+        norm = math.sqrt(sum(w * w for w in vector.values())) or 1.0
+        for term in vector:
+            vector[term] /= norm
+            self._postings[term][key] = vector[term]
+        self._vectors[key] = vector
+
+    def _query(self, key):
+        """Top-k (score, key) for an indexed article by sparse dot product over shared terms"""
+        vector = self._vectors[key]
+        group = self._groups[key]
+        max_postings = max(50, self.max_df * len(self._terms))
+        scores = defaultdict(float)
+        for term, weight in heapq.nlargest(self.query_terms, vector.items(), key=lambda item: item[1]):
+            postings = self._postings[term]
+            if len(postings) > max_postings:
+                continue
+            for other, other_weight in postings.items():
+                scores[other] += weight * other_weight
+        scores.pop(key, None)
+
+        if self.group_bonus:
+            for other in scores:
+                if self._groups[other] == group:
+                    scores[other] += self.group_bonus
+        return heapq.nlargest(self.k, ((score, other) for other, score in scores.items()))
+
+    def _set_neighbours(self, key, scored):
+        for _, other in self._neighbours.get(key, []):
+            self._listed_by[other].discard(key)
+        # Lists are replaced, never mutated, so readers need no lock
+        self._neighbours[key] = scored
+        for _, other in scored:
+            self._listed_by[other].add(key)
+
+    def _offer(self, key, score, other):
+        """Insert other into key's neighbour list if it ranks in the top k"""
+        current = self._neighbours.get(key, [])
+        if len(current) >= self.k and score <= current[-1][0]:
+            return
+        updated = sorted(current + [(score, other)], reverse=True)
+        for _, dropped in updated[self.k:]:
+            self._listed_by[dropped].discard(key)
+        self._neighbours[key] = updated[:self.k]
+        self._listed_by[other].add(key)
+
+
+if __name__ == '__main__':
+    # Benchmark: python related_articles.py
+    import random
+    import time
+
+    random.seed(7)
+    # Synthetic articles: Zipf-distributed general vocabulary plus words of one of 40 topics
+    vocabulary = [f'word{i}' for i in range(5000)]
+    zipf_weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    categories = ['express_entry', 'pnp', 'study_permit', 'work_permit', 'policy']
+    topics = [(random.choice(categories), [f'topic{t}term{i}' for i in range(15)]) for t in range(40)]
+
+    def corpus(size):
+        items = {}
+        for i in range(size):
+            category, topic_words = random.choice(topics)
+            words = random.choices(vocabulary, zipf_weights, k=400) + random.choices(topic_words, k=40)
+            items[f'article-{i}'] = (extract_terms(' '.join(words)), category)
+        return items
+
+    for size in (500, 10000):
+        items = corpus(size)
+        index = RelatedArticles()
+
+        start = time.perf_counter()
+        index.sync(items)
+        build = time.perf_counter() - start
+
+        extra = corpus(5)
+        new_items = dict(items)
+        for i in range(5):
+            new_items[f'article-{size + i}'] = extra[f'article-{i}']
+        start = time.perf_counter()
+        index.sync(new_items)
+        incremental = (time.perf_counter() - start) / 5
+
+        keys = list(items)
+        start = time.perf_counter()
+        for key in keys:
+            index.neighbours(key)
+        lookup = (time.perf_counter() - start) / len(keys)
+
+        # Quality: share of neighbours written about the same topic
+        topic_of = {key: next(t for t in terms if t.startswith('topic')).split('term')[0]
+                    for key, (terms, _) in items.items()}
+        same_topic = sum(
+            topic_of.get(other) == topic_of[key]
+            for key in keys for other in index.neighbours(key)
+        ) / (3 * len(keys))
+
+        print(f"{size:>6} articles: build {build * 1000:8.1f} ms | "
+              f"add one {incremental * 1000:6.2f} ms | lookup {lookup * 1e6:5.2f} us | "
+              f"same-topic neighbours {same_topic:.0%}")
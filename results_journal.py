@@ -0,0 +1,400 @@
+"""
+Results Journal
+Local store behind data/results.json. Writes append one JSON line per operation
+to results.json.journal (fsynced once per call) instead of rewriting the whole
+file; every few hundred operations the journal is compacted into results.json
+with a temp file and an atomic rename. Reading replays the snapshot plus the
+journal, and afterwards only the lines other workers appended since. Compaction
+keeps at most max_docs documents (the first ones, i.e. the newest for front puts).
+"""
+
+import os
+import json
+import copy
+import fcntl
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+COMPACT_EVERY = 256
+INDEXED_FIELDS = ('id', 'slug', '_id', 'status')
+
+
+def document_key(doc):
+    """Stable key of a result document: its content id, else its slug, else its MongoDB id"""
+    return str(doc.get('id') or doc.get('slug') or doc.get('_id') or '')
+
+
+class ResultsJournal:
+    """
+    Ordered result documents (newest first) stored as snapshot + append-only journal.
+    Journal operations are idempotent, so replaying a journal on top of a snapshot
+    that already contains some of its operations (a crash mid-compaction) is safe:
+      {"op": "put", "key": k, "doc": {...}, "front": true}  insert, or replace in place
+      {"op": "update", "key": k, "set": {...}}              set fields of one document
+      {"op": "delete", "keys": [k, ...]}
+      {"op": "clear"}
+    """
+
+    def __init__(self, path, compact_every=COMPACT_EVERY, max_docs=None):
+        self.path = path
+        self.journal_path = path + '.journal'
+        self.lock_path = path + '.lock'
+        self.compact_every = compact_every
+        self.max_docs = max_docs
+        self._docs = OrderedDict()  # key -> document
+        self._by_field = {field: {} for field in INDEXED_FIELDS}  # field -> {value: {key, ...}}
+        self._snapshot_stamp = None
+        self._journal_stamp = None
+        self._offset = 0  # Bytes of the journal already applied
+        self._journal_ops = 0  # Operations in the journal since the last compaction
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            self._sync()
+            return len(self._docs)
+
+    # ---- Reads ----
+
+    def stamp(self):
+        """Value that changes whenever the stored documents change (a stat of the files)"""
+        with self._lock:
+            self._sync()
+            return (self._snapshot_stamp, self._journal_stamp, self._offset)
+
+    def load(self):
+        """All documents, newest first (copies, safe to modify)"""
+        with self._lock:
+            self._sync()
+            return copy.deepcopy(list(self._docs.values()))
+
+    def get(self, key):
+        """Copy of the document stored under key, or None"""
+        with self._lock:
+            self._sync()
+            doc = self._docs.get(key)
+            return copy.deepcopy(doc) if doc is not None else None
+
+    def keys(self, field, value):
+        """Keys of the documents whose id, slug, _id or status equals (or, for a list, contains) value"""
+        with self._lock:
+            self._sync()
+            return sorted(self._by_field[field].get(str(value), ()))
+
+    def keys_in(self, field, values):
+        """keys() for several values at once"""
+        with self._lock:
+            self._sync()
+            index = self._by_field[field]
+            return sorted({key for value in values for key in index.get(str(value), ())})
+
+    def head(self, count):
+        """Copies of the first count documents (the oldest ones when written with front=False)"""
+        with self._lock:
+            self._sync()
+            return [copy.deepcopy(doc) for _, doc in zip(range(count), self._docs.values())]
+
+    def find(self, field, value):
+        """Copy of a document whose id, slug, _id or status equals value, or None"""
+        keys = self.keys(field, value)
+        return self.get(keys[0]) if keys else None
+
+    # ---- Writes ----
+
+    def put(self, doc, key=None, front=True):
+        """Insert a document (at the front unless front=False), or replace the one stored under key"""
+        key = key or document_key(doc)
+        self.write([{'op': 'put', 'key': key, 'doc': doc, 'front': front}])
+        return key
+
+    def put_many(self, docs, front=True):
+        """put() for several documents with one journal write; returns their keys"""
+        ops = [{'op': 'put', 'key': document_key(doc), 'doc': doc, 'front': front} for doc in docs]
+        if ops:
+            self.write(ops)
+        return [op['key'] for op in ops]
+
+    def put_new(self, doc, key=None, front=True, replace=None):
+        """
+        put() only if nothing is stored under key, or replace(existing document) is true,
+        checked while holding the writer lock. A replaced document moves like a new one.
+        Returns the key, or None if a document was kept.
+        """
+        key = key or document_key(doc)
+        with self._lock, self._file_lock():
+            self._sync()
+            ops = [{'op': 'put', 'key': key, 'doc': doc, 'front': front}]
+            existing = self._docs.get(key)
+            if existing is not None:
+                if replace is None or not replace(existing):
+                    return None
+                ops.insert(0, {'op': 'delete', 'keys': [key]})
+            self._append(ops)
+        return key
+
+    def update(self, key, changes, expect=None):
+        """
+        Set fields of the document stored under key. expect ({field: allowed values})
+        makes it a compare-and-set, checked while holding the writer lock.
+        Returns False if there is no such document or it does not match expect.
+        """
+        with self._lock, self._file_lock():
+            self._sync()
+            doc = self._docs.get(key)
+            if doc is None or any(doc.get(field) not in allowed for field, allowed in (expect or {}).items()):
+                return False
+            self._append([{'op': 'update', 'key': key, 'set': changes}])
+        return True
+
+    def delete(self, keys):
+        """Remove documents by key; returns how many existed"""
+        with self._lock:
+            self._sync()
+            keys = [key for key in dict.fromkeys(keys) if key in self._docs]
+        if keys:
+            self.write([{'op': 'delete', 'keys': keys}])
+        return len(keys)
+
+    def clear(self):
+        self.write([{'op': 'clear'}])
+
+    def write(self, ops):
+        """
+        Append operations as one write and one fsync (a batch costs the same as a
+        single operation), then apply them. Compacts once the journal is long enough.
+        """
+        with self._lock, self._file_lock():
+            self._sync()
+            self._append(ops)
+
+    def compact(self):
+        """Fold the journal into the snapshot now"""
+        with self._lock, self._file_lock():
+            self._sync()
+            self._compact()
+
+    # ---- Internals (callers hold self._lock) ----
+
+    def _append(self, ops):
+        """Append and apply operations (callers also hold the file lock and have synced)"""
+        lines = b''.join(json.dumps(op, default=str).encode('utf-8') + b'\n' for op in ops)
+        with open(self.journal_path, 'ab') as f:
+            # Drop a torn last line left by a crashed writer before appending
+            if f.tell() > self._offset:
+                f.truncate(self._offset)
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        self._sync()
+        if self._journal_ops >= self.compact_every:
+            self._compact()
+
+    def _sync(self):
+        """Catch up with the files: replay only new journal lines, or reload after a compaction"""
+        try:
+            journal_stat = os.stat(self.journal_path)
+        except OSError:
+            journal_stat = None
+        journal_stamp = journal_stat.st_ino if journal_stat else None
+
+        if (self._stamp(self.path) != self._snapshot_stamp or journal_stamp != self._journal_stamp
+                or (journal_stat and journal_stat.st_size < self._offset)):
+            self._reload()
+        elif journal_stat and journal_stat.st_size > self._offset:
+            with open(self.journal_path, 'rb') as f:
+                f.seek(self._offset)
+                self._replay(f.read())
+
+    def _reload(self):
+        for _ in range(3):
+            self._docs = OrderedDict()
+            self._by_field = {field: {} for field in INDEXED_FIELDS}
+            self._offset = 0
+            self._journal_ops = 0
+            self._snapshot_stamp = None
+            self._journal_stamp = None
+
+            try:
+                with open(self.path, 'rb') as f:
+                    self._snapshot_stamp = self._fstamp(f)
+                    for position, doc in enumerate(json.loads(f.read() or b'[]')):
+                        key = document_key(doc) or f'#{position}'
+                        self._apply({'op': 'put', 'key': key, 'doc': doc, 'front': False})
+            except FileNotFoundError:
+                pass
+            except ValueError as e:
+                print(f"Results snapshot unreadable: {e}")
+
+            try:
+                with open(self.journal_path, 'rb') as f:
+                    self._journal_stamp = os.fstat(f.fileno()).st_ino
+                    self._replay(f.read())
+            except FileNotFoundError:
+                pass
+
+            # A compaction between reading the snapshot and the journal pairs an old
+            # snapshot with a new journal; read both again
+            if self._stamp(self.path) == self._snapshot_stamp:
+                return
+
+    def _replay(self, data):
+        """Apply complete journal lines; a partial last line is left for the next read"""
+        end = data.rfind(b'\n') + 1
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                self._apply(json.loads(line))
+            except ValueError as e:
+                print(f"Skipping unreadable results journal line: {e}")
+            self._journal_ops += 1
+        self._offset += end
+
+    def _apply(self, op):
+        kind = op.get('op')
+        if kind == 'put':
+            key = op['key']
+            if key in self._docs:
+                self._unindex(key)
+                self._docs[key] = op['doc']
+            else:
+                self._docs[key] = op['doc']
+                if op.get('front', True):
+                    self._docs.move_to_end(key, last=False)
+            self._index(key)
+        elif kind == 'update':
+            key = op['key']
+            if key in self._docs:
+                self._unindex(key)
+                self._docs[key] = dict(self._docs[key], **op['set'])
+                self._index(key)
+        elif kind == 'delete':
+            for key in op['keys']:
+                if key in self._docs:
+                    self._unindex(key)
+                    del self._docs[key]
+        elif kind == 'clear':
+            self._docs.clear()
+            self._by_field = {field: {} for field in INDEXED_FIELDS}
+
+    def _index(self, key):
+        doc = self._docs[key]
+        for field, values in self._by_field.items():
+            for value in self._field_values(doc, field):
+                values.setdefault(value, set()).add(key)
+
+    def _unindex(self, key):
+        doc = self._docs[key]
+        for field, values in self._by_field.items():
+            for value in self._field_values(doc, field):
+                keys = values.get(value)
+                if keys:
+                    keys.discard(key)
+                    if not keys:
+                        del values[value]
+
+    @staticmethod
+    def _field_values(doc, field):
+        """Indexed values of a field: a list is indexed under each of its items"""
+        value = doc.get(field)
+        if not value:
+            return []
+        return [str(item) for item in value if item] if isinstance(value, list) else [str(value)]
+
+    def _compact(self):
+        """
+        Write the current state as the snapshot, then start an empty journal (both by rename).
+        Documents beyond max_docs are dropped.
+        """
+        docs = list(self._docs.values())
+        if self.max_docs is not None and len(docs) > self.max_docs:
+            print(f"Results journal: dropping {len(docs) - self.max_docs} documents beyond {self.max_docs}")
+            docs = docs[:self.max_docs]
+        self._replace(self.path, json.dumps(docs, indent=2, default=str).encode('utf-8'))
+        self._replace(self.journal_path, b'')
+        self._reload()
+
+    def _replace(self, path, data):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        # Make the rename itself durable
+        dir_fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+    @contextmanager
+    def _file_lock(self):
+        """Cross-process writer lock"""
+        with open(self.lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    @staticmethod
+    def _stamp(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    @staticmethod
+    def _fstamp(f):
+        st = os.fstat(f.fileno())
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+if __name__ == '__main__':
+    # Benchmark: python results_journal.py
+    import tempfile
+    import time
+
+    def make_doc(i):
+        return {'id': f'regular_{i}', 'slug': f'article-{i}', 'title': f'Article {i}', 'status': 'pending',
+                'full_article': '<p>' + 'Immigration news paragraph. ' * 150 + '</p>'}
+
+    for size in (100, 500, 2000):
+        with tempfile.TemporaryDirectory() as tmp:
+            legacy_path = os.path.join(tmp, 'legacy.json')
+            docs = [make_doc(i) for i in range(size)]
+            with open(legacy_path, 'w') as f:
+                json.dump(docs, f, indent=2)
+
+            # Previous approach: load the whole file, insert, rewrite it with indent=2
+            start = time.perf_counter()
+            for i in range(50):
+                with open(legacy_path) as f:
+                    results = json.load(f)
+                results.insert(0, make_doc(size + i))
+                with open(legacy_path, 'w') as f:
+                    json.dump(results, f, indent=2)
+            legacy = (time.perf_counter() - start) / 50
+
+            journal = ResultsJournal(os.path.join(tmp, 'results.json'), compact_every=10 ** 9)
+            journal.write([{'op': 'put', 'key': document_key(d), 'doc': d, 'front': False} for d in docs])
+            journal.compact()
+            start = time.perf_counter()
+            for i in range(50):
+                journal.put(make_doc(size + i))
+            appended = (time.perf_counter() - start) / 50
+
+            start = time.perf_counter()
+            journal.compact()
+            compaction = time.perf_counter() - start
+
+            start = time.perf_counter()
+            ResultsJournal(journal.path).load()
+            replay = time.perf_counter() - start
+
+            print(f"{size:>5} results: rewrite {legacy * 1000:7.2f} ms/write | journal append + fsync "
+                  f"{appended * 1000:5.2f} ms/write | compaction {compaction * 1000:6.1f} ms | "
+                  f"cold replay {replay * 1000:6.1f} ms")
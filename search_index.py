@@ -0,0 +1,190 @@
+"""
+Search Index
+In-process inverted index with BM25 ranking over articles and guides.
+Documents are (re)tokenized only when their version changes, so keeping the
+index in sync with the article cache costs one pass over keys and versions.
+"""
+
+import math
+import heapq
+import threading
+from collections import Counter, defaultdict
+from functools import lru_cache
+
+from text_tokens import STOPWORDS, words
+
+
+@lru_cache(maxsize=65536)
+def stem(word):
+    """Light English suffix stripping (draws/drawing -> draw, invites/invited -> invit)"""
+    if len(word) <= 3 or word.isdigit():
+        return word
+    if word.endswith('ies') and len(word) > 4:
+        word = word[:-3] + 'y'
+    elif word.endswith('ing') and len(word) > 5:
+        word = word[:-3]
+    elif word.endswith('ed') and len(word) > 4:
+        word = word[:-2]
+    elif word.endswith(('sses', 'xes', 'zes', 'ches', 'shes')):
+        word = word[:-2]
+    elif word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        word = word[:-1]
+    # Drop a final e so invite/invited/inviting share a stem
+    if word.endswith('e') and len(word) > 4:
+        word = word[:-1]
+    return word
+
+
+def term_counts(text):
+    """Unstemmed word counts of a text (HTML allowed), stored with a document and stemmed at indexing"""
+    return dict(Counter(t for t in words(text) if t not in STOPWORDS))
+
+
+def tokenize(text):
+    """Stemmed search terms of a text (HTML allowed)"""
+    return [stem(t) for t in words(text) if t not in STOPWORDS]
+
+
+class SearchIndex:
+    """
+    BM25 over weighted fields. Each posting stores its precomputed BM25 term impact,
+    so a query is one multiply-add per posting of each query term.
+    """
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings = defaultdict(dict)  # term -> {key: impact}
+        self._docs = {}  # key -> {'version', 'kind', 'meta', 'terms', 'length'}
+        self._total_length = 0.0
+        self._indexed_average = 0.0  # Average length the stored impacts were computed with
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._docs)
+
+    def sync(self, kind, documents):
+        """
+        Bring all documents of one kind in line with {key: (version, fields, meta)}.
+        fields is a list of (text or {term: count}, weight). Returns how many were re-indexed.
+        """
+        with self._lock:
+            current = {key for key, doc in self._docs.items() if doc['kind'] == kind}
+            for key in current - documents.keys():
+                self._remove(key)
+
+            changed = [key for key, (version, _, _) in documents.items()
+                       if key not in self._docs or self._docs[key]['version'] != version]
+            for key in changed:
+                if key in self._docs:
+                    self._remove(key)
+                version, fields, meta = documents[key]
+                self._add(key, kind, version, fields, meta)
+
+            # Impacts depend on the average length; refresh them when it drifted noticeably
+            if changed and self._docs and self._average_length_drifted():
+                self._reweight()
+            return len(changed)
+
+    def search(self, query, limit=10, offset=0, kind=None):
+        """Ranked matches for a free-text query: {'total': n, 'results': [(score, key, meta)]}"""
+        terms = set(tokenize(query))
+        with self._lock:
+            n = len(self._docs)
+            scores = defaultdict(float)
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                for key, impact in postings.items():
+                    scores[key] += idf * impact
+
+            if kind:
+                scores = {key: score for key, score in scores.items() if self._docs[key]['kind'] == kind}
+            top = heapq.nlargest(offset + limit, scores.items(), key=lambda item: item[1])[offset:]
+            results = [(score, key, self._docs[key]['meta']) for key, score in top]
+
+        return {'total': len(scores), 'results': results}
+
+    def _add(self, key, kind, version, fields, meta):
+        terms = Counter()
+        for value, weight in fields:
+            if isinstance(value, dict):
+                for word, count in value.items():
+                    terms[stem(word)] += count * weight
+            else:
+                for term in tokenize(value):
+                    terms[term] += weight
+
+        length = sum(terms.values())
+        self._docs[key] = {'version': version, 'kind': kind, 'meta': meta, 'terms': terms, 'length': length}
+        self._total_length += length
+        self._post(key)
+
+    def _remove(self, key):
+        doc = self._docs.pop(key)
+        self._total_length -= doc['length']
+        for term in doc['terms']:
+            postings = self._postings[term]
+            postings.pop(key, None)
+            if not postings:
+                del self._postings[term]
+
+    def _post(self, key):
+        doc = self._docs[key]
+        self._indexed_average = self._average_length()
+        norm = self.k1 * (1 - self.b + self.b * doc['length'] / (self._indexed_average or 1))
+        for term, tf in doc['terms'].items():
+            self._postings[term][key] = tf * (self.k1 + 1) / (tf + norm)
+
+    def _average_length(self):
+        return self._total_length / len(self._docs) if self._docs else 0.0
+
+    def _average_length_drifted(self):
+        indexed = self._indexed_average or 1.0
+        return abs(self._average_length() - indexed) / indexed > 0.1
+
+    def _reweight(self):
+        average = self._average_length() or 1.0
+        for key, doc in self._docs.items():
+            norm = self.k1 * (1 - self.b + self.b * doc['length'] / average)
+            for term, tf in doc['terms'].items():
+                self._postings[term][key] = tf * (self.k1 + 1) / (tf + norm)
+        self._indexed_average = average
+
+
+if __name__ == '__main__':
+    # Benchmark: python search_index.py
+    import random
+    import time
+
+    random.seed(11)
+    vocabulary = [f'word{i}' for i in range(20000)]
+    zipf_weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    queries = [' '.join(random.choices(vocabulary[:2000], k=random.randint(1, 3))) for _ in range(200)]
+
+    for size in (500, 30000):
+        documents = {}
+        for i in range(size):
+            title = ' '.join(random.choices(vocabulary, zipf_weights, k=8))
+            body = ' '.join(random.choices(vocabulary, zipf_weights, k=600))
+            documents[f'article:{i}'] = (1, [(title, 3), (body, 1)], {'title': title})
+
+        index = SearchIndex()
+        start = time.perf_counter()
+        index.sync('article', documents)
+        build = time.perf_counter() - start
+
+        documents[f'article:{size}'] = (1, [('new article title', 3), ('fresh body text ' * 50, 1)], {})
+        start = time.perf_counter()
+        index.sync('article', documents)
+        incremental = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for query in queries:
+            index.search(query)
+        latency = (time.perf_counter() - start) / len(queries)
+
+        print(f"{size:>6} documents: build {build * 1000:8.1f} ms | sync one new {incremental * 1000:6.2f} ms | "
+              f"query {latency * 1000:5.2f} ms")
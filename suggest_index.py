@@ -0,0 +1,145 @@
+"""
+Suggest Index
+Typeahead over short labels: article and guide titles, provincial programs and
+NOC occupations. Every word of every label sits in one sorted array, so the
+entries matching a prefix are one bisect range instead of a scan.
+"""
+
+import heapq
+import bisect
+import threading
+from collections import defaultdict
+
+from text_tokens import words
+
+SHORT_PREFIX_LENGTH = 3  # Prefixes up to this long have their top matches precomputed
+MAX_LIMIT = 20
+
+
+class SuggestIndex:
+    """
+    Prefix index over groups of labelled entries. A query matches an entry when
+    every query word is a prefix of one of the entry's words. Results rank by
+    whether the label itself starts with the query, then by the entry's rank
+    (lower first), then by shorter label.
+    Short one-word prefixes match a large share of all entries, so their top
+    MAX_LIMIT results are computed at build time, like a trie node caching its
+    best completions; longer queries score the (small) bisect range. Each group
+    is built separately, so syncing articles leaves the NOC entries alone.
+    """
+
+    def __init__(self):
+        self._entries = {}  # group -> {key: (label, rank, meta, extra_text)}
+        # group -> (sorted words, owning entry ids, entries, {prefix: [(score, entry id)]});
+        # replaced, never mutated, so readers need no lock
+        self._groups = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._entries.values())
+
+    def sync(self, group, entries):
+        """
+        Replace one group's entries with {key: (label, rank, meta, extra_text)}.
+        extra_text is matched like the label but not shown (e.g. NOC keywords).
+        Returns False when nothing changed.
+        """
+        with self._lock:
+            if self._entries.get(group) == entries:
+                return False
+            self._entries[group] = dict(entries)
+            self._groups = dict(self._groups, **{group: self._build(entries)})
+            return True
+
+    def suggest(self, query, limit=8, group=None):
+        """Top matches as [(label, meta)], best first"""
+        query_words = words(query)
+        if not query_words:
+            return []
+        limit = min(limit, MAX_LIMIT)
+        groups = self._groups
+        if group:
+            groups = {group: groups[group]} if group in groups else {}
+
+        scored = []
+        for sorted_words, owners, entries, top in groups.values():
+            if len(query_words) == 1 and len(query_words[0]) <= SHORT_PREFIX_LENGTH:
+                matches = top.get(query_words[0], [])[:limit]
+            else:
+                matches = self._scan(query_words, sorted_words, owners, entries, limit)
+            scored.extend((score, entries[entry_id]) for score, entry_id in matches)
+
+        return [(entry[1], entry[3]) for _, entry in heapq.nsmallest(limit, scored, key=lambda item: item[0])]
+
+    @staticmethod
+    def _scan(query_words, sorted_words, owners, entries, limit):
+        # Candidates come from the longest (most selective) query word's range
+        anchor = max(query_words, key=len)
+        start = bisect.bisect_left(sorted_words, anchor)
+        end = bisect.bisect_left(sorted_words, anchor + '\x7f', start)
+
+        query_text = ' '.join(query_words)
+        scored = []
+        for entry_id in set(owners[start:end]):
+            label_words, label, rank, _, entry_words = entries[entry_id]
+            if len(query_words) > 1 and not all(any(w.startswith(q) for w in entry_words) for q in query_words):
+                continue
+            starts_with = ' '.join(label_words).startswith(query_text)
+            scored.append(((not starts_with, rank, len(label)), entry_id))
+        return heapq.nsmallest(limit, scored)
+
+    @staticmethod
+    def _build(group_entries):
+        pairs = []
+        entries = []
+        for label, rank, meta, extra_text in group_entries.values():
+            label_words = words(label)
+            entry_words = set(label_words) | set(words(extra_text))
+            pairs.extend((word, len(entries)) for word in entry_words)
+            entries.append((label_words, label, rank, meta, entry_words))
+        pairs.sort()
+
+        ranked = defaultdict(list)
+        for entry_id, (label_words, label, rank, _, entry_words) in enumerate(entries):
+            first_word = label_words[0] if label_words else ''
+            for prefix in {word[:n] for word in entry_words for n in range(1, SHORT_PREFIX_LENGTH + 1)}:
+                ranked[prefix].append(((not first_word.startswith(prefix), rank, len(label)), entry_id))
+        top = {prefix: heapq.nsmallest(MAX_LIMIT, scored) for prefix, scored in ranked.items()}
+
+        return [word for word, _ in pairs], [entry_id for _, entry_id in pairs], entries, top
+
+
+if __name__ == '__main__':
+    # Benchmark: python suggest_index.py
+    import json
+    import os
+    import random
+    import time
+
+    random.seed(15)
+    with open(os.path.join(os.path.dirname(__file__), 'data', 'noc.json')) as f:
+        noc = json.load(f)
+    vocabulary = sorted({word for record in noc for word in words(record['title'])})
+
+    for size in (500, 5000):
+        index = SuggestIndex()
+        index.sync('noc', {r['code']: (f"{r['code']} {r['title']}", 1, {}, ' '.join(r['keywords'])) for r in noc})
+        start = time.perf_counter()
+        index.sync('article', {
+            f'article-{i}': (' '.join(random.choices(vocabulary, k=10)), 2 + i / 10000, {}, '')
+            for i in range(size)
+        })
+        build = time.perf_counter() - start
+
+        queries = ([w[:n] for w in random.sample(vocabulary, 200) for n in (1, 2, 3, 5)] +
+                   [r['code'][:3] for r in random.sample(noc, 100)] +
+                   [f"{a[:4]} {b[:2]}" for a, b in zip(random.sample(vocabulary, 100), random.sample(vocabulary, 100))])
+        timings = []
+        for query in queries:
+            start = time.perf_counter()
+            index.suggest(query)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+
+        print(f"{size:>5} articles + {len(noc)} NOC: build articles {build * 1000:6.1f} ms | "
+              f"mean query {sum(timings) / len(timings) * 1000:.3f} ms | p99 {timings[int(len(timings) * 0.99)] * 1000:.3f} ms")
@@ -0,0 +1,278 @@
+"""
+Browse Taxonomy
+The /browse category tree and the classifier that tags an article with the
+browse categories and subcategories it belongs to. Tags are computed once when
+an article is written (stored with its derived fields) so browse pages only
+look them up.
+"""
+
+import re
+
+BROWSE_CATEGORIES = {
+    'news': {
+        'name': 'News & Updates',
+        'icon': 'bi-newspaper',
+        'description': 'Latest immigration news and policy updates',
+        'color': '#EF4444',
+        'subcategories': [
+            {'id': 'breaking', 'name': 'Breaking News', 'icon': 'bi-lightning-charge'},
+            {'id': 'policy', 'name': 'Policy Updates', 'icon': 'bi-file-earmark-text'},
+            {'id': 'program', 'name': 'Program Updates', 'icon': 'bi-megaphone'},
+        ]
+    },
+    'express_entry': {
+        'name': 'Express Entry',
+        'icon': 'bi-lightning',
+        'description': 'Federal skilled worker and CRS updates',
+        'color': '#14B8A6',
+        'subcategories': [
+            {'id': 'draw_results', 'name': 'Draw Results', 'icon': 'bi-trophy'},
+            {'id': 'crs_updates', 'name': 'CRS Updates', 'icon': 'bi-graph-up'},
+            {'id': 'fsw', 'name': 'Federal Skilled Worker', 'icon': 'bi-briefcase'},
+        ]
+    },
+    'pnp': {
+        'name': 'Provincial Programs (PNP)',
+        'icon': 'bi-map',
+        'description': 'Provincial Nominee Programs by province',
+        'color': '#8B5CF6',
+        'subcategories': [
+            {'id': 'ontario', 'name': 'Ontario (OINP)', 'icon': 'bi-geo-alt'},
+            {'id': 'british_columbia', 'name': 'British Columbia', 'icon': 'bi-geo-alt'},
+            {'id': 'alberta', 'name': 'Alberta (AAIP)', 'icon': 'bi-geo-alt'},
+            {'id': 'saskatchewan', 'name': 'Saskatchewan (SINP)', 'icon': 'bi-geo-alt'},
+            {'id': 'manitoba', 'name': 'Manitoba (MPNP)', 'icon': 'bi-geo-alt'},
+            {'id': 'nova_scotia', 'name': 'Nova Scotia', 'icon': 'bi-geo-alt'},
+            {'id': 'new_brunswick', 'name': 'New Brunswick', 'icon': 'bi-geo-alt'},
+            {'id': 'pei', 'name': 'Prince Edward Island', 'icon': 'bi-geo-alt'},
+            {'id': 'newfoundland', 'name': 'Newfoundland', 'icon': 'bi-geo-alt'},
+            {'id': 'territories', 'name': 'Territories (YT/NWT/NU)', 'icon': 'bi-geo-alt'},
+        ]
+    },
+    'educational': {
+        'name': 'Educational',
+        'icon': 'bi-book',
+        'description': 'Guides and tutorials for immigration process',
+        'color': '#3B82F6',
+        'subcategories': [
+            {'id': 'application_process', 'name': 'Application Process', 'icon': 'bi-clipboard-check'},
+            {'id': 'language_tests', 'name': 'Language Tests', 'icon': 'bi-translate'},
+            {'id': 'crs_optimization', 'name': 'CRS Optimization', 'icon': 'bi-sliders'},
+            {'id': 'settlement', 'name': 'Settlement Tips', 'icon': 'bi-house-heart'},
+        ]
+    },
+    'forms': {
+        'name': 'Forms & Guides',
+        'icon': 'bi-file-earmark-ruled',
+        'description': 'Official forms and how to fill them',
+        'color': '#F59E0B',
+        'subcategories': [
+            {'id': 'express_entry_forms', 'name': 'Express Entry Forms', 'icon': 'bi-file-text'},
+            {'id': 'pnp_forms', 'name': 'PNP Forms', 'icon': 'bi-file-text'},
+            {'id': 'study_forms', 'name': 'Study Permit Forms', 'icon': 'bi-file-text'},
+            {'id': 'work_forms', 'name': 'Work Permit Forms', 'icon': 'bi-file-text'},
+        ]
+    },
+    'permits': {
+        'name': 'Permits',
+        'icon': 'bi-card-checklist',
+        'description': 'Study and work permit information',
+        'color': '#22C55E',
+        'subcategories': [
+            {'id': 'study_permit', 'name': 'Study Permits', 'icon': 'bi-mortarboard'},
+            {'id': 'work_permit', 'name': 'Work Permits', 'icon': 'bi-briefcase'},
+            {'id': 'pgwp', 'name': 'PGWP', 'icon': 'bi-award'},
+        ]
+    },
+}
+
+# Province keywords for PNP filtering (first province in this order wins)
+PROVINCE_KEYWORDS = {
+    'ontario': ['ontario', 'oinp', 'toronto', 'ottawa'],
+    'british_columbia': ['british columbia', 'bc', 'bc pnp', 'vancouver', 'victoria'],
+    'alberta': ['alberta', 'ainp', 'aaip', 'calgary', 'edmonton'],
+    'saskatchewan': ['saskatchewan', 'sinp', 'saskatoon', 'regina'],
+    'manitoba': ['manitoba', 'mpnp', 'winnipeg'],
+    'nova_scotia': ['nova scotia', 'nsnp', 'halifax'],
+    'new_brunswick': ['new brunswick', 'nbpnp', 'fredericton', 'moncton'],
+    'pei': ['prince edward island', 'pei', 'pei pnp', 'charlottetown'],
+    'newfoundland': ['newfoundland', 'labrador', 'nlpnp', "st. john's"],
+    'yukon': ['yukon', 'ynp', 'whitehorse'],
+    'nwt': ['northwest territories', 'nwt', 'yellowknife'],
+    'nunavut': ['nunavut', 'iqaluit'],
+}
+
+TERRITORIES = ('yukon', 'nwt', 'nunavut')
+
+# Title keywords per subcategory, for categories whose subcategories are topical
+SUBCATEGORY_KEYWORDS = {
+    'express_entry': {
+        'draw_results': ['draw', 'ita'],
+        'crs_updates': ['crs'],
+    },
+    'educational': {
+        'application_process': ['application', 'process', 'submit', 'apply'],
+        'language_tests': ['ielts', 'celpip', 'tef', 'language', 'english', 'french'],
+        'crs_optimization': ['crs', 'score', 'points', 'boost', 'improve'],
+        'settlement': ['settle', 'housing', 'bank', 'job search'],
+    },
+    'forms': {
+        'express_entry_forms': ['imm 0008', 'ee', 'express entry'],
+        'pnp_forms': ['pnp'],
+        'study_forms': ['study', 'student', 'imm 1294'],
+        'work_forms': ['work', 'lmia', 'imm 1295'],
+    },
+    'permits': {
+        'pgwp': ['pgwp'],
+    },
+}
+
+
+class KeywordMatcher:
+    """
+    Finds every label whose keywords occur in a text with one compiled regex.
+    Keywords must start at a word boundary. Keywords of up to three characters
+    (abbreviations like 'bc', 'ita', 'ee') must be whole words, optionally plural;
+    longer ones also match as word prefixes ('draw' matches 'draws', 'settle'
+    matches 'settlement').
+    """
+
+    def __init__(self, tables):
+        # tables: {label: [keyword, ...]}
+        self._labels = {}
+        for label, keywords in tables.items():
+            for keyword in keywords:
+                self._labels.setdefault(keyword.lower(), set()).add(label)
+
+        # Longest first so the alternation prefers 'bc pnp' over 'bc' at the same position
+        keywords = sorted(self._labels, key=len, reverse=True)
+        patterns = {kw: re.escape(kw) + (r's?\b' if len(kw) <= 3 else '') for kw in keywords}
+        # Zero-width lookahead so matches may overlap (every word start is tried)
+        self._pattern = re.compile(r'\b(?=(' + '|'.join(patterns[kw] for kw in keywords) + '))')
+
+        # Only the longest keyword at a position is reported, so it carries the labels
+        # of the shorter keywords that also match there ('bc pnp' implies 'bc')
+        implied = {kw: set().union(*(self._labels[other] for other in keywords
+                                     if other != kw and re.match(patterns[other], kw)))
+                   for kw in keywords}
+        for kw, labels in implied.items():
+            self._labels[kw] |= labels
+
+    def match(self, text):
+        """Set of labels with a keyword in text"""
+        labels = set()
+        for match in self._pattern.finditer((text or '').lower()):
+            found = match.group(1)
+            labels |= self._labels.get(found) or self._labels[found[:-1]]  # Plural abbreviation
+        return labels
+
+
+TITLE_MATCHER = KeywordMatcher({
+    **{f'province/{province}': keywords for province, keywords in PROVINCE_KEYWORDS.items()},
+    **{f'{category}/{sub_id}': keywords
+       for category, subcategories in SUBCATEGORY_KEYWORDS.items()
+       for sub_id, keywords in subcategories.items()},
+})
+
+
+def province_from_labels(labels):
+    """First province (in PROVINCE_KEYWORDS order) among matched title labels"""
+    for province in PROVINCE_KEYWORDS:
+        if f'province/{province}' in labels:
+            return province
+    return None
+
+
+def detect_province(title):
+    """Detect province from article title"""
+    return province_from_labels(TITLE_MATCHER.match(title))
+
+
+def classify_article(category, track, title):
+    """
+    Province and browse tags for an article: 'cat' for every browse category it is
+    listed under and 'cat/sub' for every subcategory. Returns (province, tags).
+    """
+    labels = TITLE_MATCHER.match(title)
+    province = province_from_labels(labels)
+    tags = []
+
+    # News: breaking track plus policy/program/general articles
+    if track == 'breaking':
+        tags.append('news/breaking')
+    if category == 'policy':
+        tags.append('news/policy')
+    if category in ('program', 'general'):
+        tags.append('news/program')
+    if tags:
+        tags.append('news')
+
+    if category in ('express_entry', 'educational', 'forms'):
+        tags.append(category)
+        tags.extend(f"{category}/{sub_id}" for sub_id in SUBCATEGORY_KEYWORDS[category]
+                    if f"{category}/{sub_id}" in labels)
+        if category == 'express_entry':
+            tags.append('express_entry/fsw')
+
+    if category == 'pnp':
+        tags.append('pnp')
+        if province:
+            tags.append(f"pnp/{province}")
+            if province in TERRITORIES:
+                tags.append('pnp/territories')
+
+    if category in ('study_permit', 'work_permit'):
+        tags.append('permits')
+        tags.append(f"permits/{category}")
+    if 'permits/pgwp' in labels:
+        tags.append('permits/pgwp')
+
+    return province, tags
+
+
+def subcategory_name(category, subcategory):
+    """Display name of a browse subcategory (unlisted ones, e.g. other provinces, are title-cased)"""
+    for sub in BROWSE_CATEGORIES.get(category, {}).get('subcategories', []):
+        if sub['id'] == subcategory:
+            return sub['name']
+    return subcategory.replace('_', ' ').title()
+
+
+if __name__ == '__main__':
+    # Benchmark: python taxonomy.py
+    import random
+    import time
+
+    def legacy_title_labels(title):
+        """Previous approach: nested loops of plain substring tests per keyword table"""
+        title_lower = title.lower()
+        labels = set()
+        for province, keywords in PROVINCE_KEYWORDS.items():
+            if any(kw in title_lower for kw in keywords):
+                labels.add(f'province/{province}')
+        for category, subcategories in SUBCATEGORY_KEYWORDS.items():
+            for sub_id, keywords in subcategories.items():
+                if any(kw in title_lower for kw in keywords):
+                    labels.add(f'{category}/{sub_id}')
+        return labels
+
+    random.seed(13)
+    filler = ('new rules for applicants fees capital weekly agreement free abc deadline update program '
+              'invitations round category based selection healthcare trades french proficiency '
+              'international students graduates workers families refugees citizenship ceremony').split()
+    keywords = [kw for table in [PROVINCE_KEYWORDS, *SUBCATEGORY_KEYWORDS.values()]
+                for kws in table.values() for kw in kws]
+    titles = [' '.join(random.sample(filler, 6) + random.sample(keywords, random.randint(0, 2))).title()
+              for _ in range(10000)]
+
+    for name, matcher in [('substring loops', legacy_title_labels), ('compiled matcher', TITLE_MATCHER.match)]:
+        start = time.perf_counter()
+        for _ in range(5):
+            for title in titles:
+                matcher(title)
+        elapsed = (time.perf_counter() - start) / 5
+        print(f"{name:>16}: {elapsed * 1000:7.1f} ms per 10k titles ({elapsed / len(titles) * 1e6:5.2f} us/title)")
+
+    differing = sum(legacy_title_labels(t) != TITLE_MATCHER.match(t) for t in titles)
+    print(f"labels differ on {differing} of {len(titles)} titles (substring false positives such as "
+          f"'ee' in 'fees', 'ita' in 'capital', 'bc' in 'abc')")
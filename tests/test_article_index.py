@@ -0,0 +1,46 @@
+from article_index import listing_key, paginate
+
+
+def make_articles(created_ats):
+    articles = [{'slug': f'article-{i}', 'created_at': created_at} for i, created_at in enumerate(created_ats)]
+    return sorted(articles, key=listing_key, reverse=True)
+
+
+def walk(articles, per_page):
+    pages = []
+    before = None
+    while True:
+        page = paginate(articles, per_page=per_page, before=before)
+        pages.append([a['slug'] for a in page['items']])
+        before = page['next_before']
+        if not before:
+            return pages
+
+
+def test_keyset_pages_do_not_overlap():
+    articles = make_articles([f'2026-01-0{day}T10:00:00' for day in range(1, 5)])
+    first = paginate(articles, per_page=2)
+    second = paginate(articles, per_page=2, before=first['next_before'])
+
+    assert first['next_before']
+    assert not {a['slug'] for a in first['items']} & {a['slug'] for a in second['items']}
+    assert [a['slug'] for a in first['items'] + second['items']] == [a['slug'] for a in articles]
+
+
+def test_equal_timestamps_are_neither_skipped_nor_repeated():
+    articles = make_articles(['2026-01-01T10:00:00'] * 5 + ['2026-01-02T09:00:00'] * 2)
+
+    pages = walk(articles, per_page=2)
+
+    slugs = [slug for page in pages for slug in page]
+    assert slugs == [a['slug'] for a in articles]
+    assert len(pages) == 4
+
+
+def test_bare_created_at_cursor_continues_after_that_time():
+    articles = make_articles(['2026-01-03T00:00:00', '2026-01-02T00:00:00', '2026-01-02T00:00:00',
+                              '2026-01-01T00:00:00'])
+
+    page = paginate(articles, per_page=10, before='2026-01-02T00:00:00')
+
+    assert [a['created_at'] for a in page['items']] == ['2026-01-01T00:00:00']
@@ -0,0 +1,62 @@
+from duplicate_index import DuplicateIndex, corpus_documents, duplicate_features
+
+
+def filler(seed):
+    return ' '.join(f'update{seed}x{i}' for i in range(400))
+
+
+def stored_article(i, body):
+    doc = {'id': f'news_{i}', 'slug': f'article-{i}', 'title': f'Weekly roundup {i}', 'category': 'news',
+           'source_url': f'https://example.ca/news/{i}', 'created_at': f'2025-01-01T{i // 60:02d}:{i % 60:02d}:00',
+           'full_article': body}
+    doc['derived'] = {'duplicate': duplicate_features(doc)}
+    return doc
+
+
+def card(doc):
+    """Listing card: no body, only an excerpt from the start of it"""
+    return {k: v for k, v in doc.items() if k not in ('full_article', 'derived')} | {
+        'excerpt': doc['full_article'][:200]}
+
+
+def test_duplicate_outside_the_card_window_is_found():
+    body = filler(50) + ' Manitoba invited 412 candidates with a minimum score of 612 points in draw #231.'
+    stored = [stored_article(i, filler(i)) for i in range(600)]
+    stored[50] = stored_article(50, body)
+    stored.sort(key=lambda d: d['created_at'], reverse=True)
+    cards = [card(doc) for doc in stored[:500]]
+    assert 'article-50' not in {c['slug'] for c in cards}
+
+    index = DuplicateIndex()
+    index.sync(corpus_documents(stored, [], cards))
+    match = index.check('Manitoba draw results', full_article=body, pipeline='news')
+
+    assert match is not None
+    assert match['existing_id'] == 'news_50'
+
+
+def test_local_only_results_are_indexed_from_their_body():
+    local = {'id': 'local_1', 'slug': 'local-draw', 'title': 'Ontario tech draw', 'category': 'pnp',
+             'created_at': '2026-02-01T10:00:00',
+             'full_article': filler('local') + ' Ontario issued 1,204 invitations with scores from 455 points on March 3.'}
+
+    index = DuplicateIndex()
+    index.sync(corpus_documents([], [local], [card(dict(local, derived={}))]))
+    match = index.check('A different headline', full_article=local['full_article'][-80:], pipeline='pnp')
+
+    assert match is not None
+    assert match['existing_id'] == 'local_1'
+
+
+def test_written_and_deleted_articles_update_the_index_in_place():
+    index = DuplicateIndex()
+    index.sync(corpus_documents([stored_article(i, filler(i)) for i in range(3)]))
+    body = filler('new') + ' Alberta invited 2,222 candidates with scores of 333 points in draw #77.'
+    written = dict(stored_article(10, body), _id='65f0c0ffee0000000000000a')
+
+    index.upsert(corpus_documents([written]))
+    assert index.check('Alberta draw', full_article=body)['existing_id'] == 'news_10'
+
+    index.remove(['65f0c0ffee0000000000000a'])
+    assert index.check('Alberta draw', full_article=body) is None
+    assert len(index) == 3
@@ -0,0 +1,29 @@
+from outbox import Outbox
+
+
+def test_a_message_backing_off_holds_back_later_ones(tmp_path):
+    outbox = Outbox(str(tmp_path / 'outbox.json'), 'http://post-api')
+    outbox.start = lambda: None  # No dispatcher thread; deliveries are driven below
+    sent = []
+    failing = {'/results/log'}
+
+    def post(message):
+        if any(message['url'].endswith(path) for path in failing):
+            return 'HTTP 503', True
+        sent.append(message['url'])
+        return None, False
+
+    outbox._post = post
+    outbox.enqueue('/results/log', {'slug': 'a'})
+    outbox.enqueue('/results/clear')
+
+    assert outbox.dispatch() == 0
+    assert sent == []
+    assert [m['url'] for m in outbox.messages('pending')] == ['http://post-api/results/log',
+                                                              'http://post-api/results/clear']
+
+    failing.clear()
+    outbox._journal.write([{'op': 'update', 'key': m['id'], 'set': {'next_attempt': 0}}
+                           for m in outbox.messages('pending')])
+    assert outbox.dispatch() == 2
+    assert sent == ['http://post-api/results/log', 'http://post-api/results/clear']
@@ -0,0 +1,14 @@
+from results_journal import ResultsJournal
+
+
+def test_compaction_keeps_the_newest_documents(tmp_path):
+    journal = ResultsJournal(str(tmp_path / 'results.json'), compact_every=10 ** 6, max_docs=3)
+    for i in range(5):
+        journal.put({'id': f'r{i}', 'slug': f'article-{i}', 'full_article': 'body'})
+    assert len(journal) == 5
+
+    journal.compact()
+
+    assert [doc['id'] for doc in ResultsJournal(journal.path).load()] == ['r4', 'r3', 'r2']
+    assert journal.find('slug', 'article-0') is None
+    assert journal.find('slug', 'article-4')['id'] == 'r4'
@@ -0,0 +1,18 @@
+from related_articles import extract_terms
+from search_index import SearchIndex, term_counts
+
+
+def test_body_terms_beyond_the_top_terms_are_searchable():
+    frequent = ' '.join(f'common{i} common{i}' for i in range(80))
+    body = f'<p>{frequent} The Atlantic Immigration Program opens a pilot stream.</p>'
+    assert 'pilot' not in extract_terms(body)
+
+    index = SearchIndex()
+    index.sync('article', {
+        'article:pilot': ('v1', [('Express Entry draw', 3), (term_counts(body), 1)], {'title': 'pilot'}),
+        'article:other': ('v1', [('Study permit cap', 3), (term_counts(frequent), 1)], {'title': 'other'}),
+    })
+
+    found = index.search('pilot streams')
+    assert found['total'] == 1
+    assert found['results'][0][1] == 'article:pilot'
@@ -0,0 +1,33 @@
+"""
+Text Tokens
+Word splitting shared by the related-article, search, suggest and duplicate indexes,
+so an article and a query are always cut into the same words.
+"""
+
+import re
+import unicodedata
+
+# Common English words that say nothing about what a text is about
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from further
+had has have having he her here hers him his how i if in into is it its itself just me more
+most my no nor not now of off on once only or other our ours out over own same she should so
+some such than that the their theirs them then there these they this those through to too
+under until up very was we were what when where which while who whom why will with would you
+your yours
+""".split())
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+TAG_PATTERN = re.compile(r'<[^>]*>')
+
+
+def normalize(text):
+    """Lowercase ASCII form used for matching (Québec -> quebec)"""
+    text = unicodedata.normalize('NFKD', text or '')
+    return text.encode('ascii', 'ignore').decode('ascii').lower()
+
+
+def words(text):
+    """Words of a text (HTML allowed), lowercase with accents folded, in order"""
+    return TOKEN_PATTERN.findall(normalize(TAG_PATTERN.sub(' ', text or '')))